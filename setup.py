@@ -22,13 +22,12 @@ VERSION = '0.0.1'
 
 # What packages are required for this module to be executed?
 REQUIRED = [
-    'redis',
+    'redis>=5.0.1',
     'pytz',
     'requests',
     'websocket-client',
     'aiohttp',
     'numpy',
-    'pandas_ta'
 ]
 
 # What packages are optional?
@@ -1,9 +1,52 @@
-from .client import TOClient
-from .accounting import Accounting
-from .alerts import Alerts
-from .configuration import Configuration
-from .contractLibrary import Contract_Library
-from .orders import Orders
-from .positions import Positions
-from .risks import Risk
-from .users import Users
\ No newline at end of file
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+from .__version__ import __version__
+
+# Public names -> defining module. Modules load on first attribute access
+# (PEP 562), so `import tradovate` pulls in neither aiohttp nor numpy.
+_LAZY = {
+    'Client': '.client',
+    'TOClient': '.client',
+    'Accounting': '.accounting',
+    'Alerts': '.alerts',
+    'Configuration': '.configuration',
+    'Contract_Library': '.contractLibrary',
+    'Orders': '.orders',
+    'Positions': '.positions',
+    'Risk': '.risks',
+    'Users': '.users',
+    'TOSession': '.session',
+}
+# The REST client was exported as TOClient.
+_ALIASES = {'TOClient': 'Client'}
+
+__all__ = ['__version__', *_LAZY]
+
+if TYPE_CHECKING:
+    from .accounting import Accounting
+    from .alerts import Alerts
+    from .client import Client
+    from .client import Client as TOClient
+    from .configuration import Configuration
+    from .contractLibrary import Contract_Library
+    from .orders import Orders
+    from .positions import Positions
+    from .risks import Risk
+    from .session import TOSession
+    from .users import Users
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), _ALIASES.get(name, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY})
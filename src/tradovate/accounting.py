@@ -16,7 +16,7 @@ class Accounting:
 
     async def account_item(self, id: int) -> dict:
         """Retrieves an entity of Account type by its id."""
-        return await self.session.get(f"account/item?id={id}")
+        return await self.session.item("account", id)
 
     async def account_items(self, ids: list[int]) -> dict:
         """Retrieves an entity of Account type by its ids."""
@@ -47,7 +47,7 @@ class Accounting:
 
     async def cash_balance_item(self, id: int) -> dict:
         """Retrieves an entity of CashBalance type by its id."""
-        return await self.session.get(f"cashBalance/item?id={id}")
+        return await self.session.item("cashBalance", id)
 
     async def cash_balance_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of CashBalance type by its ids."""
@@ -67,7 +67,7 @@ class Accounting:
 
     async def cash_balance_log_item(self, id: int) -> dict:
         """Retrieves an entity of CashBalanceLog type by its id."""
-        return await self.session.get(f"cashBalanceLog/item?id={id}")
+        return await self.session.item("cashBalanceLog", id)
 
     async def cash_balance_log_items(self, ids: list[int]) -> dict:
         """Retrieves an entity of CashBalanceLog type by its id."""
@@ -83,7 +83,7 @@ class Accounting:
 
     async def margin_snapshot_item(self, id: int) -> dict:
         """Retrieves an entity of MarginSnapshot type by its id."""
-        return await self.session.get(f"marginSnapshot/item?id={id}")
+        return await self.session.item("marginSnapshot", id)
 
     async def margin_snapshot_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of MarginSnapshot type by its ids."""
@@ -103,7 +103,7 @@ class Accounting:
 
     async def permission_item(self, id: int) -> dict:
         """Retrieves an entity of TradingPermission type by its id."""
-        return await self.session.get(f"tradingPermission/item?id={id}")
+        return await self.session.item("tradingPermission", id)
 
     async def permission_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of TradingPermission type by its ids."""
@@ -21,7 +21,7 @@ class Alerts:
 
     async def admin_alert_signal_item(self, id: int) -> dict:
         """Retrieves an entity of AdminAlertSignal type by its id."""
-        return await self.session.get(f"adminAlertSignal/item?id={id}")
+        return await self.session.item("adminAlertSignal", id)
 
     async def admin_alert_signal_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of AdminAlertSignal type by its ids."""
@@ -78,7 +78,7 @@ class Alerts:
 
     async def alert_item(self, id: int) -> dict:
         """Retrieves an entity of Alert type by its id."""
-        return await self.session.get(f"alert/item?id={id}")
+        return await self.session.item("alert", id)
 
     async def alert_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of Alert type by its ids."""
@@ -142,7 +142,7 @@ class Alerts:
 
     async def alert_signal_item(self, id: int) -> dict:
         """Retrieves an entity of AlertSignal type by its id."""
-        return await self.session.get(f"alertSignal/item?id={id}")
+        return await self.session.item("alertSignal", id)
 
     async def alert_signal_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of AlertSignal type by its ids."""
@@ -2,6 +2,7 @@
 from __future__ import annotations
 from typing import AsyncGenerator
 
+import asyncio
 import aiohttp
 
 from .account import Account
@@ -10,39 +11,79 @@ from ..stream.utils.typing import CredentialAuthDict, MeAuthDict
 
 from ..stream.utils import urls
 
-import os
-import os.path
-import sys
 import time
-import urllib.parse as up
-from shutil import which
-
-import requests
 
 ## Classes
 class Profile:
     """Tradovate Profile"""
 
     # -Constructor
-    def __init__(self, session: Session) -> Profile:
+    def __init__(
+        self, session: Session, *, accounts_ttl: float | None = None
+    ) -> Profile:
         self.id: int = 0
         self._session = session
+        self.accounts_ttl: float | None = accounts_ttl
+        self._accounts: dict[int, Account] = {}
+        self._accounts_by_name: dict[str, Account] = {}
+        self._accounts_by_nickname: dict[str, Account] = {}
+        self._accounts_time: float | None = None
+        self._accounts_task: asyncio.Task | None = None
 
     # -Instance Methods: Private
     async def _get_accounts(self) -> AsyncGenerator[Account, None]:
         '''Returns full list of accounts from live+demo endpoints'''
-        async for account in self._get_accounts_by_endpoint(urls.ENDPOINT.LIVE):
-            yield account
-        async for account in self._get_accounts_by_endpoint(urls.ENDPOINT.DEMO):
+        for account in await self._discover_accounts():
             yield account
 
     async def _get_accounts_by_endpoint(
         self, endpoint: urls.ENDPOINT
-    ) -> AsyncGenerator[Account, None]:
+    ) -> list[Account]:
         '''Returns full list of accounts from given endpoint'''
-        print("----------------------------------------------------1")
-        for account in await self._session.get(urls.get_accounts(endpoint)):
-            yield await Account.from_profile(account, endpoint, self)
+        try:
+            result = await self._session.get(urls.get_accounts(endpoint))
+        except aiohttp.ClientResponseError:
+            return []
+        if not isinstance(result, list):
+            return []
+        return list(await asyncio.gather(*(
+            Account.from_profile(account, endpoint, self) for account in result
+        )))
+
+    async def _discover_accounts(self) -> list[Account]:
+        '''Query live and demo endpoints concurrently and rebuild the indexes'''
+        live, demo = await asyncio.gather(
+            self._get_accounts_by_endpoint(urls.ENDPOINT.LIVE),
+            self._get_accounts_by_endpoint(urls.ENDPOINT.DEMO),
+        )
+        accounts = live + demo
+        self._accounts = {}
+        self._accounts_by_name = {}
+        self._accounts_by_nickname = {}
+        for account in accounts:
+            self._index_account(account)
+        self._accounts_time = time.monotonic()
+        return accounts
+
+    def _index_account(self, account: Account) -> None:
+        # -First endpoint wins, matching the live-then-demo scan order
+        self._accounts.setdefault(account.id, account)
+        self._accounts_by_name.setdefault(account.name, account)
+        if account.nickname:
+            self._accounts_by_nickname.setdefault(account.nickname, account)
+
+    async def _account_index(self, refresh: bool = False) -> None:
+        '''Discover accounts once, again when the TTL lapsed or refresh is set'''
+        stale = self._accounts_time is None or refresh or (
+            self.accounts_ttl is not None
+            and time.monotonic() - self._accounts_time > self.accounts_ttl
+        )
+        if not stale:
+            return
+        task = self._accounts_task
+        if task is None or task.done():
+            task = self._accounts_task = asyncio.ensure_future(self._discover_accounts())
+        await asyncio.shield(task)
 
     async def _get_account_by_id(
         self, ids: int | list[int]
@@ -63,13 +104,24 @@ class Profile:
             # -Result Handling
             if result:
                 if isinstance(ids, int):
-                    return await Account.from_profile(result, endpoint, self)
+                    account = await Account.from_profile(result, endpoint, self)
+                    self._index_account(account)
+                    return account
                 for account in result:
                     accounts.append(await Account.from_profile(account, endpoint, self))
+        for account in accounts:
+            self._index_account(account)
         if accounts:
             return tuple(accounts)
         return None
 
+    def _lookup_account(
+        self, id_: int | None, name: str | None, nickname: str | None
+    ) -> Account | None:
+        if id_ is not None:
+            return self._accounts.get(id_)
+        return self._accounts_by_name.get(name) or self._accounts_by_nickname.get(nickname)
+
     # -Instance Methods: Public
     async def authorize(self, authorization: CredentialAuthDict) -> bool:
         '''Initialize Profile authorization'''
@@ -80,37 +132,35 @@ class Profile:
         self, *, id_: int | None = None,
         name: str | None = None, nickname: str | None = None
     ) -> Account | None:
-        '''Get account by id, name, or nickname'''
-        if id_ is not None:
+        '''Get account by id, name, or nickname, from the account index'''
+        await self._account_index()
+        account = self._lookup_account(id_, name, nickname)
+        if account is None and id_ is not None:
             return await self._get_account_by_id(id_)
-        async for account in self._get_accounts():
-            print("***********", account)
-            if account.name == name:
-                return account
-            elif account.nickname and account.nickname == nickname:
-                return account
-        return None
+        return account
 
     async def get_accounts(
         self, *, ids: list[int] | None = None,
-        names: list[str] | None = None, nicknames: list[str] | None = None
+        names: list[str] | None = None, nicknames: list[str] | None = None,
+        refresh: bool = False
     ) -> tuple[Account] | None:
         '''Get accounts by ids, names, or nicknames or full account list'''
-        # -TODO: Async Generator?
+        await self._account_index(refresh)
         if ids:
-            return await self._get_account_by_id(ids)
+            accounts = [self._accounts[id_] for id_ in ids if id_ in self._accounts]
+            if len(accounts) < len(ids):
+                return await self._get_account_by_id(ids)
         elif names or nicknames:
-            accounts = []
-            async for account in self._get_accounts():
-                if names and account.name in names:
-                    accounts.append(account)
-                elif nicknames and account.nickname and account.nickname in nicknames:
-                    accounts.append(account)
-            if accounts:
-                return tuple(accounts)
-            return None
+            accounts = [
+                account for account in self._accounts.values()
+                if (names and account.name in names)
+                or (nicknames and account.nickname and account.nickname in nicknames)
+            ]
         else:
-            return tuple([account async for account in self._get_accounts()])
+            accounts = list(self._accounts.values())
+        if accounts:
+            return tuple(accounts)
+        return None
 
     async def me(self) -> MeAuthDict:
         '''Profile details'''
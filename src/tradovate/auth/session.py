@@ -1,62 +1,68 @@
 from __future__ import annotations
 
-import asyncio,os,redis,json,pytz,logging
+import asyncio,os,json,logging,time
 from datetime import datetime, timedelta, timezone
 
-from aiohttp import ClientSession,ClientResponse
+from aiohttp import ClientSession,ClientResponse,ClientTimeout,TCPConnector
 from asyncio import AbstractEventLoop
 
-from ..stream.utils import urls, timestamp_to_datetime
+from ..cache import REFERENCE_TTLS, TTLCache, is_missing
+from ..loader import ItemLoader
+from ..store import close_redis, shared_redis
+from .tokens import TokenManager
+from ..stream.utils import urls
 from ..stream.utils.errors import (
     LoginInvalidException, LoginCaptchaException
 )
 log = logging.getLogger(__name__)
 
-redis_client = redis.Redis(host=os.environ.get("REDIS_HOST", "redis"),
-            port=int(os.environ.get("REDIS_PORT", "6379")),
-            decode_responses=True)
-
 class Session:
 
     # -Constructor
-    def __init__(self, *, loop: AbstractEventLoop | None = None) -> Session:
+    def __init__(
+        self, *, loop: AbstractEventLoop | None = None,
+        limit: int = 100, limit_per_host: int = 20, timeout: float = 10.0,
+        keepalive_timeout: float = 30.0, ttl_dns_cache: int = 300,
+        batch_window: float = 0.0, max_url_length: int = 2000,
+        cache_size: int = 1024, negative_ttl: float = 30.0
+    ) -> Session:
         self.authenticated: asyncio.Event = asyncio.Event()
-        self.token_expiration: datetime | None = None
+        self.limit: int = limit
+        self.limit_per_host: int = limit_per_host
+        self.timeout: ClientTimeout = ClientTimeout(total=timeout)
+        self.keepalive_timeout: float = keepalive_timeout
+        self.ttl_dns_cache: int = ttl_dns_cache
+        self.batch_window: float = batch_window
+        self.max_url_length: int = max_url_length
+        self.cache_size: int = cache_size
+        self.negative_ttl: float = negative_ttl
+        self._headers_token: str = ''
+        self._loaders: dict[str, ItemLoader] = {}
+        self._caches: dict[str, TTLCache] = {}
         self._session: ClientSession | None = None
+        self._session_loop: AbstractEventLoop | None = None
         self._loop: AbstractEventLoop = loop if loop else asyncio.get_event_loop()
-        self._loop.create_task(self.__ainit__(), name="session-client")
 
 
         self.URL: str = urls.http_base_live if os.getenv('TO_ENV') == 'LIVE' else urls.http_base_demo
-        tokens = redis_client.get('TO_TOKEN')
-        if tokens != None:
-            tokens = json.loads(tokens)
-            age_secs = self._get_age_secs(tokens)
-
-            print("*******************", age_secs)
-            if age_secs < 120 and age_secs > 60:
-                tokens = asyncio.run(self.renew_access_token(tokens['accessToken']))
-            elif age_secs < 60:
-                print(">>>>>>>>>>>>>request_access_token 1:")
-                tokens = asyncio.run(self.request_access_token())
-        else:
-            print(">>>>>>>>>>>>>request_access_token 2")
-            tokens = asyncio.run(self.request_access_token())
-
-        print(">>>>>>>>>>>>>.",tokens)
-        self.access_tokens: dict = tokens
-        self.access_token: str = self.access_tokens['accessToken']
-        self.market_data_access_token: str = self.access_tokens['mdAccessToken']
-        #self.token_expiration_time: str = self.access_tokens['expirationTime'].replace("T", " ")[:-8]
-        self.headers: dict = {
-            'Authorization': f'Bearer {self.access_token}',
-            'Content-Type': 'application/json',
-            'Accept': 'application/json',
-        }
+        # -Stored tokens are adopted by the first authorize(), nothing connects here
+        self.tokens: TokenManager = TokenManager(
+            'TO_TOKEN', store=shared_redis, channel='TO_TOKEN:updates'
+        )
+        self.headers: dict = {}
 
     # -Dunder Methods
     async def __ainit__(self) -> None:
-        self._session = ClientSession(loop=self._loop, raise_for_status=True)
+        '''Create the pooled ClientSession on the running loop'''
+        self._session = ClientSession(
+            connector=TCPConnector(
+                limit=self.limit, limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.ttl_dns_cache,
+                keepalive_timeout=self.keepalive_timeout,
+            ),
+            timeout=self.timeout,
+        )
+        self._session_loop = asyncio.get_running_loop()
 
     def __repr__(self) -> str:
         str_ = f"Session(authenticated={self.authenticated.is_set()}"
@@ -66,20 +72,46 @@ class Session:
 
     async def __aenter__(self):
         """Enter client session."""
-        self._session = ClientSession()
+        await self._client()
         return self
 
-    async def __aexit__(self):
+    async def __aexit__(self, *args):
         """Exit client session."""
-        await self._session.close()
+        await self.close()
+
+    async def _client(self) -> ClientSession:
+        '''Pooled ClientSession, created once per event loop and reused'''
+        if (
+            self._session is None or self._session.closed
+            or self._session_loop is not asyncio.get_running_loop()
+        ):
+            await self.__ainit__()
+        return self._session
+
+    async def _close_client(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _run(self, coro):
+        '''Run coroutine on a throwaway loop, closing the pool bound to it'''
+        async def run():
+            try:
+                return await coro
+            finally:
+                await self._close_client()
+                await self.tokens.aclose()
+                await close_redis()
+        return asyncio.run(run())
 
     async def close(self) -> None:
-        await self._session.close()
+        await self._close_client()
+        await self.tokens.aclose()
         self.authenticated.clear()
 
     async def request_access_token(self) -> int:
         '''Request Session authorization'''
-        await self.__aenter__()
+        session = await self._client()
 
         log.debug("Session event 'request'")
 
@@ -92,27 +124,51 @@ class Session:
             "sec": os.getenv('TO_SEC')
         }
 
-        res = await self._session.post(urls.http_auth_request, json=auth, ssl=False)
+        res = await session.post(urls.http_auth_request, json=auth, ssl=False)
 
         res_dict = await self._update_authorization(res)
 
         return res_dict
 
-    async def renew_access_token(self, accessToken) -> None:
+    async def renew_access_token(self, accessToken: str | None = None) -> dict:
         '''Renew Session authorization'''
-        await self.__aenter__()
+        session = await self._client()
 
-        self.headers: dict = {
-            'Authorization': f'Bearer {accessToken}',
+        headers: dict = {
+            'Authorization': f'Bearer {accessToken or self.tokens.access_token}',
             'Content-Type': 'application/json',
             'Accept': 'application/json',
         }
         log.debug("Session event 'renew'")
-        res = await self._session.post(urls.http_auth_renew)
+        res = await session.post(urls.http_auth_renew, headers=headers)
         res_dict = await self._update_authorization(res)
 
         return res_dict
 
+    async def _fetch_tokens(self, tokens: TokenManager) -> dict:
+        '''Renew while the held token is still valid, otherwise request a new one'''
+        if tokens.valid:
+            return await self.renew_access_token(tokens.access_token)
+        return await self.request_access_token()
+
+    async def authorize(self) -> dict:
+        '''Ensure a fresh access token, one renewal shared by all callers'''
+        if time.monotonic() >= self.tokens.renew_at:
+            await self.tokens.alisten()
+            await self.tokens.ensure(self._fetch_tokens)
+        if self.tokens.access_token != self._headers_token:
+            self._set_headers()
+            self.authenticated.set()
+        return self.headers
+
+    def _set_headers(self) -> None:
+        self._headers_token = self.tokens.access_token
+        self.headers = {
+            'Authorization': f'Bearer {self.tokens.access_token}',
+            'Content-Type': 'application/json',
+            'Accept': 'application/json',
+        }
+
     # -Instance Methods: Private
     async def _update_authorization(
                 self, res: ClientResponse
@@ -135,51 +191,87 @@ class Session:
                 )
             # -Access Token
             log.debug("Session event 'authorized'")
+            if self.tokens.set(res_dict):
+                await self.tokens.asave()
             self.authenticated.set()
 
-            redis_client.set('TO_TOKEN', json.dumps(res_dict))
-
-            self.token_expiration = timestamp_to_datetime(res_dict['expirationTime'])
-
             return res_dict
 
-    def try_parsing_date(self, text):
-        for fmt in ('%Y-%m-%dT%H:%M:%SZ', '%Y-%m-%dT%H:%M:%S.%f%z', '%Y-%m-%dT%H:%M:%S%z'):
-            try:
-                return datetime.strptime(text, fmt)
-            except ValueError:
-                pass
-        raise ValueError('no valid date format found')
-
-    def _get_age_secs(self, tokens):
-        if not tokens:
-            return -1
-        expiration_time = tokens["expirationTime"]
-        dt = int(datetime.now(tz=pytz.UTC).strftime("%s"))
-        t = self.try_parsing_date(expiration_time)
-        dt2 = int(t.strftime("%s"))
-        age_secs = dt2 - dt
-        print("******************************************************age_secs:", age_secs)
-        return age_secs
-
     async def get(self, url: str):
         """Send GET request to a spicified url."""
-        await self.__aenter__()
-        url = f"{self.URL + url}"
+        headers = await self.authorize()
+        session = await self._client()
+        url = url if url.startswith("http") else f"{self.URL + url}"
 
-        async with self._session.get(url, headers=self.headers, ssl=False) as resp:
+        async with session.get(url, headers=headers, ssl=False) as resp:
             data = await resp.read()
             if not data:
                 return {}
 
             return json.loads(data)
 
+    async def item(self, entity: str, id: int) -> dict | None:
+        """Retrieves an entity by its id, batched with concurrent lookups of the same type."""
+        loader = self._loaders.get(entity)
+        if loader is None:
+            loader = self._loaders[entity] = ItemLoader(
+                entity, self.get, window=self.batch_window,
+                max_url_length=self.max_url_length - len(self.URL),
+            )
+        return await loader.load(id)
+
+    def reference_cache(self, entity: str) -> TTLCache:
+        """TTL cache of a reference entity type, created on first use."""
+        entity = entity[:1].lower() + entity[1:]
+        cache = self._caches.get(entity)
+        if cache is None:
+            cache = self._caches[entity] = TTLCache(
+                REFERENCE_TTLS.get(entity, 3600), maxsize=self.cache_size,
+                negative_ttl=self.negative_ttl,
+            )
+        return cache
+
+    def _cache_items(self, cache: TTLCache, value) -> None:
+        '''Seed item entries from a find or list response'''
+        for item in value if isinstance(value, list) else [value]:
+            if isinstance(item, dict) and 'id' in item:
+                cache.set(('item', item['id']), item)
+
+    async def cached_item(self, entity: str, id: int) -> dict | None:
+        """Retrieves a reference entity by its id, served from cache while fresh."""
+        return await self.reference_cache(entity).get_or_load(
+            ('item', int(id)), lambda: self.item(entity, id)
+        )
+
+    async def cached_items(self, entity: str, ids: list[int]) -> list[dict]:
+        """Retrieves reference entities by their ids, fetching only the missing ones in one batch."""
+        items = await asyncio.gather(*(self.cached_item(entity, id) for id in ids))
+        return [item for item in items if not is_missing(item)]
+
+    async def cached_find(self, entity: str, name: str) -> dict:
+        """Retrieves a reference entity by its name, served from cache while fresh."""
+        cache = self.reference_cache(entity)
+        async def load():
+            value = await self.get(f"{entity}/find?name={name}")
+            self._cache_items(cache, value)
+            return value
+        return await cache.get_or_load(('find', name), load)
+
+    async def cached_list(self, entity: str) -> list[dict]:
+        """Retrieves all entities of a reference type, served from cache while fresh."""
+        cache = self.reference_cache(entity)
+        async def load():
+            value = await self.get(f"{entity}/list")
+            self._cache_items(cache, value)
+            return value
+        return await cache.get_or_load(('list',), load)
+
     async def post(self, url: str, payload: dict):
         """Send POST request to a specified url with a specified payload."""
-        await self.__aenter__()
-        url = f"{self.URL + url}"
-        print("url:", url)
-        async with self._session.post(url, headers=self.headers, json=payload) as resp:
+        headers = await self.authorize()
+        session = await self._client()
+        url = url if url.startswith("http") else f"{self.URL + url}"
+        async with session.post(url, headers=headers, json=payload) as resp:
             data = await resp.read()
             if not data:
                 return {}
@@ -187,14 +279,33 @@ class Session:
 
 
     # -Property
+    @property
+    def cache_stats(self) -> dict[str, dict[str, int]]:
+        return {
+            entity: {'hits': cache.hits, 'misses': cache.misses, 'size': len(cache)}
+            for entity, cache in self._caches.items()
+        }
+
     @property
     def loop(self) -> AbstractEventLoop:
         return self._loop
 
+    @property
+    def access_token(self) -> str:
+        return self.tokens.access_token
+
+    @property
+    def market_data_access_token(self) -> str:
+        return self.tokens.md_access_token
+
+    @property
+    def token_expiration(self) -> datetime | None:
+        return self.tokens.expiration
+
     @property
     def token_duration(self) -> timedelta:
-        return self.token_expiration - datetime.now(timezone.utc)
+        return self.tokens.expiration - datetime.now(timezone.utc)
 
     @property
     def token_expired(self) -> bool:
-        return datetime.now(timezone.utc) >= self.token_expiration
+        return not self.tokens.valid
@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+from ..store import COMPARE_AND_DELETE
+
+log = logging.getLogger(__name__)
+
+# Deletes the renewal lock only if this process still owns it.
+RELEASE_LOCK = COMPARE_AND_DELETE
+EXPIRATION_FORMATS = (
+    '%Y-%m-%dT%H:%M:%S.%f%z', '%Y-%m-%dT%H:%M:%S%z', '%Y-%m-%dT%H:%M:%SZ'
+)
+
+
+def parse_expiration(text: str) -> datetime:
+    """Parses a token expirationTime into an aware UTC datetime."""
+    for fmt in EXPIRATION_FORMATS:
+        try:
+            dt = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    raise ValueError(f'invalid token expirationTime: {text}')
+
+
+def normalize_tokens(tokens: dict) -> dict:
+    """Token dict in the accesstokenrequest response shape, accepting the legacy stored shape."""
+    if 'accessToken' in tokens:
+        return tokens
+    return {
+        'accessToken': tokens['access_token'],
+        'mdAccessToken': tokens['md_access_token'],
+        'expirationTime': tokens['expiration_time'],
+    }
+
+
+class TokenManager:
+    """Access and market-data tokens held in memory with a monotonic deadline.
+
+    The expiry is parsed once when tokens change, so checking them is a float
+    comparison. Renewal starts `renew_margin` seconds before expiry and only
+    one renewal is in flight at a time, shared by all callers. The store
+    (Redis) is read at startup or right before a renewal, and is written only
+    when the tokens change.
+
+    With a `channel`, processes sharing the key elect a renewal leader through
+    a `<key>:lock` key; the leader publishes the new tokens on the channel and
+    every process subscribed through `listen` adopts them without renewing.
+
+    `ensure` and the a-prefixed methods expect an asyncio store (see
+    tradovate.store), `ensure_sync` and the others a blocking one.
+    """
+
+    # -Constructor
+    def __init__(self,
+                 key: str = 'TO_TOKEN',
+                 *,
+                 store=None,
+                 renew_margin: float = 600.0,
+                 min_lifetime: float = 60.0,
+                 retry_delay: float = 5.0,
+                 channel: str | None = None,
+                 lock_ttl: float = 30.0,
+                 poll_interval: float = 0.1) -> TokenManager:
+        self.key = key
+        self.store = store
+        self.renew_margin = renew_margin
+        self.min_lifetime = min_lifetime
+        self.retry_delay = retry_delay
+        self.tokens: dict | None = None
+        self.access_token: str = ''
+        self.md_access_token: str = ''
+        self.expiration: datetime | None = None
+        self.deadline: float = 0.0
+        self.renew_at: float = 0.0
+        self.channel = channel
+        self.lock_key = f'{key}:lock'
+        self.lock_ttl = lock_ttl
+        self.poll_interval = poll_interval
+        self.renewals = 0
+        self.received = 0
+        self._owner = uuid.uuid4().hex
+        self._listener = None
+        self._pubsub = None
+        self._task: asyncio.Task | None = None
+        self._inflight: asyncio.Future | None = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"TokenManager(key={self.key}, valid={self.valid}, renewals={self.renewals})"
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.renew_at
+
+    @property
+    def valid(self) -> bool:
+        return time.monotonic() < self.deadline
+
+    def set(self, tokens: dict) -> bool:
+        """Adopts new tokens, returns False when they are the ones already held."""
+        tokens = normalize_tokens(tokens)
+        if tokens['accessToken'] == self.access_token:
+            return False
+        self.expiration = parse_expiration(tokens['expirationTime'])
+        remaining = (self.expiration - datetime.now(timezone.utc)).total_seconds()
+        now = time.monotonic()
+        self.deadline = now + remaining - self.min_lifetime
+        self.renew_at = now + remaining - self.renew_margin
+        self.tokens = tokens
+        self.access_token = tokens['accessToken']
+        self.md_access_token = tokens['mdAccessToken']
+        return True
+
+    def save(self) -> None:
+        """Writes the held tokens to the store and publishes them on the channel."""
+        if self.store is not None and self.tokens is not None:
+            payload = json.dumps(self.tokens)
+            self.store.set(self.key, payload)
+            if self.channel is not None:
+                self.store.publish(self.channel, payload)
+
+    async def asave(self) -> None:
+        """Writes and publishes the held tokens through an asyncio store, in one round trip."""
+        if self.store is not None and self.tokens is not None:
+            payload = json.dumps(self.tokens)
+            pipe = self.store.pipeline(transaction=False)
+            pipe.set(self.key, payload)
+            if self.channel is not None:
+                pipe.publish(self.channel, payload)
+            await pipe.execute()
+
+    def _adopt(self, raw: str | None) -> bool:
+        if not raw:
+            return False
+        try:
+            return self.set(json.loads(raw))
+        except (KeyError, ValueError) as exc:
+            log.warning(f"Ignoring stored tokens under {self.key}: {exc}")
+            return False
+
+    def load(self) -> bool:
+        """Adopts the tokens found in the store, returns whether they changed."""
+        return self._adopt(self.store.get(self.key) if self.store is not None else None)
+
+    async def aload(self) -> bool:
+        """Adopts the tokens found in an asyncio store, returns whether they changed."""
+        return self._adopt(await self.store.get(self.key) if self.store is not None else None)
+
+    async def ensure(self, fetch: Callable[[TokenManager], Awaitable[dict]]) -> str:
+        """Returns the access token, renewing through fetch when it is due."""
+        if time.monotonic() < self.renew_at:
+            return self.access_token
+        inflight = self._inflight
+        if inflight is None or inflight.get_loop() is not asyncio.get_running_loop():
+            inflight = self._inflight = asyncio.ensure_future(self._refresh(fetch))
+        return await asyncio.shield(inflight)
+
+    async def _refresh(self, fetch: Callable[[TokenManager], Awaitable[dict]]) -> str:
+        try:
+            if await self.aload() and self.fresh:
+                return self.access_token
+            while not await self._aacquire():
+                await asyncio.sleep(self.poll_interval)
+                if self.fresh or (await self.aload() and self.fresh):
+                    return self.access_token
+            try:
+                # A leader may have published between the last read and the lock.
+                await self.aload()
+                if self.fresh:
+                    return self.access_token
+                try:
+                    tokens = await fetch(self)
+                except Exception:
+                    self._renew_failed()
+                else:
+                    if self.set(tokens):
+                        await self.asave()
+                    self.renewals += 1
+            finally:
+                await self._arelease()
+            return self.access_token
+        finally:
+            self._inflight = None
+
+    def ensure_sync(self, fetch: Callable[[TokenManager], dict]) -> str:
+        """Blocking variant of ensure, one renewal at a time across threads."""
+        if time.monotonic() < self.renew_at:
+            return self.access_token
+        with self._lock:
+            if time.monotonic() < self.renew_at or (self.load() and self.fresh):
+                return self.access_token
+            while not self._acquire():
+                time.sleep(self.poll_interval)
+                if self.fresh or (self.load() and self.fresh):
+                    return self.access_token
+            try:
+                self.load()
+                if self.fresh:
+                    return self.access_token
+                try:
+                    tokens = fetch(self)
+                except Exception:
+                    self._renew_failed()
+                else:
+                    if self.set(tokens):
+                        self.save()
+                    self.renewals += 1
+            finally:
+                self._release()
+        return self.access_token
+
+    def _renew_failed(self) -> None:
+        '''Keep a still valid token and retry later, re-raise otherwise'''
+        if not self.valid:
+            raise
+        log.warning("Token renewal failed, retrying", exc_info=True)
+        self.renew_at = time.monotonic() + self.retry_delay
+
+    def _acquire(self) -> bool:
+        '''Take the renewal lock shared by the processes on this key'''
+        if self.channel is None or self.store is None:
+            return True
+        return bool(self.store.set(
+            self.lock_key, self._owner, nx=True, px=int(self.lock_ttl * 1000)
+        ))
+
+    def _release(self) -> None:
+        if self.channel is not None and self.store is not None:
+            self.store.eval(RELEASE_LOCK, 1, self.lock_key, self._owner)
+
+    async def _aacquire(self) -> bool:
+        if self.channel is None or self.store is None:
+            return True
+        return bool(await self.store.set(
+            self.lock_key, self._owner, nx=True, px=int(self.lock_ttl * 1000)
+        ))
+
+    async def _arelease(self) -> None:
+        if self.channel is not None and self.store is not None:
+            await self.store.eval(RELEASE_LOCK, 1, self.lock_key, self._owner)
+
+    def _on_message(self, message: dict) -> None:
+        try:
+            if self.set(json.loads(message['data'])):
+                self.received += 1
+        except (KeyError, TypeError, ValueError) as exc:
+            log.warning(f"Ignoring tokens published on {self.channel}: {exc}")
+
+    def listen(self) -> None:
+        """Adopts tokens published by other processes, from a background thread."""
+        if self.channel is None or self.store is None or self._listener is not None:
+            return
+        pubsub = self.store.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{self.channel: self._on_message})
+        self._listener = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    async def alisten(self) -> None:
+        """Adopts tokens published by other processes, from a task on the running loop."""
+        if self.channel is None or self.store is None:
+            return
+        if self._task is not None and not self._task.done():
+            if self._task.get_loop() is asyncio.get_running_loop():
+                return
+            self._task.cancel()
+        self._pubsub = self.store.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(**{self.channel: self._on_message})
+        self._task = asyncio.ensure_future(self._pubsub.run())
+
+    def close(self) -> None:
+        """Stops listening for published tokens."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def aclose(self) -> None:
+        """Stops listening and closes the subscription connection."""
+        self.close()
+        if self._pubsub is not None:
+            pubsub, self._pubsub = self._pubsub, None
+            await pubsub.aclose()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable, Iterable
+
+
+def penalty(value: Any) -> tuple[str, float] | None:
+    """(p-ticket, p-time) of a rate limited response or exception, else None."""
+    data = getattr(value, 'response', value)
+    if isinstance(data, dict) and isinstance(data.get('d'), dict):
+        data = data['d']
+    if isinstance(data, dict) and 'p-ticket' in data:
+        return data['p-ticket'], float(data.get('p-time') or 0)
+    return None
+
+
+class RateLimiter:
+    """Token bucket shared by the requests of one account or session.
+
+    `acquire` waits for a token, `rate` per second refilled up to `burst`.
+    `pause` stops every caller for the p-time of a rate limit penalty.
+    """
+
+    # -Constructor
+    def __init__(self, rate: float = 10.0, burst: int = 10) -> RateLimiter:
+        self.rate = rate
+        self.burst = burst
+        self.waited = 0.0
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def __repr__(self) -> str:
+        return f"RateLimiter(rate={self.rate}/s, burst={self.burst}, waited={self.waited:.3f}s)"
+
+    async def acquire(self) -> None:
+        """Takes one token, sleeping until one is available."""
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                delay = self._paused_until - now
+            else:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                delay = (1.0 - self._tokens) / self.rate
+            self.waited += delay
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Holds back every request for seconds, emptying the bucket."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+
+
+class BulkResult:
+    """Outcome of one request of a bulk operation."""
+    __slots__ = ('key', 'data', 'error')
+
+    # -Constructor
+    def __init__(self, key: Hashable, data: Any = None, error: BaseException | None = None) -> BulkResult:
+        self.key = key
+        self.data = data
+        self.error = error
+
+    def __repr__(self) -> str:
+        return f"BulkResult(key={self.key}, {'error=' + repr(self.error) if self.error else 'ok'})"
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def bulk(calls: Iterable[tuple[Hashable, Callable[..., Awaitable[Any]]]],
+               *,
+               concurrency: int = 8,
+               limiter: RateLimiter | None = None,
+               retries: int = 1) -> AsyncIterator[BulkResult]:
+    """Runs keyed request calls concurrently, yielding each result as it completes.
+
+    At most `concurrency` requests are in flight and each takes a token from
+    the limiter first. A rate limit penalty pauses the limiter for its p-time
+    and the call is retried with the p-ticket, `retries` times at most.
+    Failures are yielded as results holding the exception, never raised.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(key: Hashable, call: Callable[..., Awaitable[Any]]) -> BulkResult:
+        async with semaphore:
+            extra = {}
+            for attempt in range(retries + 1):
+                if limiter is not None:
+                    await limiter.acquire()
+                try:
+                    data = await call(**extra)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    data, error = None, exc
+                else:
+                    error = None
+                ticket = penalty(error if error is not None else data)
+                if ticket is None or attempt == retries:
+                    return BulkResult(key, data, error)
+                if limiter is not None:
+                    limiter.pause(ticket[1])
+                else:
+                    await asyncio.sleep(ticket[1])
+                extra = {'p-ticket': ticket[0]}
+            return BulkResult(key, data, error)
+
+    tasks = [asyncio.ensure_future(run(key, call)) for key, call in calls]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+        # -Consumer stopped early: wait for the cancelled calls to unwind
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Iterable
+
+# Seconds a reference entity stays fresh, by entity type.
+REFERENCE_TTLS = {
+    "clearingHouse": 24 * 3600,
+    "contract": 3600,
+    "contractGroup": 24 * 3600,
+    "contractMaturity": 3600,
+    "currency": 24 * 3600,
+    "exchange": 24 * 3600,
+    "orderStrategyType": 24 * 3600,
+    "product": 24 * 3600,
+    "productSession": 6 * 3600,
+    "property": 24 * 3600,
+    "spreadDefinition": 3600,
+}
+
+
+def is_missing(value: Any) -> bool:
+    """Whether a response means the entity does not exist: None or the empty body of a 404.
+
+    Empty lists and other falsy results are real answers and keep the full TTL.
+    """
+    return value is None or (isinstance(value, dict) and not value)
+
+
+def is_error(value: Any) -> bool:
+    """Whether a response is an errorText payload, which is never cached."""
+    return isinstance(value, dict) and "errorText" in value
+
+
+class TTLCache:
+    """LRU cache with expiry, negative caching and single-flight loading.
+
+    Concurrent misses on the same key share one load. Missing entities
+    (see is_missing) are remembered for `negative_ttl` seconds so repeated
+    lookups of an unknown symbol do not hit the network either, while error
+    responses are returned without being stored.
+    """
+
+    # -Constructor
+    def __init__(self,
+                 ttl: float,
+                 maxsize: int = 1024,
+                 negative_ttl: float = 30.0) -> TTLCache:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._headroom = maxsize
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._loading: dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"TTLCache(size={len(self)}, hits={self.hits}, misses={self.misses})"
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns a fresh cached value, or default."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return default
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Stores a value, with the negative TTL when it is a miss, errors are skipped."""
+        if is_error(value):
+            return
+        ttl = self.negative_ttl if is_missing(value) else self.ttl
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def seed(self, entries: Iterable[tuple[Hashable, Any]]) -> int:
+        """Stores known entries, e.g. a snapshot, growing maxsize so none is evicted.
+
+        The bound is raised to the entries held plus the original maxsize, so
+        seeded data never evicts itself and on-demand loads keep their own
+        headroom. Returns the number of entries stored.
+        """
+        expires = time.monotonic() + self.ttl
+        count = 0
+        for key, value in entries:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            count += 1
+        self.maxsize = max(self.maxsize, len(self._entries) + self._headroom)
+        return count
+
+    def invalidate(self, key: Hashable = None) -> None:
+        """Drops one key, or everything when no key is given."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def get_or_load(self, key: Hashable, load: Callable[[], Awaitable]) -> Any:
+        """Returns the cached value for key, loading it once on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] >= time.monotonic():
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+        self.misses += 1
+        future = self._loading.get(key)
+        if future is None:
+            future = self._loading[key] = asyncio.ensure_future(self._load(key, load))
+        return await asyncio.shield(future)
+
+    async def _load(self, key: Hashable, load: Callable[[], Awaitable]) -> Any:
+        try:
+            value = await load()
+            self.set(key, value)
+            return value
+        finally:
+            self._loading.pop(key, None)
@@ -1,20 +1,23 @@
 ## Imports
 from __future__ import annotations
-import asyncio,redis,logging,json,os
+import asyncio,logging,json
 
 from datetime import datetime,timedelta
+from typing import TYPE_CHECKING
 
 from .auth import Profile
 from .accounting import Accounting
 from .auth.session import Session
+from .bulk import RateLimiter
+from .snapshot import ReferenceSnapshot
 from .stream.utils import urls
 from .stream.utils.typing import CredentialAuthDict
 
+if TYPE_CHECKING:
+    from .stream.risk import RiskGate
+
 ## Constants
 log = logging.getLogger(__name__)
-redis_client = redis.Redis(host=os.environ.get("REDIS_HOST", "redis"),
-            port=int(os.environ.get("REDIS_PORT", "6379")),
-            decode_responses=True)
 
 
 ## Classes
@@ -23,15 +26,59 @@ class Client(Profile):
 
     # -Constructor
     def __init__(self) -> Client:
-        self._loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
-        self._session: Session = Session(loop=self._loop)
-        self._handle_auto_renewal: asyncio.TimerHandle | None = None
+        self._setup(Session(loop=asyncio.new_event_loop()))
+        self.reference.load()
 
         accounting = Accounting(self._session)
-        account = asyncio.run(accounting.account_list())
+        self._set_account(self._session._run(accounting.account_list()))
 
-        self.id = account[0]['id']
-        self.name = account[0]['name']
+    def _setup(self, session: Session, owns_session: bool = True) -> None:
+        Profile.__init__(self, session)
+        self._loop: asyncio.AbstractEventLoop = session.loop
+        self._owns_session: bool = owns_session
+        self._handle_auto_renewal: asyncio.TimerHandle | None = None
+        self.limiter: RateLimiter = RateLimiter()
+        self.reference: ReferenceSnapshot = ReferenceSnapshot(self._session)
+        # -Pre-trade checks of REST orders, share the stream Client's gate
+        self.risk: RiskGate | None = None
+
+    def _set_account(self, accounts: list[dict], name: str | None = None) -> None:
+        account = next((a for a in accounts if a['name'] == name), None) if name else accounts[0]
+        if account is None:
+            raise ValueError(f"No account named {name}")
+        self.id = account['id']
+        self.name = account['name']
+
+    @classmethod
+    async def create(
+        cls, *, account: str | None = None, session: Session | None = None,
+        warm: bool = True, **session_kwargs
+    ) -> Client:
+        '''Build a Client on the running loop, authorizing and discovering
+        accounts, with the reference caches seeded from the snapshot file
+
+        With `warm`, a missing or stale snapshot is refreshed in the background
+        (`reference._refreshing`) rather than delaying the client.
+
+        Pass a shared session to run many account clients on one connection
+        pool, the client then leaves closing that session to the caller.
+        '''
+        self = cls.__new__(cls)
+        self._setup(
+            session or Session(loop=asyncio.get_running_loop(), **session_kwargs),
+            owns_session=session is None,
+        )
+        if warm:
+            await self.reference.warm(wait=False)
+        self._set_account(await Accounting(self._session).account_list(), account)
+        return self
+
+    # -Dunder Methods
+    async def __aenter__(self) -> Client:
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
 
     @property
     def accounting(self) -> Accounting:
@@ -49,6 +96,7 @@ class Client(Profile):
             self._loop.close()
 
     async def _run(self, event, *args, **kwargs) -> None:
+        self._loop.create_task(self.reference.warm(), name="client-reference")
         self._dispatch(event=event, *args, **kwargs)
 
     # -Instance Methods: Private
@@ -86,7 +134,8 @@ class Client(Profile):
 
 
     async def close(self) -> None:
-        await self._session.close()
+        if self._owns_session:
+            await self._session.close()
 
 
     async def process_message(self) -> None:
@@ -12,7 +12,7 @@ class Configuration:
 
     async def admin_alert_item(self, id: int) -> dict:
         """Retrieves an entity of AdminAlert type by its id."""
-        return await self.session.get(f"adminAlert/item?id={id}")
+        return await self.session.item("adminAlert", id)
 
     async def admin_alert_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of AdminAlert type by its ids."""
@@ -30,21 +30,19 @@ class Configuration:
 
     async def clearing_house_find(self, name: str) -> dict:
         """Retrieves an entity of ClearingHouse type by its name."""
-        return await self.session.get(f"clearingHouse/find?name={name}")
+        return await self.session.cached_find("clearingHouse", name)
 
     async def clearing_house_item(self, id: int) -> dict:
         """Retrieves an entity of ClearingHouse type by its id."""
-        return await self.session.get(f"clearingHouse/item?id={id}")
+        return await self.session.cached_item("clearingHouse", id)
 
     async def clearing_house_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of ClearingHouse type by its ids."""
-        return await self.session.get(
-            f"clearingHouse/items?ids={','.join([str(id) for id in ids])}",
-        )
+        return await self.session.cached_items("clearingHouse", ids)
 
     async def clearing_house_list(self) -> dict:
         """Retrieves all entities of ClearingHouse type."""
-        return await self.session.get("clearingHouse/list")
+        return await self.session.cached_list("clearingHouse")
 
     async def clearing_house_suggest(self, text: str, n_entities: int) -> dict:
         """Retrieves entities of ClearingHouse type filtered by an occurrence of a text in one of its fields."""
@@ -52,7 +50,7 @@ class Configuration:
 
     async def entitlement_item(self, id: int) -> dict:
         """Retrieves an entity of Entitlement type by its id."""
-        return await self.session.get(f"entitlement/item?id={id}")
+        return await self.session.item("entitlement", id)
 
     async def entitlement_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of Entitlement type by its ids."""
@@ -64,19 +62,19 @@ class Configuration:
 
     async def order_strategy_type_find(self, name: str) -> dict:
         """Retrieves an entity of OrderStrategyType type by its name."""
-        return await self.session.get(f"OrderStrategyType/find?name={name}")
+        return await self.session.cached_find("orderStrategyType", name)
 
     async def order_strategy_type_item(self, id: int) -> dict:
         """Retrieves an entity of OrderStrategyType type by its id."""
-        return await self.session.get(f"orderStrategyType/item?id={id}")
+        return await self.session.cached_item("orderStrategyType", id)
 
     async def order_strategy_type_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of OrderStrategyType type by its ids."""
-        return await self.session.get(f"orderStrategyType/items?ids={','.join([str(id) for id in ids])}")
+        return await self.session.cached_items("orderStrategyType", ids)
 
     async def order_strategy_type_list(self) -> dict:
         """Retrieves all entities of OrderStrategyType type."""
-        return await self.session.get("orderStrategyType/list")
+        return await self.session.cached_list("orderStrategyType")
 
     async def order_strategy_type_suggest(self, text: str, n_entities: int) -> dict:
         """Retrieves entities of OrderStrategyType type filtered by an occurrence of a text in one of its fields."""
@@ -84,21 +82,19 @@ class Configuration:
 
     async def property_find(self, name: str) -> dict:
         """Retrieves an entity of Property type by its name."""
-        return await self.session.get(f"property/find?name={name}")
+        return await self.session.cached_find("property", name)
 
     async def property_item(self, id: int) -> dict:
         """Retrieves an entity of Property type by its id."""
-        return await self.session.get(f"property/item?id={id}")
+        return await self.session.cached_item("property", id)
 
     async def property_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of Property type by its ids."""
-        return await self.session.get(
-            f"property/items?ids={','.join([str(id) for id in ids])}",
-        )
+        return await self.session.cached_items("property", ids)
 
     async def property_list(self) -> dict:
         """Retrieves all entities of Property type."""
-        return await self.session.get("property/list")
+        return await self.session.cached_list("property")
 
     async def property_suggest(self, text: str, n_entities: int) -> dict:
         """Retrieves entities of Property type filtered by an occurrence of a text in one of its fields."""
@@ -11,17 +11,19 @@ class Contract_Library:
         """Retrieves all entities of Contract type related to ContractMaturity entity."""
         return await self.session.get(f"contract/deps?masterid={master_id}")
 
-    async def conteract_find(self, name: str) -> dict:
+    async def contract_find(self, name: str) -> dict:
         """Retrieves an entity of Contract type by its name."""
-        return await self.session.get(f"contract/find?name={name}")
+        return await self.session.cached_find("contract", name)
+
+    conteract_find = contract_find
 
     async def contract_item(self, id: int) -> dict:
         """Retrieves an entity of Contract type by its id."""
-        return await self.session.get(f"contract/item?id={id}")
+        return await self.session.cached_item("contract", id)
 
     async def contract_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of Contract type by its ids."""
-        return await self.session.get(f"contract/items?ids={','.join([str(id) for id in ids])}")
+        return await self.session.cached_items("contract", ids)
 
     async def product_fee_params(self, product_ids: list[int]) -> dict:
         """Query the a product's fee parameters."""
@@ -51,19 +53,19 @@ class Contract_Library:
 
     async def contract_group_find(self, name: str) -> dict:
         """Retrieves an entity of ContractGroup type by its name."""
-        return await self.session.get(f"contractGroup/find?name={name}")
+        return await self.session.cached_find("contractGroup", name)
 
     async def contract_group_item(self, id: int) -> dict:
         """Retrieves an entity of ContractGroup type by its id."""
-        return await self.session.get(f"contractGroup/item?id={id}")
+        return await self.session.cached_item("contractGroup", id)
 
     async def contract_group_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of ContractGroup type by its ids."""
-        return await self.session.get(f"contractGroup/items?ids={','.join([str(id) for id in ids])}")
+        return await self.session.cached_items("contractGroup", ids)
 
     async def contract_group_list(self) -> dict:
         """Retrieves all entities of ContractGroup type."""
-        return await self.session.get("contractGroup/list")
+        return await self.session.cached_list("contractGroup")
 
     async def contract_group_suggest(self, text: str, n_entities: int) -> dict:
         """Retrieves entities of ContractGroup type filtered by an occurrence of a text in one of its fields."""
@@ -75,11 +77,11 @@ class Contract_Library:
 
     async def contract_maturity_item(self, id: int) -> dict:
         """Retrieves an entity of ContractMaturity type by its id."""
-        return await self.session.get(f"ContractMaturity/item?id={id}")
+        return await self.session.cached_item("contractMaturity", id)
 
     async def contract_maturity_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of ContractMaturity type by its ids."""
-        return await self.session.get(f"ContractMaturity/items?ids={','.join([str(id) for id in ids])}")
+        return await self.session.cached_items("contractMaturity", ids)
 
     async def contract_maturity_L_dependents(self, master_ids: list[int]) -> dict:
         """Retrieves all entities of ContractMaturity type related to multiple entities of Product type."""
@@ -87,19 +89,19 @@ class Contract_Library:
 
     async def currency_find(self, name: str) -> dict:
         """Retrieves an entity of Currency type by its name."""
-        return await self.session.get(f"currency/find?name={name}")
+        return await self.session.cached_find("currency", name)
 
     async def currency_item(self, id: int) -> dict:
         """Retrieves an entity of Currency type by its id."""
-        return await self.session.get(f"currency/item?id={id}")
+        return await self.session.cached_item("currency", id)
 
     async def currency_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of Currency type by its ids."""
-        return await self.session.get(f"currency/items?ids={','.join([str(id) for id in ids])}")
+        return await self.session.cached_items("currency", ids)
 
     async def currency_list(self) -> dict:
         """Retrieves all entities of Currency type."""
-        return await self.session.get("currency/list")
+        return await self.session.cached_list("currency")
 
     async def currency_suggest(self, text: str, n_entities: int) -> dict:
         """Retrieves entities of Currency type filtered by an occurrence of a text in one of its fields."""
@@ -111,7 +113,7 @@ class Contract_Library:
 
     async def currency_rate_item(self, id: int) -> dict:
         """Retrieves an entity of CurrencyRate type by its id."""
-        return await self.session.get(f"currencyRate/item?id={id}")
+        return await self.session.item("currencyRate", id)
 
     async def currency_rate_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of CurrencyRate type by its ids."""
@@ -127,19 +129,19 @@ class Contract_Library:
 
     async def exchange_find(self, name: str) -> dict:
         """Retrieves an entity of Exchange type by its name."""
-        return await self.session.get(f"exchange/find?name={name}")
+        return await self.session.cached_find("exchange", name)
 
     async def exchange_item(self, id: int) -> dict:
         """Retrieves an entity of Exchange type by its id."""
-        return await self.session.get(f"exchange/item?id={id}")
+        return await self.session.cached_item("exchange", id)
 
     async def exchange_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of Exchange type by its ids."""
-        return await self.session.get(f"exchange/items?ids={','.join([str(id) for id in ids])}")
+        return await self.session.cached_items("exchange", ids)
 
     async def exchange_list(self) -> dict:
         """Retrieves all entities of Exchange type."""
-        return await self.session.get("exchange/list")
+        return await self.session.cached_list("exchange")
 
     async def exchange_suggest(self, text: str, n_entities: int) -> dict:
         """Retrieves entities of Exchange type filtered by an occurrence of a text in one of its fields."""
@@ -151,23 +153,23 @@ class Contract_Library:
 
     async def product_find(self, name: str) -> dict:
         """Retrieves an entity of Product type by its name."""
-        return await self.session.get(f"product/find?name={name}")
+        return await self.session.cached_find("product", name)
 
     async def product_item(self, id: int) -> dict:
         """Retrieves an entity of Product type by its id."""
-        return await self.session.get(f"product/id={id}")
+        return await self.session.cached_item("product", id)
 
     async def product_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of Product type by its ids."""
-        return await self.session.get(f"product/items?ids={','.join(str(id) for id in ids)}")
+        return await self.session.cached_items("product", ids)
 
     async def product_L_dependents(self, master_ids: list[int]) -> dict:
         """Retrieves all entities of Product type related to multiple entities of Exchange type."""
-        return await self.session.get(f"product/ldeps?masterid={','.join([str(id) for id in master_ids])}")
+        return await self.session.get(f"product/ldeps?masterids={','.join([str(id) for id in master_ids])}")
 
     async def product_list(self) -> dict:
         """Retrieves all entities of Product type."""
-        return await self.session.get("product/list")
+        return await self.session.cached_list("product")
 
     async def product_suggest(self, text: str, n_entities: int) -> dict:
         """Retrieves entities of Product type filtered by an occurrence of a text in one of its fields."""
@@ -179,11 +181,11 @@ class Contract_Library:
 
     async def product_sess_item(self, id: int) -> dict:
         """Retrieves an entity of ProductSession type by its id."""
-        return await self.session.get(f"productSession/item?id={id}")
+        return await self.session.cached_item("productSession", id)
 
     async def product_session_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of ProductSession type by its ids."""
-        return await self.session.get(f"productSession/items?ids={','.join([str(id) for id in ids])}")
+        return await self.session.cached_items("productSession", ids)
 
     async def product_session_L_dependents(self, master_ids: list[int]) -> dict:
         """Retrieves all entities of ProductSession type related to multiple entities of Product type."""
@@ -191,8 +193,8 @@ class Contract_Library:
 
     async def spread_definition_item(self, id: int) -> dict:
         """Retrieves an entity of SpreadDefinition type by its id."""
-        return await self.session.get(f"SpreadDefinition/item?id={id}")
+        return await self.session.cached_item("spreadDefinition", id)
 
     async def spread_definition_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of SpreadDefinition type by its ids."""
-        return await self.session.get(f"SpreadDefinition/items?ids={','.join([str(id) for id in ids])}")
+        return await self.session.cached_items("spreadDefinition", ids)
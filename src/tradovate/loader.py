@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable
+
+
+class ItemLoader:
+    """Coalesces concurrent item lookups of one entity type into items requests.
+
+    Ids requested within the same event-loop tick (or within `window` seconds)
+    are deduplicated and fetched with a single `<entity>/items?ids=` call,
+    split so that no request URL exceeds `max_url_length`. Each caller gets
+    the entity with its id, or None when the server did not return it.
+    """
+
+    # -Constructor
+    def __init__(self,
+                 entity: str,
+                 fetch: Callable[[str], Awaitable[list[dict]]],
+                 window: float = 0.0,
+                 max_url_length: int = 2000) -> ItemLoader:
+        self.entity = entity
+        self.window = window
+        self.max_url_length = max_url_length
+        self.requests = 0
+        self.loads = 0
+        self._fetch = fetch
+        self._pending: dict[int, asyncio.Future] = {}
+        self._scheduled = False
+
+    def __repr__(self) -> str:
+        return f"ItemLoader(entity={self.entity}, loads={self.loads}, requests={self.requests})"
+
+    async def load(self, id: int) -> dict | None:
+        """Retrieves an entity by its id through the next batched items request."""
+        id = int(id)
+        self.loads += 1
+        future = self._pending.get(id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[id] = loop.create_future()
+            if not self._scheduled:
+                self._scheduled = True
+                if self.window:
+                    loop.call_later(self.window, self._dispatch)
+                else:
+                    loop.call_soon(self._dispatch)
+        return await asyncio.shield(future)
+
+    async def load_many(self, ids: list[int]) -> list[dict | None]:
+        """Retrieves multiple entities by their ids, in the order given."""
+        return list(await asyncio.gather(*(self.load(id) for id in ids)))
+
+    def _chunks(self, ids: list[int]) -> list[list[int]]:
+        """Splits ids so each items URL stays within max_url_length."""
+        prefix = len(f"{self.entity}/items?ids=")
+        chunks, chunk, length = [], [], prefix
+        for id in ids:
+            size = len(str(id)) + 1
+            if chunk and length + size > self.max_url_length:
+                chunks.append(chunk)
+                chunk, length = [], prefix
+            chunk.append(id)
+            length += size
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        self._scheduled = False
+        for chunk in self._chunks(list(pending)):
+            asyncio.ensure_future(self._resolve(chunk, pending))
+
+    async def _resolve(self, ids: list[int], pending: dict[int, asyncio.Future]) -> None:
+        self.requests += 1
+        try:
+            result = await self._fetch(
+                f"{self.entity}/items?ids={','.join(str(id) for id in ids)}"
+            )
+        except Exception as exc:
+            for id in ids:
+                if not pending[id].done():
+                    pending[id].set_exception(exc)
+            return
+        found = {
+            item.get('id'): item for item in result if isinstance(item, dict)
+        } if isinstance(result, list) else {}
+        for id in ids:
+            if not pending[id].done():
+                pending[id].set_result(found.get(id))
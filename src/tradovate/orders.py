@@ -1,7 +1,10 @@
 from __future__ import annotations
-import asyncio,redis,logging,json,os
+import asyncio,logging,json,os
+from typing import AsyncIterator, Iterable
 
+from .bulk import BulkResult, bulk
 from .client import Client
+from .stream.utils.errors import RiskRejectedException
 #from .auth import Profile
 #from .auth.session import Session
 #from .accounting import Accounting
@@ -28,13 +31,21 @@ class Orders(Client):
     #def __init__(self, session) -> Orders:
     #    self._session = session
 
+    def _approve(self, account_id: int | None, symbol: str, action: str, order_qty: int) -> None:
+        """Raises RiskRejectedException when the risk gate refuses an order, REST orders are never clipped."""
+        if self.risk is None:
+            return
+        check = self.risk.check(self.id if account_id is None else account_id, symbol, action, order_qty)
+        if not check:
+            raise RiskRejectedException(symbol, action, order_qty, check.reason)
+
     async def command_dependents(self, master_id: int) -> dict:
         """Retrieves all entities of Command type related to Order entity."""
         return await self._session.get(f"command/deps?masterid={master_id}")
 
     async def command_item(self, id: int) -> dict:
         """Retrieves an entity of Command type by its id."""
-        return await self._session.get(f"command/item?id={id}")
+        return await self._session.item("command", id)
 
     async def command_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of Command type by its ids."""
@@ -58,7 +69,7 @@ class Orders(Client):
 
     async def command_report_item(self, id: int) -> dict:
         """Retrieves an entity of CommandReport type by its id."""
-        return await self._session.get(f"commandReport/item?id={id}")
+        return await self._session.item("commandReport", id)
 
     async def command_report_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of CommandReport type by its ids."""
@@ -86,7 +97,7 @@ class Orders(Client):
 
     async def execution_report_item(self, id: int) -> dict:
         """Retrieves an entity of ExecutionReport type by its id."""
-        return await self._session.get(f"executionReport/item?id={id}")
+        return await self._session.item("executionReport", id)
 
     async def execution_report_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of ExecutionReport type by its ids."""
@@ -114,7 +125,7 @@ class Orders(Client):
 
     async def fill_item(self, id: int) -> dict:
         """Retrieves an entity of Fill type by its id."""
-        return await self._session.get(f"fill/item?id={id}")
+        return await self._session.item("fill", id)
 
     async def fill_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of Fill type by its ids."""
@@ -138,7 +149,7 @@ class Orders(Client):
 
     async def fill_fee_item(self, id: int) -> dict:
         """Retrieves an entity of FillFee type by its id."""
-        return await self._session.get(f"fillFee/item?id={id}")
+        return await self._session.item("fillFee", id)
 
     async def fill_fee_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of FillFee type by its ids."""
@@ -174,13 +185,29 @@ class Orders(Client):
             },
         )
 
+    def cancel_many(self,
+                    order_ids: Iterable[int],
+                    is_automated: bool = None,
+                    concurrency: int = 8) -> AsyncIterator[BulkResult]:
+        """
+        Make concurrent requests to cancel orders, at most `concurrency` in flight and paced by self.limiter.
+        Yields a BulkResult keyed by order id as each request completes.
+        Like modify_order, the changes are not risk checked.
+        """
+        return bulk((
+            (order_id, lambda order_id=order_id, **extra: self._session.post(
+                url="order/cancelorder",
+                payload={"orderId": order_id, "isAutomated": is_automated, **extra},
+            )) for order_id in order_ids
+        ), concurrency=concurrency, limiter=self.limiter)
+
     async def order_dependents(self, master_id: int) -> dict:
         """Retrieves all entities of Order type related to Account entity."""
         return await self._session.get(f"order/deps?masterid={master_id}")
 
     async def order_item(self, id: int) -> dict:
         """Retrieves an entity of Order type by its id."""
-        return await self._session.get(f"order/item?id={id}")
+        return await self._session.item("order", id)
 
     async def order_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of Order type by its ids."""
@@ -215,6 +242,22 @@ class Orders(Client):
             },
         )
 
+    def flatten_all(self,
+                    account_id: int,
+                    contract_ids: Iterable[int],
+                    admin: bool = False,
+                    concurrency: int = 8) -> AsyncIterator[BulkResult]:
+        """
+        Send concurrent requests to liquidate the positions of an account in the given contracts.
+        Yields a BulkResult keyed by contract id as each request completes.
+        """
+        return bulk((
+            (contract_id, lambda contract_id=contract_id, **extra: self._session.post(
+                url="order/liquidateposition",
+                payload={"accountId": account_id, "contractId": contract_id, "admin": admin, **extra},
+            )) for contract_id in contract_ids
+        ), concurrency=concurrency, limiter=self.limiter)
+
     async def order_list(self) -> dict:
         """Retrieves all entities of Order type."""
         return await self._session.get("order/list")
@@ -240,6 +283,9 @@ class Orders(Client):
 
         Note: This is no guarantee that the order can be modified in a given way.
               Market and exchange rules apply.
+
+        Not risk checked: the REST client keeps no order state to tell a quantity
+        increase from the working quantity, modify through stream OrderEntry for that.
         """
         return await self._session.post(
             url="order/modifyorder",
@@ -254,6 +300,20 @@ class Orders(Client):
             },
         )
 
+    def modify_many(self,
+                    changes: Iterable[dict],
+                    concurrency: int = 8) -> AsyncIterator[BulkResult]:
+        """
+        Make concurrent requests to modify orders, each change being a modifyorder payload with its orderId.
+        Yields a BulkResult keyed by order id as each request completes.
+        Like modify_order, the changes are not risk checked.
+        """
+        return bulk((
+            (change["orderId"], lambda change=change, **extra: self._session.post(
+                url="order/modifyorder", payload={**change, **extra},
+            )) for change in changes
+        ), concurrency=concurrency, limiter=self.limiter)
+
     async def place_OCO(self,
                         action: str,
                         symbol: str,
@@ -291,6 +351,7 @@ class Orders(Client):
         which determines the other parameters that must be set. For example a Limit or Stop
         order must use the price parameter, but a Stop-Limit will require a price and a stopPrice.
         """
+        self._approve(account_id, symbol, action, order_qty)
         return await self._session.post(
             url="order/placeoco",
             payload={
@@ -329,7 +390,9 @@ class Orders(Client):
         """
         Make a request to place an order.
         Depending on the order type, the parameters vary.
+        With a risk gate set, the order is checked first and refused with RiskRejectedException.
         """
+        self._approve(account_id, symbol, action, order_qty)
         return await self._session.post(
             url="order/placeorder",
             payload={
@@ -383,6 +446,7 @@ class Orders(Client):
         Place an Order Sends Order order strategy.
         OSO orders allow for the most complex multi-bracket trading strategies.
         """
+        self._approve(account_id, symbol, action, order_qty)
         return await self._session.post(
             url="order/placeoso",
             payload={
@@ -419,7 +483,7 @@ class Orders(Client):
 
     async def order_strategy_item(self, id: int) -> dict:
         """Retrieves an entity of OrderStrategy type by its id."""
-        return await self._session.get(f"orderStrategy/item?id={id}")
+        return await self._session.item("orderStrategy", id)
 
     async def order_strategy_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of OrderStrategy type by its ids."""
@@ -485,7 +549,7 @@ class Orders(Client):
 
     async def order_strategy_link_item(self, id: int) -> dict:
         """Retrieves an entity of OrderStrategyLink type by its id."""
-        return await self._session.get(f"orderStrategyLink/item?id={id}")
+        return await self._session.item("orderStrategyLink", id)
 
     async def order_strategy_link_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of OrderStrategyLink type by its ids."""
@@ -509,7 +573,7 @@ class Orders(Client):
 
     async def order_version_item(self, id: int) -> dict:
         """Retrieves an entity of OrderVersion type by its id."""
-        return await self._session.get(f"orderVersion/items?id={id}")
+        return await self._session.item("orderVersion", id)
 
     async def order_version_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of OrderVersion type by its ids."""
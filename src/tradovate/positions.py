@@ -20,7 +20,7 @@ class Positions(Client):
 
     async def fill_pair_item(self, id: int) -> dict:
         """Retrieves an entity of FillPair type by its id."""
-        return await self.session.get(f"fillPair/item?id={id}")
+        return await self.session.item("fillPair", id)
 
     async def fill_pair_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of FillPair type by its ids."""
@@ -44,7 +44,7 @@ class Positions(Client):
 
     async def position_item(self, id: int) -> dict:
         """Retrieves an entity of Position type by its id."""
-        return await self.session.get(f"position/item?id={id}")
+        return await self.session.item("position", id)
 
     async def position_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of Position type by its ids."""
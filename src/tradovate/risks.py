@@ -14,7 +14,7 @@ class Risk:
 
     async def account_risk_status_item(self, id: int) -> dict:
         """Retrieves an entity of AccountRiskStatus type by its id."""
-        return await self.session.get(f"accountRiskStatus/id={id}")
+        return await self.session.item("accountRiskStatus", id)
 
     async def account_risk_status_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of AccountRiskStatus type by its ids."""
@@ -34,7 +34,7 @@ class Risk:
 
     async def contract_margin_item(self, id: int) -> dict:
         """Retrieves an entity of ContractMargin type by its id."""
-        return await self.session.get(f"contractMargin/item?id={id}")
+        return await self.session.item("contractMargin", id)
 
     async def contract_margin_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of ContractMargin type by its ids."""
@@ -50,7 +50,7 @@ class Risk:
 
     async def product_margin_item(self, id: int) -> dict:
         """Retrieves an entity of ProductMargin type by its id."""
-        return await self.session.get(f"productMargin/item?id={id}")
+        return await self.session.item("productMargin", id)
 
     async def product_margin_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of ProductMargin type by its ids."""
@@ -112,11 +112,11 @@ class Risk:
 
     async def user_account_auto_liq_item(self, id: int) -> dict:
         """Retrieves an entity of UserAccountAutoLiq type by its id."""
-        return await self.session.get(f"userAccountAutoLiq/item?id={id}")
+        return await self.session.item("userAccountAutoLiq", id)
 
     async def user_account_auto_liq_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of UserAccountAutoLiq type by its ids."""
-        return await self.session.get(f"userAccountAutoLiq/item?ids={','.join([str(id) for id in ids])}")
+        return await self.session.get(f"userAccountAutoLiq/items?ids={','.join([str(id) for id in ids])}")
 
     async def user_account_auto_liq_L_dependents(self, master_ids: list[int]) -> dict:
         """Retrieves all entities of UserAccountAutoLiq type related to multiple entities of Account type."""
@@ -228,7 +228,7 @@ class Risk:
 
     async def user_account_position_limit_item(self, id: int) -> dict:
         """Retrieves an entity of UserAccountPositionLimit type by its id."""
-        return await self.session.get(f"userAccountPositionLimit/item?id={id}")
+        return await self.session.item("userAccountPositionLimit", id)
 
     async def user_account_position_limit_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of UserAccountPositionLimit type by its ids."""
@@ -324,7 +324,7 @@ class Risk:
 
     async def user_account_risk_parameter_item(self, id: int) -> dict:
         """Retrieves an entity of UserAccountRiskParameter type by its id."""
-        return await self.session.get(f"userAccountRiskParameter/item?id={id}")
+        return await self.session.item("userAccountRiskParameter", id)
 
     async def user_account_risk_parameter_items(self, ids: list[int]) -> dict:
         """Retrieves multiple entities of UserAccountRiskParameter type by its ids."""
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+
+from .contractLibrary import Contract_Library
+
+log = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "tradovate", "reference.json"
+)
+# Entities also resolvable by name through <entity>/find.
+NAMED_ENTITIES = ("contract", "exchange", "product")
+
+
+class ReferenceSnapshot:
+    """Local snapshot of contract, product, exchange and product session metadata.
+
+    `load` reads the snapshot file and seeds the session's reference caches
+    without touching the network, so a restarted worker resolves symbols
+    immediately. `refresh` bulk-fetches the entities concurrently and rewrites
+    the file atomically; `warm` loads and schedules a refresh when stale.
+    """
+
+    # -Constructor
+    def __init__(self,
+                 session,
+                 path: str | None = None,
+                 max_age: float = 24 * 3600,
+                 chunk_size: int = 200) -> ReferenceSnapshot:
+        self.session = session
+        self.path = path or os.getenv("TO_SNAPSHOT_PATH", SNAPSHOT_PATH)
+        self.max_age = max_age
+        self.chunk_size = chunk_size
+        self.created: float | None = None
+        self._refreshing: asyncio.Task | None = None
+
+    def __repr__(self) -> str:
+        return f"ReferenceSnapshot(path={self.path}, created={self.created})"
+
+    @property
+    def stale(self) -> bool:
+        return self.created is None or time.time() - self.created > self.max_age
+
+    def load(self) -> bool:
+        """Reads the snapshot file and seeds the reference caches, False when unusable."""
+        try:
+            with open(self.path, "rb") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as exc:
+            log.debug(f"Snapshot not loaded: {exc}")
+            return False
+        if data.get("version") != SNAPSHOT_VERSION or data.get("url") != self.session.URL:
+            return False
+        self.seed(data["entities"])
+        self.created = data["created"]
+        return True
+
+    def seed(self, entities: dict[str, list[dict]]) -> None:
+        """Stores entities in the session's reference caches by id and name.
+
+        The caches grow to hold the whole snapshot, their LRU bound only
+        limits entries loaded on demand.
+        """
+        for entity, items in entities.items():
+            named = entity in NAMED_ENTITIES
+            self.session.reference_cache(entity).seed(
+                (key, item)
+                for item in items
+                for key in (
+                    (("item", item["id"]), ("find", item["name"]))
+                    if named and "name" in item else (("item", item["id"]),)
+                )
+            )
+
+    def save(self, entities: dict[str, list[dict]], created: float) -> None:
+        """Writes the snapshot file atomically."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(
+                {
+                    "version": SNAPSHOT_VERSION,
+                    "created": created,
+                    "url": self.session.URL,
+                    "entities": entities,
+                },
+                f, separators=(",", ":"),
+            )
+        os.replace(tmp, self.path)
+
+    async def _dependents(self, entity: str, master_ids: list[int]) -> list[dict]:
+        '''Fetches <entity>/ldeps for master ids in concurrent chunks'''
+        chunks = [
+            master_ids[i:i + self.chunk_size]
+            for i in range(0, len(master_ids), self.chunk_size)
+        ]
+        results = await asyncio.gather(*(
+            self.session.get(f"{entity}/ldeps?masterids={','.join(str(id) for id in chunk)}")
+            for chunk in chunks
+        ))
+        return [item for result in results if isinstance(result, list) for item in result]
+
+    async def fetch(self) -> dict[str, list[dict]]:
+        """Bulk-fetches exchanges, products, product sessions and unexpired contracts."""
+        library = Contract_Library(self.session)
+        exchanges, products = await asyncio.gather(
+            library.exchange_list(), library.product_list()
+        )
+        product_ids = [product["id"] for product in products]
+        maturities, sessions = await asyncio.gather(
+            self._dependents("contractMaturity", product_ids),
+            self._dependents("productSession", product_ids),
+        )
+        now = datetime.now(timezone.utc).isoformat()
+        maturities = [
+            maturity for maturity in maturities
+            if maturity.get("expirationDate", now) >= now
+        ]
+        contracts = await self._dependents(
+            "contract", [maturity["id"] for maturity in maturities]
+        )
+        return {
+            "exchange": exchanges,
+            "product": products,
+            "productSession": sessions,
+            "contractMaturity": maturities,
+            "contract": contracts,
+        }
+
+    async def refresh(self) -> dict[str, list[dict]]:
+        """Fetches the entities, seeds the caches and rewrites the snapshot file."""
+        created = time.time()
+        entities = await self.fetch()
+        self.seed(entities)
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.save, entities, created
+        )
+        self.created = created
+        log.debug(f"Snapshot refreshed: {sum(map(len, entities.values()))} entities")
+        return entities
+
+    async def warm(self, wait: bool = True) -> bool:
+        """Loads the snapshot, refreshing in the background when stale.
+
+        Without a usable file the refresh is awaited instead, or also left in
+        the background when `wait` is False. Returns whether the snapshot file
+        was loaded.
+        """
+        loaded = self.created is not None or self.load()
+        if not loaded and wait:
+            await self.refresh()
+        elif self.stale and (self._refreshing is None or self._refreshing.done()):
+            self._refreshing = asyncio.ensure_future(self.refresh())
+            self._refreshing.add_done_callback(self._refreshed)
+        return loaded
+
+    def _refreshed(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            log.warning(f"Snapshot refresh failed: {task.exception()!r}")
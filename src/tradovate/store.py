@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+import fnmatch
+import inspect
+import os
+import threading
+import time
+import weakref
+from typing import Any, AsyncIterator, Iterable
+
+# Deletes KEYS[1] only if it still holds ARGV[1], e.g. a lock owned by this process.
+COMPARE_AND_DELETE = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then "
+    "return redis.call('del', KEYS[1]) else return 0 end"
+)
+MEMORY_URL = 'memory://'
+
+_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_sync_client = None
+_lock = threading.Lock()
+
+
+def redis_url() -> str:
+    """REDIS_URL, else redis://REDIS_HOST:REDIS_PORT. memory:// selects the in-memory backend."""
+    return os.environ.get('REDIS_URL') or (
+        f"redis://{os.environ.get('REDIS_HOST', 'redis')}:{os.environ.get('REDIS_PORT', '6379')}"
+    )
+
+
+def get_redis():
+    """The asyncio Redis client of the running loop, created on first use.
+
+    A client and its connection pool are bound to one event loop, so each
+    loop gets its own, shared by every caller on that loop. Creating it opens
+    no connection; the pool connects on the first command.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        url = redis_url()
+        if url.startswith(MEMORY_URL):
+            client = MemoryRedis()
+        else:
+            import redis.asyncio
+            client = redis.asyncio.Redis(connection_pool=redis.asyncio.ConnectionPool.from_url(
+                url, decode_responses=True,
+                max_connections=int(os.environ.get('REDIS_MAX_CONNECTIONS', '32')),
+            ))
+        _clients[loop] = client
+    return client
+
+
+def get_sync_redis():
+    """The blocking Redis client for code running outside an event loop, None with memory://."""
+    global _sync_client
+    if redis_url().startswith(MEMORY_URL):
+        return None
+    with _lock:
+        if _sync_client is None:
+            import redis
+            _sync_client = redis.Redis.from_url(redis_url(), decode_responses=True)
+    return _sync_client
+
+
+async def close_redis() -> None:
+    """Closes the client of the running loop, the next get_redis creates a new one."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def pipelined(commands: Iterable[tuple], client=None, transaction: bool = False) -> list:
+    """Sends (command, *args) tuples in one round trip, returns their replies in order.
+
+    A trailing dict in a tuple is passed as keyword arguments.
+    """
+    pipe = (client or get_redis()).pipeline(transaction=transaction)
+    for command, *args in commands:
+        kwargs = args.pop() if args and isinstance(args[-1], dict) else {}
+        getattr(pipe, command)(*args, **kwargs)
+    return await pipe.execute()
+
+
+async def maybe_await(value: Any) -> Any:
+    """Result of a sync or async client call."""
+    return await value if inspect.isawaitable(value) else value
+
+
+class SharedRedis:
+    """Stand-in resolving to the running loop's client on every attribute access.
+
+    Objects that outlive a loop, or are built before one runs, hold this
+    instead of a client.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_redis(), name)
+
+    def __repr__(self) -> str:
+        return f"SharedRedis(url={redis_url()})"
+
+
+class _MemoryPubSub:
+    """Channel subscriptions of a MemoryRedis, handlers run on the subscribing loop."""
+
+    def __init__(self, server: _MemoryServer) -> _MemoryPubSub:
+        self._server = server
+        self._handlers: dict[str, Any] = {}
+        self._closed = asyncio.Event()
+
+    async def subscribe(self, **handlers) -> None:
+        loop = asyncio.get_running_loop()
+        for channel, handler in handlers.items():
+            self._handlers[channel] = handler
+            self._server.subscribers.setdefault(channel, []).append((loop, handler))
+
+    async def run(self, *, poll_timeout: float = 1.0, **kwargs) -> None:
+        await self._closed.wait()
+
+    async def aclose(self) -> None:
+        for channel, handler in self._handlers.items():
+            self._server.subscribers[channel] = [
+                sub for sub in self._server.subscribers.get(channel, ()) if sub[1] is not handler
+            ]
+        self._handlers.clear()
+        self._closed.set()
+
+
+class _MemoryServer:
+    """Process-wide keyspace shared by every MemoryRedis."""
+
+    def __init__(self) -> _MemoryServer:
+        self.data: dict[str, str] = {}
+        self.expires: dict[str, float] = {}
+        self.subscribers: dict[str, list] = {}
+
+    def alive(self, key: str) -> bool:
+        expires = self.expires.get(key)
+        if expires is not None and expires <= time.monotonic():
+            self.data.pop(key, None)
+            del self.expires[key]
+        return key in self.data
+
+
+class _MemoryPipeline:
+    """Queued MemoryRedis commands applied by execute."""
+
+    def __init__(self, client: MemoryRedis) -> _MemoryPipeline:
+        self._client = client
+        self._commands: list = []
+
+    def __getattr__(self, name: str) -> Any:
+        def queue(*args, **kwargs) -> _MemoryPipeline:
+            self._commands.append((getattr(self._client, name), args, kwargs))
+            return self
+        return queue
+
+    async def execute(self) -> list:
+        commands, self._commands = self._commands, []
+        return [await method(*args, **kwargs) for method, args, kwargs in commands]
+
+
+class MemoryRedis:
+    """In-memory asyncio backend for tests and offline runs.
+
+    Supports the commands this package uses: get, set (nx, px, ex), delete,
+    mget, scan_iter, publish, pubsub, pipelines and the COMPARE_AND_DELETE
+    script. Values are stored as strings, as with decode_responses=True.
+    """
+    server = _MemoryServer()
+
+    async def get(self, key: str) -> str | None:
+        return self.server.data[key] if self.server.alive(key) else None
+
+    async def set(self, key: str, value: Any, *, nx: bool = False,
+                  px: int | None = None, ex: float | None = None) -> bool | None:
+        if nx and self.server.alive(key):
+            return None
+        self.server.data[key] = str(value)
+        self.server.expires.pop(key, None)
+        if px is not None or ex is not None:
+            self.server.expires[key] = time.monotonic() + (px / 1000 if px is not None else ex)
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        deleted = 0
+        for key in keys:
+            deleted += self.server.alive(key)
+            self.server.data.pop(key, None)
+            self.server.expires.pop(key, None)
+        return deleted
+
+    async def mget(self, keys: Iterable[str]) -> list[str | None]:
+        return [await self.get(key) for key in keys]
+
+    async def scan_iter(self, match: str = '*') -> AsyncIterator[str]:
+        for key in list(self.server.data):
+            if fnmatch.fnmatchcase(key, match) and self.server.alive(key):
+                yield key
+
+    async def eval(self, script: str, numkeys: int, *keys_and_args: Any) -> Any:
+        if script != COMPARE_AND_DELETE:
+            raise NotImplementedError('MemoryRedis only evaluates COMPARE_AND_DELETE')
+        key, value = keys_and_args[0], keys_and_args[numkeys]
+        return await self.delete(key) if await self.get(key) == value else 0
+
+    async def publish(self, channel: str, message: Any) -> int:
+        subscribers = [
+            (loop, handler) for loop, handler in self.server.subscribers.get(channel, ())
+            if not loop.is_closed()
+        ]
+        data = {'type': 'message', 'channel': channel, 'data': str(message)}
+        for loop, handler in subscribers:
+            loop.call_soon_threadsafe(handler, data)
+        return len(subscribers)
+
+    def pubsub(self, **kwargs) -> _MemoryPubSub:
+        return _MemoryPubSub(self.server)
+
+    def pipeline(self, transaction: bool = True) -> _MemoryPipeline:
+        return _MemoryPipeline(self)
+
+    async def aclose(self) -> None:
+        pass
+
+    def __repr__(self) -> str:
+        return f"MemoryRedis(keys={len(self.server.data)})"
+
+
+shared_redis = SharedRedis()
@@ -0,0 +1,457 @@
+## Imports
+from __future__ import annotations
+import json,time
+from datetime import datetime
+from typing import Iterator
+
+import numpy as np
+import pytz
+
+from .bars import bar_timestamp
+from .fractals import fractal_down_zone, fractal_down_zones
+from .indicators import rsi, rsi_sums, wma
+from .replay import read_frames
+from .utils.clock import SimulatedClock
+
+## Constants
+NAN = float('nan')
+# -Bar fields read by the strategy, in column order
+COLUMNS = ('open', 'high', 'low', 'close', 'offerVolume')
+TIMEZONE = 'America/Los_Angeles'
+
+
+## Functions
+def chart_updates(path: str) -> Iterator[tuple[float, list[dict]]]:
+    """(receive time, bars) of every chart in a frame file, in the order the client handles them"""
+    for ts, data in read_frames(path):
+        if data[:1] != 'a':
+            continue
+        for msg in json.loads(data[1:]):
+            if not msg or msg.get('e') != 'chart' or not msg.get('d'):
+                continue
+            for chart in msg['d'].get('charts') or ():
+                if chart.get('bars'):
+                    yield ts, chart['bars']
+
+
+def local_time(times: np.ndarray, tz: str = TIMEZONE) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Hour, minute and second of epoch times in a timezone, as datetime.fromtimestamp gives them
+
+    UTC offsets only change on the hour, so one lookup per distinct hour
+    covers every time.
+    """
+    zone = pytz.timezone(tz)
+    micros = np.round(np.asarray(times, dtype=np.float64) * 1e6).astype(np.int64)
+    seconds = micros // 1_000_000
+    hours, inverse = np.unique(seconds // 3600, return_inverse=True)
+    offsets = np.array([
+        datetime.fromtimestamp(int(hour) * 3600, zone).utcoffset().total_seconds()
+        for hour in hours
+    ], dtype=np.int64)
+    day = (seconds + offsets[inverse.reshape(-1)]) % 86400
+    return day // 3600, day // 60 % 60, day % 60
+
+
+## Classes
+class Trade:
+    """Round trip of the strategy in points: entry, exit and why it exited"""
+    __slots__ = ('side', 'entry_time', 'entry_price', 'exit_time', 'exit_price', 'gain', 'reason')
+
+    # -Constructor
+    def __init__(
+        self, side: str, entry_time: float, entry_price: float,
+        exit_time: float, exit_price: float, gain: float, reason: str
+    ) -> Trade:
+        self.side: str = side
+        self.entry_time: float = entry_time
+        self.entry_price: float = entry_price
+        self.exit_time: float = exit_time
+        self.exit_price: float = exit_price
+        self.gain: float = gain
+        self.reason: str = reason
+
+    def __repr__(self) -> str:
+        return (
+            f"Trade({self.side} {self.entry_price} -> {self.exit_price}, "
+            f"gain={self.gain:+.2f}, reason={self.reason})"
+        )
+
+
+class BacktestResult:
+    """Trades, open order and strategy state left by a backtest run"""
+
+    # -Constructor
+    def __init__(
+        self, trades: list[Trade], order: dict | None, state: dict[str, str | float],
+        bars: int, evaluations: int, seconds: float
+    ) -> BacktestResult:
+        self.trades: list[Trade] = trades
+        self.order: dict | None = order
+        self.state: dict[str, str | float] = state
+        self.bars: int = bars
+        self.evaluations: int = evaluations
+        self.seconds: float = seconds
+
+    def __repr__(self) -> str:
+        return (
+            f"BacktestResult(trades={len(self.trades)}, pnl={self.pnl:+.2f}, "
+            f"bars={self.bars}, evaluations={self.evaluations}, seconds={self.seconds:.3f})"
+        )
+
+    # -Properties
+    @property
+    def equity(self) -> np.ndarray:
+        '''Cumulative PnL in points after each trade'''
+        return np.cumsum([trade.gain for trade in self.trades])
+
+    @property
+    def pnl(self) -> float:
+        '''Realized PnL in points'''
+        return float(sum(trade.gain for trade in self.trades))
+
+
+class Backtest:
+    """Vectorized backtest of Client.logic_call_put
+
+    Every input the strategy reads (indicators, fractal zones, crossovers,
+    session windows and the last-second test) is computed for all
+    evaluations at once from bar arrays. Only the order state machine
+    steps through them, and it skips ahead to the next entry signal while
+    flat. An evaluation is the strategy running on one chart update: the
+    bar being formed is revised in place while earlier bars keep their
+    final values, as in the client's buffer.
+
+    Indicators start at the first bar of the buffer once it holds
+    `capacity` bars, like the client's. History older than that, arriving
+    later, is dropped where the client would reseed its indicators.
+    """
+
+    # -Constructor
+    def __init__(
+        self, ticker: str, interval: int, *,
+        start_times: str = "1:00", end_times: str = "23:30", exit_times: str = "23:00",
+        point_in: float = 3, point_out: float = 5, stoploss_point: float = 7,
+        capacity: int = 240, tz: str = TIMEZONE, clock: SimulatedClock | None = None
+    ) -> Backtest:
+        self.ticker: str = ticker
+        self.interval: int = interval
+        self.start_times: list[str] = start_times.split(":")
+        self.end_times: list[str] = end_times.split(":")
+        self.exit_times: list[str] = exit_times.split(":")
+        self.point_in: float = point_in
+        self.point_out: float = point_out
+        self.stoploss_point: float = stoploss_point
+        self.capacity: int = capacity
+        self.tz: str = tz
+        self.clock: SimulatedClock = clock if clock is not None else SimulatedClock()
+
+    def __repr__(self) -> str:
+        return f"Backtest(ticker={self.ticker}, interval={self.interval}, clock={self.clock!r})"
+
+    # -Instance Methods: Private
+    def _support(self, bars: np.ndarray, low: float) -> float:
+        '''Client._support: fractal zone over the first full buffer, else its live low'''
+        open_, _, lows, close, offer_volume = bars[:, :self.capacity]
+        return fractal_down_zone(
+            open_, close, lows, offer_volume, wma(offer_volume, 6)[-18:], low, 12
+        )
+
+    def _signals(
+        self, bars: np.ndarray, times: np.ndarray, index: np.ndarray,
+        live: np.ndarray, support: float
+    ) -> dict[str, np.ndarray]:
+        '''Every value logic_call_put reads, one entry per evaluation'''
+        _, high, low, close, offer_volume = bars
+        _, h0, l0, c0, _ = live
+        k = index
+
+        def revised(final: np.ndarray, length: int) -> np.ndarray:
+            # -WMA.revise: only the newest weight sees the live close
+            return final[k] + length * (c0 - close[k]) / (0.5 * length * (length + 1))
+
+        wma200 = wma(close, 200)
+        wma48 = wma(close, 48)
+        wma13 = wma(close, 13)
+        w200, w48, w13 = revised(wma200, 200), revised(wma48, 48), revised(wma13, 13)
+        w48_1, w13_1 = wma48[k - 1], wma13[k - 1]
+        up13_48 = (w13_1 < w48_1) & (w13 > w48)
+        up48_200 = (w48_1 < wma200[k - 1]) & (w48 > w200)
+        down13_48 = (w13_1 > w48_1) & (w13 < w48)
+        down48_200 = (w48_1 > wma200[k - 1]) & (w48 < w200)
+        # -The trend holds until the next cross, checked in the client's order
+        code = np.select([up13_48, up48_200, down13_48, down48_200], [1, 2, -1, -2], 0)
+        last = np.maximum.accumulate(np.where(code != 0, np.arange(len(code)), -1))
+        trend = np.where(last >= 0, code[np.maximum(last, 0)], 0)
+
+        # -RSI.revise: fold the live change into the sums of the bar before
+        gain, loss = rsi_sums(close, 9)
+        change = c0 - close[k - 1]
+        gain0 = np.where(change > 0, change, 0.0) + (1.0 - 1.0 / 9) * gain[k - 1]
+        loss0 = np.where(change < 0, -change, 0.0) + (1.0 - 1.0 / 9) * loss[k - 1]
+        total = gain0 + loss0
+        valid = (k >= 9) & (total != 0.0)
+        rsi0 = np.where(valid, 100.0 * gain0 / np.where(valid, total, 1.0), NAN)
+        rsi1 = rsi(close, 9)[k - 1]
+
+        point = c0 - w200
+        point1 = close[k - 1] - wma200[k - 1]
+        point2 = close[k - 2] - wma200[k - 2]
+        point5 = close[k - 5] - wma200[k - 5]
+        is_sideway = (
+            (-5 <= point2) & (5 >= point2) & (-5 <= point1) & (5 >= point1)
+            & (-5 <= point) & (5 >= point)
+        )
+
+        # -FractalDownZone(max_count=1): the pivot three bars back, on final bars
+        zones = fractal_down_zones(bars[0], close, low, offer_volume, wma(offer_volume, 6))
+        support_zone = np.where(np.isnan(zones[k - 3]), support, zones[k - 3])
+        support_zone = np.where(support_zone == 0, l0, support_zone)
+
+        hl = (h0 + l0) / 2
+        hl1 = (high[k - 1] + low[k - 1]) / 2
+        hl2 = (high[k - 2] + low[k - 2]) / 2
+
+        h, m, s = local_time(times, self.tz)
+        sh, sm = int(self.start_times[0]), int(self.start_times[1])
+        eh, em = int(self.end_times[0]), int(self.end_times[1])
+        xh, xm = int(self.exit_times[0]), int(self.exit_times[1])
+        is_order = ((sh < h) | (sh == h) & (sm < m)) & ((eh > h) | (eh == h) & (em > m))
+        bigdrop = (rsi0 + 8 < rsi1) & (c0 > w48)
+        bottomsupport = (c0 > support_zone) & (c0 > close[k - 1]) & (rsi0 > rsi1 + 10)
+        entry_in = (point - point1 >= self.point_in) | (point - point2 >= self.point_in)
+        entry_out = (point1 - point >= self.point_out) | (point2 - point >= self.point_out)
+        return {
+            'time': times,
+            'close': c0,
+            'close1': close[k - 1],
+            'candle': h * 60 + (m - m % self.interval),
+            'is_last_second': (m % self.interval == 4) & (s > 55),
+            'is_exit_all': (xh == h) & (xm > m),
+            'is_increase': (hl > hl1) | (hl > hl2),
+            'is_decrease': (hl < hl1) | (hl < hl2),
+            'trend': trend,
+            'entry_in': entry_in,
+            'entry_out': entry_out,
+            'point': np.round(point),
+            'point1': np.round(point1),
+            'point5': np.round(point5),
+            'call': ~is_sideway & ~bigdrop & is_order & entry_in,
+            'put': ~is_sideway & ~bottomsupport & is_order & entry_out,
+        }
+
+    def _simulate(self, signals: dict[str, np.ndarray]) -> tuple[list[Trade], dict | None, dict[str, str | float]]:
+        '''Step the order state machine of logic_call_put through the evaluations'''
+        ticker, interval, clock = self.ticker, self.interval, self.clock
+        es_key = "es_order_" + ticker + "_" + str(interval)
+        order_key = "order_" + ticker + "_" + str(interval)
+        time_key = "time_order_" + ticker + "_" + str(interval)
+        stoploss_point = self.stoploss_point
+        (
+            times, closes, closes1, candles, last_seconds, exit_alls, increases, decreases,
+            trends, entry_ins, entry_outs, points, points1, points5, calls, puts
+        ) = (signals[name].tolist() for name in (
+            'time', 'close', 'close1', 'candle', 'is_last_second', 'is_exit_all',
+            'is_increase', 'is_decrease', 'trend', 'entry_in', 'entry_out',
+            'point', 'point1', 'point5', 'call', 'put'
+        ))
+        entries = np.flatnonzero(signals['call'] | signals['put'])
+        trades: list[Trade] = []
+        state: dict[str, str | float] = {}
+        order: dict | None = None
+        # -(time, price) of the open order and of the last confirmed long
+        entry: tuple[float, float] | None = None
+        long_entry: tuple[float, float] | None = None
+        time_candle = None
+
+        def close_out(order: dict, close: float, gain: float, reason: str) -> None:
+            trades.append(Trade(
+                order['type'], entry[0], entry[1], clock.time(), close, gain, reason
+            ))
+            order['close'] = close
+            order['type'] = 'Exit ' + order['type']
+            order['gain'] = gain
+            state.pop(order_key, None)
+            state[time_key] = clock.time()
+
+        i, n = 0, len(times)
+        while i < n:
+            if order is None and es_key not in state:
+                # -Flat with nothing to recover: jump to the next entry signal
+                j = int(np.searchsorted(entries, i))
+                if j == len(entries):
+                    break
+                i = int(entries[j])
+            clock.set(times[i])
+            close, cur_candle, is_last_second = closes[i], candles[i], last_seconds[i]
+
+            if not order:
+                es_order = state.get(es_key)
+                if es_order:
+                    order = json.loads(es_order)
+                    entry = long_entry
+                    time_candle = cur_candle
+            enter_order = order
+
+            if not enter_order and calls[i]:
+                order = {
+                    'ticker': ticker, 'interval': interval, 'type': 'Buy Long',
+                    'stop_loss': close - stoploss_point, 'close': close, 'number_share': 1,
+                    'signal': 'TO', 'source': 'TradOvate', 'time': clock.time(),
+                    'logic': 'CALL', 'pre_order': True,
+                }
+            if (
+                order and order.get('pre_order') and order['type'] == 'Buy Long'
+                and is_last_second and close > order['close']
+            ):
+                order['stop_loss'] = close - stoploss_point
+                order['close'] = close
+                time_candle = cur_candle
+                del order['pre_order']
+                entry = long_entry = (clock.time(), close)
+                state[es_key] = json.dumps(order)
+                state[time_key] = clock.time()
+
+            if not enter_order and puts[i]:
+                order = {
+                    'ticker': ticker, 'interval': interval, 'type': 'Sell Short',
+                    'stop_loss': close + stoploss_point, 'close': close, 'number_share': 1,
+                    'signal': 'TO', 'source': 'TradOvate', 'time': clock.time(),
+                    'logic': 'PUT Logic', 'pre_order': True,
+                }
+            if (
+                order and order.get('pre_order') and order['type'] == 'Sell Short'
+                and is_last_second and close < order['close']
+            ):
+                del order['pre_order']
+                order['stop_loss'] = close + stoploss_point
+                order['close'] = close
+                time_candle = cur_candle
+                entry = (clock.time(), close)
+                state[order_key] = json.dumps(order)
+                state[time_key] = clock.time()
+
+            if enter_order and 'pre_order' not in order:
+                point, point1, point5 = points[i], points1[i], points5[i]
+                pre_candle = time_candle
+                if order['type'] == 'Buy Long' and not entry_ins[i] and point < point1:
+                    keep = cur_candle > pre_candle and (
+                        close > order['close'] and cur_candle == pre_candle + 5
+                        or cur_candle > pre_candle + 5 and close > closes1[i]
+                    )
+                    if (
+                        exit_alls[i] or close <= order['stop_loss']
+                        or entry_outs[i] and is_last_second or point <= point5
+                    ):
+                        close_out(order, close, close - order['close'], 'stop')
+                        order = None
+                    if (
+                        keep and close - enter_order['close'] >= 2
+                        or close - enter_order['close'] >= 5.5 and increases[i]
+                    ):
+                        close_out(enter_order, close, close - enter_order['close'], 'target')
+                        order = None
+                elif order['type'] == 'Sell Short' and not entry_outs[i] and point > point1:
+                    keep = cur_candle > pre_candle and (
+                        close < order['close'] and cur_candle == pre_candle + 5
+                        or cur_candle > pre_candle + 5 and close < closes1[i]
+                    )
+                    if (
+                        exit_alls[i] or trends[i] > 0 or close >= order['stop_loss']
+                        or entry_ins[i] and is_last_second or point >= point5
+                    ):
+                        close_out(order, close, order['close'] - close, 'stop')
+                        order = None
+                    if (
+                        keep and enter_order['close'] - close >= 1.5
+                        or enter_order['close'] - close >= 4.5 and decreases[i]
+                    ):
+                        close_out(enter_order, close, enter_order['close'] - close, 'target')
+                        order = None
+            i += 1
+        return trades, order, state
+
+    def _run(
+        self, bars: np.ndarray, times: np.ndarray, index: np.ndarray,
+        live: np.ndarray, support: float
+    ) -> BacktestResult:
+        start = time.perf_counter()
+        trades, order, state = self._simulate(self._signals(bars, times, index, live, support))
+        return BacktestResult(
+            trades, order, state, bars.shape[1], len(times), time.perf_counter() - start
+        )
+
+    # -Instance Methods: Public
+    def run(self, bars: list[dict]) -> BacktestResult:
+        '''Backtest on finished bars oldest first, each evaluated once in its last second'''
+        start = time.perf_counter()
+        bars = sorted(bars, key=lambda bar: bar['timestamp'])
+        columns = np.array(
+            [[bar.get(field, 0.0) for bar in bars] for field in COLUMNS], dtype=np.float64
+        ).reshape(len(COLUMNS), len(bars))
+        if len(bars) < self.capacity:
+            return BacktestResult([], None, {}, len(bars), 0, time.perf_counter() - start)
+        index = np.arange(self.capacity - 1, len(bars))
+        times = np.array(
+            [bar_timestamp(bars[i]['timestamp']) for i in index], dtype=np.float64
+        ) + self.interval * 60 - 1
+        result = self._run(
+            columns, times, index, columns[:, index], self._support(columns, columns[2, self.capacity - 1])
+        )
+        result.seconds = time.perf_counter() - start
+        return result
+
+    def run_frames(self, path: str) -> BacktestResult:
+        '''Backtest on the chart updates of a recorded frame file, at their receive times'''
+        start = time.perf_counter()
+        rows: dict[int, list[float]] = {}
+        updates: list[tuple[float, int, list[float]]] = []
+        first: int | None = None
+        newest = 0
+        support = NAN
+        # -The live bar repeats its timestamp on every update, parse it once
+        parsed: dict[str, int] = {}
+        for ts, chart in chart_updates(path):
+            for bar in chart:
+                stamp = parsed.get(bar['timestamp'])
+                if stamp is None:
+                    stamp = parsed[bar['timestamp']] = bar_timestamp(bar['timestamp'])
+                if first is None or stamp >= first:
+                    rows[stamp] = [float(bar.get(field, 0.0)) for field in COLUMNS]
+                    newest = max(newest, stamp)
+            if first is None:
+                if len(rows) < self.capacity:
+                    continue
+                stamps = sorted(rows)[-self.capacity:]
+                first = stamps[0]
+                rows = {stamp: rows[stamp] for stamp in stamps}
+                window = np.array([rows[stamp] for stamp in stamps]).T
+                support = self._support(window, window[2, -1])
+            updates.append((ts, newest, list(rows[newest])))
+        if not updates:
+            return BacktestResult([], None, {}, len(rows), 0, time.perf_counter() - start)
+        stamps = np.array(sorted(rows), dtype=np.int64)
+        columns = np.array([rows[stamp] for stamp in stamps.tolist()]).T
+        times = np.array([update[0] for update in updates])
+        index = np.searchsorted(stamps, [update[1] for update in updates])
+        live = np.array([update[2] for update in updates]).T
+        result = self._run(columns, times, index, live, support)
+        result.seconds = time.perf_counter() - start
+        return result
+
+
+if __name__ == "__main__":
+    # -Micro-benchmark: python -m tradovate.stream.backtest
+    from datetime import timedelta, timezone
+
+    rng = np.random.default_rng(0)
+    n = 100_000
+    t0 = datetime(2022, 8, 1, tzinfo=timezone.utc)
+    closes = 4000.0 + np.cumsum(rng.normal(0.0, 2.0, n))
+    bars = [{
+        'timestamp': (t0 + timedelta(minutes=5 * i)).strftime('%Y-%m-%dT%H:%MZ'),
+        'open': close - 1.0, 'high': close + 2.0, 'low': close - 2.0, 'close': close,
+        'offerVolume': float(volume),
+    } for i, (close, volume) in enumerate(zip(closes.tolist(), rng.integers(1, 100, n).tolist()))]
+    backtest = Backtest('ES', 5, start_times="0:00", end_times="23:59")
+    result = backtest.run(bars)
+    print(f"{backtest!r}\n{result!r}\n {result.evaluations / result.seconds:,.0f} bars/s")
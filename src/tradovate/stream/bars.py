@@ -0,0 +1,204 @@
+## Imports
+from __future__ import annotations
+from datetime import datetime, timezone
+
+import numpy as np
+
+## Constants
+BAR_FIELDS = (
+    'open', 'high', 'low', 'close',
+    'upVolume', 'downVolume', 'upTicks', 'downTicks',
+    'bidVolume', 'offerVolume',
+)
+_FIELD_INDEX = {field: i for i, field in enumerate(BAR_FIELDS)}
+
+
+## Functions
+def bar_timestamp(timestamp: str) -> int:
+    """Converts a chart bar timestamp string into epoch seconds"""
+    return int(datetime.strptime(timestamp, '%Y-%m-%dT%H:%M%z').timestamp())
+
+
+## Classes
+class BarBuffer:
+    """Fixed-capacity columnar ring buffer of chart bars
+
+    Every column is stored twice back-to-back (a mirrored ring) so that the
+    chronological window is always one contiguous slice and column access
+    returns zero-copy numpy views, oldest bar first.
+    """
+
+    # -Constructor
+    def __init__(self, capacity: int = 240) -> BarBuffer:
+        self.capacity: int = capacity
+        self._timestamp: np.ndarray = np.zeros(2 * capacity, dtype=np.int64)
+        self._columns: np.ndarray = np.zeros(
+            (len(BAR_FIELDS), 2 * capacity), dtype=np.float64
+        )
+        self._head: int = 0
+        self._size: int = 0
+        self._last_stamp: str | None = None
+        self._last_timestamp: int = 0
+        self.rebuilds: int = 0
+
+    # -Dunder Methods
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"BarBuffer(capacity={self.capacity}, size={self._size})"
+
+    # -Instance Methods: Private
+    def _parse(self, bar: dict) -> int:
+        '''Bar timestamp in epoch seconds, skipping the parse for the live bar'''
+        stamp = bar['timestamp']
+        if stamp == self._last_stamp:
+            return self._last_timestamp
+        return bar_timestamp(stamp)
+
+    def _write(self, i: int, timestamp: int, bar: dict) -> None:
+        '''Write bar into ring slot and its mirror'''
+        j = i + self.capacity
+        self._timestamp[i] = self._timestamp[j] = timestamp
+        columns = self._columns
+        for field, k in _FIELD_INDEX.items():
+            columns[k, i] = columns[k, j] = bar.get(field, 0.0)
+        self._last_stamp = bar['timestamp']
+        self._last_timestamp = timestamp
+
+    def _rebuild(self, rows: list[tuple[int, dict]]) -> None:
+        '''Rewrite buffer from (timestamp, bar) rows sorted oldest first'''
+        rows = rows[-self.capacity:]
+        self.rebuilds += 1
+        self._head = 0
+        self._size = 0
+        for timestamp, bar in rows:
+            self._write(self._head, timestamp, bar)
+            self._head = (self._head + 1) % self.capacity
+            self._size += 1
+
+    # -Instance Methods: Public
+    def append(self, bar: dict) -> bool:
+        '''Append a new bar or overwrite the live bar, returns True if appended'''
+        timestamp = self._parse(bar)
+        if self._size and timestamp == self._last_timestamp:
+            self._write((self._head - 1) % self.capacity, timestamp, bar)
+            return False
+        if self._size and timestamp < self._last_timestamp:
+            self.extend([bar])
+            return False
+        self._write(self._head, timestamp, bar)
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        return True
+
+    def extend(self, bars: list[dict]) -> None:
+        '''Merge bars in any order, later duplicates replace earlier ones'''
+        if not bars:
+            return
+        rows = sorted(
+            ((bar_timestamp(bar['timestamp']), bar) for bar in bars),
+            key=lambda row: row[0]
+        )
+        if not self._size or rows[0][0] >= self._last_timestamp:
+            for _, bar in rows:
+                self.append(bar)
+            return
+        # -Out of order history: rebuild once, O(capacity)
+        merged = {
+            int(timestamp): self.record(i)
+            for i, timestamp in enumerate(self.timestamp)
+        }
+        merged.update(rows)
+        self._rebuild(sorted(merged.items(), key=lambda row: row[0]))
+
+    def column(self, field: str) -> np.ndarray:
+        '''Zero-copy chronological view of a bar field'''
+        start = (self._head - self._size) % self.capacity
+        view = self._columns[_FIELD_INDEX[field], start:start + self._size]
+        view.flags.writeable = False
+        return view
+
+    def columns(self) -> dict[str, np.ndarray]:
+        '''Zero-copy chronological views of every bar field'''
+        return {field: self.column(field) for field in BAR_FIELDS}
+
+    def record(self, index: int) -> dict:
+        '''Bar at chronological index as a dictionary'''
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        i = (self._head - self._size + index) % self.capacity
+        bar = {
+            'timestamp': datetime.fromtimestamp(
+                int(self._timestamp[i]), timezone.utc
+            ).strftime('%Y-%m-%dT%H:%MZ')
+        }
+        for field, k in _FIELD_INDEX.items():
+            bar[field] = float(self._columns[k, i])
+        return bar
+
+    # -Properties
+    @property
+    def full(self) -> bool:
+        return self._size == self.capacity
+
+    @property
+    def last_timestamp(self) -> int | None:
+        return self._last_timestamp if self._size else None
+
+    @property
+    def timestamp(self) -> np.ndarray:
+        start = (self._head - self._size) % self.capacity
+        view = self._timestamp[start:start + self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.column('open')
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.column('high')
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.column('low')
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.column('close')
+
+    @property
+    def offer_volume(self) -> np.ndarray:
+        return self.column('offerVolume')
+
+
+class BarStore:
+    """Per-(symbol, interval) collection of bar buffers"""
+
+    # -Constructor
+    def __init__(self, capacity: int = 240) -> BarStore:
+        self.capacity: int = capacity
+        self._buffers: dict[tuple[str, int], BarBuffer] = {}
+
+    # -Dunder Methods
+    def __contains__(self, key: tuple[str, int]) -> bool:
+        return key in self._buffers
+
+    def __repr__(self) -> str:
+        return f"BarStore(capacity={self.capacity}, buffers={len(self._buffers)})"
+
+    # -Instance Methods: Public
+    def get(self, symbol: str, interval: int) -> BarBuffer:
+        '''Bar buffer for symbol and interval, created on first use'''
+        key = (symbol, interval)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = BarBuffer(self.capacity)
+        return buffer
+
+    def remove(self, symbol: str, interval: int) -> None:
+        self._buffers.pop((symbol, interval), None)
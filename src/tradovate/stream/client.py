@@ -1,24 +1,44 @@
 ## Imports
 from __future__ import annotations
-import asyncio,redis,logging,json,os,requests,pytz,time
+import asyncio,logging,json,pytz,time,random,sys
 
-from datetime import datetime,timedelta
+from datetime import datetime,timedelta,timezone
+import aiohttp
 import numpy as np
 
+from ..bulk import BulkResult, RateLimiter, bulk
+from ..contractLibrary import Contract_Library
+from ..risks import Risk
+from .backtest import Backtest, BacktestResult
+from .bars import BarBuffer, BarStore
+from .fractals import FractalDownZone, fractal_down_zone
+from .indicators import BarIndicators, RSI, WMA, wma
+from .oms import OMS
+from .pnl import PnLEngine
+from .replay import FrameRecorder, ReplaySocket
+from .orders import OrderEntry
+from .risk import RiskGate
+from .state import StateStore
 from .profile import Profile
 from .profile.session import Session, WebSocket
 from .utils import urls
+from .utils.errors import (
+    LoginException, RiskConfigurationException, WebSocketAuthorizationException,
+    WebSocketClosedException, WebSocketOpenException, WebSocketTimeoutException
+)
+from .utils.clock import Clock, SimulatedClock
+from .utils.metrics import LatencyStats, RateCounter
 from .utils.typing import CredentialAuthDict
-from typing import Sequence
+from typing import TYPE_CHECKING, AsyncIterator, Sequence
 from numbers import Number
 
-import pandas_ta as pd
+if TYPE_CHECKING:
+    from ..auth.session import Session as RestSession
 
 ## Constants
 log = logging.getLogger(__name__)
-redis_client = redis.Redis(host=os.environ.get("REDIS_HOST", "redis"),
-            port=int(os.environ.get("REDIS_PORT", "6379")),
-            decode_responses=True)
+# -Strategy state keys recovered from Redis at startup
+STATE_PATTERNS = ('es_order_*', 'order_*', 'time_order_*')
 
 
 ## Classes
@@ -37,7 +57,9 @@ class Client(Profile):
         self._mddemo: WebSocket | None = None
         self._mdreplay: WebSocket | None = None
         self._support: float | None = None
-        self._datas: dict | None = None
+        self._bars: BarStore = BarStore(capacity=240)
+        self._indicators: dict[tuple[str, int], BarIndicators] = {}
+        self._support_zones: dict[tuple[str, int], FractalDownZone] = {}
         self._chart_id: int | None = None
         self._order: dict | None = None
         self._trend: int | None = None
@@ -54,6 +76,37 @@ class Client(Profile):
         self._stoploss_point = 7
         self._gain_point = 5
         self._time_candle: int | None = None
+        self._frames: RateCounter = RateCounter()
+        self._events: RateCounter = RateCounter()
+        self._handlers: dict[str, callable] = {
+            'chart': self._on_chart,
+            'md': self._on_md,
+            'props': self._on_props,
+            'clock': self._on_event,
+        }
+        self._closing: bool = False
+        self._market_subscriptions: dict[tuple[str, str], dict] = {}
+        self._backfill_from: dict[tuple[str, int], int] = {}
+        self._order_entries: dict[tuple[int, bool], OrderEntry] = {}
+        self.oms: OMS = OMS()
+        self.pnl: PnLEngine = PnLEngine()
+        self.risk: RiskGate = RiskGate(self.pnl)
+        # -Fills seen before their order, by orderId, applied when it arrives
+        self._unmatched_fills: dict[int, list[dict]] = {}
+        # -In-flight point value loads, one per contract
+        self._point_value_loads: dict[int, asyncio.Task] = {}
+        # -REST session for reference data, point values and risk limits are loaded through it
+        self.rest: RestSession | None = None
+        # -Symbols order entry may trade, mapped to contracts for the risk gate at sync
+        self.symbols: list[str] = []
+        self.limiter: RateLimiter = RateLimiter()
+        self.state: StateStore = StateStore()
+        self.clock: Clock = Clock()
+        self.recorder: FrameRecorder | None = None
+        self.reconnect_delay: float = 0.5
+        self.reconnect_max_delay: float = 30.0
+        self.reconnect_time: LatencyStats = LatencyStats()
+        self.bars_backfilled: int = 0
 
     # -Instance Methods: Private
     def _dispatch(self, event: str, *args, **kwargs) -> None:
@@ -68,6 +121,184 @@ class Client(Profile):
         else:
             self._loop.create_task(coro(*args, **kwargs))
 
+    def _handle_frame(self, msgs: list[dict], ticker = None, interval = None) -> None:
+        '''Route a batch of polled events through the handler table, frames are counted by the reader'''
+        self._events.add(len(msgs))
+        for msg in msgs:
+            if not msg:
+                continue
+            handler = self._handlers.get(msg.get('e'))
+            if handler and msg.get('d'):
+                handler(msg['e'], msg['d'], ticker, interval)
+
+    def _on_chart(self, event: str, d: dict, ticker, interval) -> None:
+        '''Chart event: store bars and run the strategy'''
+        charts = d.get('charts')
+        if not charts:
+            return
+
+        for chart in charts:
+            bars = chart.get('bars')
+            self._chart_id = chart.get('id')
+            if not bars:
+                continue
+
+            datas = self._save_data_redis(bars, ticker, interval)
+            since = self._backfill_from.pop((ticker, interval), None)
+            if since is not None:
+                self.bars_backfilled += int(np.count_nonzero(datas.timestamp > since))
+
+            # I use this logic to test trading demo on Tradovate
+            if datas.full:
+                print(">>>>>Last data", datas.record(-1))
+                self.logic_call_put(datas, self._support, ticker=ticker, interval=interval)
+
+    def _on_event(self, event: str, d: dict, ticker, interval) -> None:
+        '''Quote, props and clock events: forwarded to on_<event> if defined'''
+        self._dispatch(event, d)
+
+    def _on_props(self, event: str, d: dict, ticker, interval) -> None:
+        '''Entity events: applied to the OMS, then forwarded to on_props if defined'''
+        entity_type = self.oms.apply(d)
+        if entity_type == 'fill' and d.get('eventType') == 'Created':
+            fill = d['entity']
+            order = self.oms.orders.get(fill.get('orderId'))
+            if order is None:
+                log.debug(f"Fill {fill['id']} before its order {fill.get('orderId')}, held")
+                self._unmatched_fills.setdefault(fill.get('orderId'), []).append(fill)
+            else:
+                self._apply_fill(fill, order['accountId'])
+        elif entity_type == 'order' and self._unmatched_fills:
+            fills = self._unmatched_fills.pop(d['entity']['id'], None)
+            if fills and d.get('eventType') == 'Deleted':
+                log.warning(f"Order {d['entity']['id']} deleted with {len(fills)} unapplied fills")
+            elif fills:
+                for fill in fills:
+                    self._apply_fill(fill, d['entity']['accountId'])
+        self._dispatch(event, d)
+
+    def _apply_fill(self, fill: dict, account_id: int) -> None:
+        '''Apply a fill of a known order to the pnl and the risk gate'''
+        self.pnl.on_fill(fill, account_id)
+        if self.rest is not None and not self.pnl.has_point_value(fill['contractId']):
+            self._load_point_value(fill['contractId'])
+        self.risk.on_fill(
+            account_id, fill['contractId'],
+            fill['qty'] if fill['action'] == 'Buy' else -fill['qty']
+        )
+
+    def _load_point_value(self, contract_id: int) -> None:
+        '''Start loading a contract's point value unless a load is in flight'''
+        if contract_id in self._point_value_loads:
+            return
+        task = self._point_value_loads[contract_id] = self._loop.create_task(
+            self.pnl.load_point_values(Contract_Library(self.rest), [contract_id])
+        )
+        task.add_done_callback(lambda task: self._point_value_loaded(contract_id, task))
+
+    def _point_value_loaded(self, contract_id: int, task: asyncio.Task) -> None:
+        '''Forget a finished point value load, logging its failure'''
+        self._point_value_loads.pop(contract_id, None)
+        if not task.cancelled() and task.exception() is not None:
+            log.warning(f"Point value load of contract {contract_id} failed: {task.exception()!r}")
+
+    def _on_md(self, event: str, d: dict, ticker, interval) -> None:
+        '''Quote events: trades mark positions, then forwarded to on_md if defined'''
+        for quote in d.get('quotes') or ():
+            trade = quote.get('entries', {}).get('Trade')
+            if trade and 'price' in trade:
+                self.pnl.on_quote(quote['contractId'], trade['price'])
+        self._dispatch(event, d)
+
+    async def _reconnect(self, websocket: WebSocket) -> WebSocket | None:
+        '''Replace a closed WebSocket with exponential backoff and restore its subscriptions'''
+        for attr, url, market in (
+            ('_live', urls.wss_base_live, False),
+            ('_demo', urls.wss_base_demo, False),
+            ('_mdlive', urls.wss_base_market, True),
+        ):
+            if getattr(self, attr) is websocket:
+                break
+        else:
+            return None
+
+        start = time.perf_counter()
+        delay = self.reconnect_delay
+        renew = self._token_expired()
+        while not self._closing:
+            log.warning(f"Client reconnecting '{url}'")
+            replacement = None
+            try:
+                # -An expired or rejected token would fail every attempt
+                if renew:
+                    await self._session.renew_access_token()
+                    renew = False
+                replacement = await WebSocket.from_session(
+                    url, self._session, frames=self._frames
+                )
+                await replacement.authorize(
+                    self._session.md_access_token if market
+                    else self._session.access_token
+                )
+                break
+            except (
+                aiohttp.ClientError, OSError, LoginException,
+                WebSocketAuthorizationException, WebSocketClosedException,
+                WebSocketOpenException, WebSocketTimeoutException
+            ) as exc:
+                log.warning(f"Client reconnect to '{url}' failed: {exc}")
+                if replacement is not None:
+                    await replacement.close()
+                renew = renew or self._token_expired() or isinstance(
+                    exc, WebSocketAuthorizationException
+                )
+                await asyncio.sleep(delay * (1 + random.random() / 2))
+                delay = min(delay * 2, self.reconnect_max_delay)
+        else:
+            return None
+
+        setattr(self, attr, replacement)
+        for entry in self._order_entries.values():
+            if entry.websocket is websocket:
+                entry.websocket = replacement
+        if market:
+            if self.recorder is not None:
+                self.recorder.attach(replacement)
+            await self._restore_market(replacement)
+        else:
+            await self.sync_websockets()
+        self.reconnect_time.add(time.perf_counter() - start)
+        return replacement
+
+    def _token_expired(self) -> bool:
+        '''Session token known and past its expiration'''
+        return self._session.token_expiration is not None and self._session.token_expired
+
+    async def _restore_market(self, websocket: WebSocket) -> None:
+        '''Reissue tracked market subscriptions, charts only from the last stored bar'''
+        requests = []
+        for (url, symbol), body in self._market_subscriptions.items():
+            if url == urls.wss_market_chart_sub:
+                interval = body['chartDescription']['elementSize']
+                since = (
+                    self._bars.get(symbol, interval).last_timestamp
+                    if (symbol, interval) in self._bars else None
+                )
+                if since is not None:
+                    self._backfill_from[(symbol, interval)] = since
+                    body = {**body, "timeRange": {
+                        "asFarAsTimestamp": datetime.fromtimestamp(
+                            since, timezone.utc
+                        ).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+                    }}
+            requests.append(websocket.request(url, body=body))
+        await asyncio.gather(*requests)
+
+    async def _subscribe_market(self, url: str, id_: int | str, body: dict) -> dict:
+        '''Send a market subscription and remember it for reconnects'''
+        self._market_subscriptions[(url, id_)] = body
+        return await self._mdlive.request(url, body=body)
+
     async def _renewal(self) -> None:
         '''Task for Session authorization renewal loop'''
         while self._session.authenticated.is_set():
@@ -81,7 +312,10 @@ class Client(Profile):
         live: bool, demo: bool, mdlive: bool
     ) -> None:
         '''Private client loop run method'''
-        await self.create_websockets(live, demo, mdlive)
+        await asyncio.gather(
+            self.create_websockets(live, demo, mdlive),
+            self.state.load(STATE_PATTERNS),
+        )
         await self.authorize(auth, auto_renew)
         await self.authorizion_hold()
         await self.sync_websockets()
@@ -124,101 +358,180 @@ class Client(Profile):
             await websocket.authenticated.wait()
 
     async def close(self) -> None:
+        self._closing = True
         for websocket in self._websockets:
             await websocket.close()
+        await self.state.close()
+        if self.recorder is not None:
+            self.recorder.close()
         await self._session.close()
 
     async def create_websockets(self, live: bool, demo: bool, mdlive: bool) -> None:
         '''Initialize Client WebSockets'''
         self._live = (
-            await WebSocket.from_session(urls.wss_base_live, self._session)
+            await WebSocket.from_session(urls.wss_base_live, self._session, frames=self._frames)
             if live else None
         )
         self._demo = (
-            await WebSocket.from_session(urls.wss_base_demo, self._session)
+            await WebSocket.from_session(urls.wss_base_demo, self._session, frames=self._frames)
             if demo else None
         )
         self._mdlive = (
-            await WebSocket.from_session(urls.wss_base_market, self._session)
+            await WebSocket.from_session(urls.wss_base_market, self._session, frames=self._frames)
             if mdlive else None
         )
 
-    async def process_message(self, websocket: WebSocket, interval) -> None:
-        '''Task for WebSocket loop'''
-        while websocket.connected.is_set():
-            msgs = (await websocket.poll_message())
-            if not msgs:
+    def order_entry(
+        self, account_id: int, account_spec: str, *, live: bool = False,
+        clip: bool = False
+    ) -> OrderEntry:
+        '''Order entry for an account over the live or demo account WebSocket, checked by self.risk'''
+        entry = self._order_entries.get((account_id, live))
+        if entry is None:
+            if not self.risk.configured:
+                raise RiskConfigurationException(
+                    "Risk limits are not loaded: set Client.rest (and Client.symbols) "
+                    "before sync_websockets, or load self.risk directly"
+                )
+            websocket = self._live if live else self._demo
+            if websocket is None:
+                raise WebSocketClosedException(
+                    urls.wss_base_live if live else urls.wss_base_demo
+                )
+            entry = self._order_entries[(account_id, live)] = OrderEntry(
+                websocket, account_id, account_spec, risk=self.risk, clip=clip,
+                oms=self.oms, limiter=self.limiter
+            )
+        return entry
+
+    def flatten_all(
+        self, account_id: int | None = None, *, live: bool = False,
+        admin: bool = False, concurrency: int = 8
+    ) -> AsyncIterator[BulkResult]:
+        '''Liquidate the OMS positions and working orders of the order entries concurrently, keyed by (accountId, contractId)'''
+        calls = []
+        for (entry_account, entry_live), entry in self._order_entries.items():
+            if entry_live != live or account_id not in (None, entry_account):
                 continue
+            contract_ids = {
+                position['contractId'] for position in self.oms.positions.by('accountId', entry_account).values()
+                if position.get('netPos')
+            }
+            contract_ids.update(
+                order['contractId'] for order in self.oms.working_orders(entry_account).values()
+            )
+            calls.extend(
+                ((entry_account, contract_id), lambda entry=entry, contract_id=contract_id, **extra:
+                    entry.liquidate_position(contract_id, admin=admin, **extra))
+                for contract_id in contract_ids
+            )
+        return bulk(calls, concurrency=concurrency, limiter=self.limiter)
+
+    def record(self, path: str) -> FrameRecorder:
+        '''Append the market data frames received from now on to a frame file'''
+        if self._mdlive is None:
+            raise WebSocketClosedException(urls.wss_base_market)
+        if self.recorder is None:
+            self.recorder = FrameRecorder(path)
+        self.recorder.attach(self._mdlive)
+        return self.recorder
+
+    async def replay(
+        self, path: str, ticker, interval, *, speed: float | None = None
+    ) -> dict[str, float]:
+        '''Feed a frame file through the market data path on the simulated clock, returns throughput'''
+        self.clock = SimulatedClock()
+        socket = ReplaySocket(path, speed, self.clock)
+        self._mdreplay = WebSocket(
+            f"replay://{path}", socket, loop=asyncio.get_running_loop(),
+            frames=self._frames
+        )
+        start = time.perf_counter()
+        try:
+            await self._mdreplay.connected.wait()
+            await self.process_subcribe(self._mdreplay, ticker, interval)
+        finally:
+            await self._mdreplay.close()
+            self._mdreplay = None
+        elapsed = time.perf_counter() - start
+        return {
+            'frames': socket.frames,
+            'seconds': elapsed,
+            'frames_per_second': socket.frames / elapsed if elapsed else 0.0,
+        }
+
+    def backtest(self, source: str | list[dict], ticker, interval) -> BacktestResult:
+        '''Vectorized logic_call_put with this client's settings over a frame file or a list of bars'''
+        backtest = Backtest(
+            ticker, interval,
+            start_times=":".join(self._start_times), end_times=":".join(self._end_times),
+            exit_times=":".join(self._exit_times), point_in=self._point_in,
+            point_out=self._point_out, stoploss_point=self._stoploss_point,
+            capacity=self._bars.capacity
+        )
+        if isinstance(source, str):
+            return backtest.run_frames(source)
+        return backtest.run(source)
+
+    async def process_message(self, websocket: WebSocket, interval = None) -> None:
+        '''Task for WebSocket loop, reconnecting when the socket closes'''
+        while websocket:
+            try:
+                while websocket.connected.is_set():
+                    msgs = (await websocket.poll_message())
+                    if not msgs:
+                        continue
+                    self._handle_frame(msgs, interval=interval)
+            except WebSocketClosedException:
+                pass
+            websocket = None if self._closing else await self._reconnect(websocket)
 
     async def process_subcribe(self, websocket: WebSocket, ticker, interval) -> None:
-        '''Task for WebSocket loop'''
-        while websocket.connected.is_set():
-            msgs = (await websocket.poll_message(ticker, interval))
-
-            now = datetime.now(pytz.timezone("America/Los_Angeles"))
-            d = now.day
-            h = now.hour
-            m = now.minute
-            if h == 23 and m == 59:
-                if self._datas and len(self._datas) > 240:
-                    self._datas = self._datas[-240:]
-
-            if not msgs:
-                continue
-            msg = msgs[0]
-
-            if not msg:
-                continue
-
-            if not msg or not msg.get('e') or msg.get('e') != 'chart' or not msg.get('d'):
-                continue
-
-            d = msg.get('d')
-
-            if not d.get('charts'):
-                continue
-
-            charts = d.get('charts')
-
-            for chart in charts:
-                bars = chart.get('bars')
-                self._chart_id = chart.get('id')
-                if not bars:
-                    continue
-
-                self._datas = self._save_data_redis(id, self._datas, bars, ticker, interval)
-
-                # I use this logic to test trading demo on Tradovate
-                if len(self._datas) >= 240:
-                    print(">>>>>Last data", self._datas[len(self._datas)-1])
-                    self.logic_call_put(self._datas, self._support, ticker=ticker, interval=interval)
-
-    def _save_data_redis(self, id, datas, bars, ticker, interval):
-        if datas:
-            items = datas
-
-            l = len(items)
-
-            if (len(bars) == 240 - l):
-                datas = bars + items
-                if (len(datas) == 240):
-                    self._support = self.f_calcFractalDownZone(datas[-1]['low'], datas, 0, 12)
-            else:
-                dt = int(datetime.strptime(items[l - 1]['timestamp'], '%Y-%m-%dT%H:%M%z').strftime("%s"))
-                for bar in bars:
-                    dt2 = int(datetime.strptime(bar['timestamp'], '%Y-%m-%dT%H:%M%z').strftime("%s"))
-
-                    if dt == dt2:
-                        items[l-1] = bar
-                    elif dt < dt2:
-                        items.append(bar)
-
-                datas = items
+        '''Task for WebSocket loop, reconnecting when the socket closes'''
+        while websocket:
+            try:
+                while websocket.connected.is_set():
+                    msgs = (await websocket.poll_message(ticker, interval))
+
+                    if not msgs:
+                        continue
+                    self._handle_frame(msgs, ticker, interval)
+            except WebSocketClosedException:
+                pass
+            websocket = None if self._closing else await self._reconnect(websocket)
+
+    def _save_data_redis(self, bars, ticker, interval) -> BarBuffer:
+        '''Append or overwrite chart bars into the (ticker, interval) buffer'''
+        datas = self._bars.get(ticker, interval)
+        full = datas.full
+        if len(bars) == 1:
+            datas.append(bars[0])
         else:
-            datas = bars
+            datas.extend(bars)
+        indicators = self._get_indicators(ticker, interval)
+        indicators.sync(datas)
+
+        if not full and datas.full:
+            self._support = self.f_calcFractalDownZone(
+                datas.low[-1], datas, 12, indicators['wma_volume']
+            )
 
         return datas
 
+    def _get_indicators(self, ticker, interval) -> BarIndicators:
+        '''Streaming indicators read by the strategy, per (ticker, interval)'''
+        key = (ticker, interval)
+        indicators = self._indicators.get(key)
+        if indicators is None:
+            indicators = self._indicators[key] = BarIndicators({
+                'wma200': ('close', WMA(200)),
+                'wma48': ('close', WMA(48)),
+                'wma13': ('close', WMA(13)),
+                'rsi9': ('close', RSI(9)),
+                'wma_volume': ('offerVolume', WMA(6, depth=32)),
+            })
+        return indicators
+
     def run_subcribe(
         self, auth: CredentialAuthDict, *, auto_renew: bool = True,
         ticker, interval,
@@ -257,17 +570,28 @@ class Client(Profile):
             self._loop.run_until_complete(self.close())
             self._loop.close()
 
+    async def subscribe_dom(self, id_: int | str) -> None:
+        '''Add symbol to DOM subscription'''
+        await self._subscribe_market(urls.wss_market_dom_sub, id_, {"symbol": id_})
+
+    async def subscribe_histogram(self, id_: int | str) -> None:
+        '''Add symbol to histogram subscription'''
+        await self._subscribe_market(urls.wss_market_histogram_sub, id_, {"symbol": id_})
+
     async def subscribe_symbol(
         self, id_: int | str, *, interval: int, total: int
     ) -> None:
         '''Add symbol to market subscription'''
+        requests = []
         if self._mdlive:
             # -Market
-            await self._mdlive.request(urls.wss_market_sub, body={"symbol": id_})
+            requests.append(
+                self._subscribe_market(urls.wss_market_sub, id_, {"symbol": id_})
+            )
 
         # -Chart
-        await self._mdlive.request(urls.wss_market_chart_sub,
-           body={"symbol": id_,
+        requests.append(self._subscribe_market(urls.wss_market_chart_sub, id_,
+           {"symbol": id_,
                 "chartDescription": {
                     "underlyingType": 'MinuteBar',
                     "elementSize": interval,
@@ -277,18 +601,46 @@ class Client(Profile):
                 "timeRange": {
                     "asMuchAsElements": total
                 }
-        })
+        }))
+        await asyncio.gather(*requests)
 
     async def sync_websockets(self) -> None:
-        for websocket in self._websockets_account:
-            await websocket.request(urls.wss_user_sync, body={'users': [self.id]})
+        '''Request user sync on the account WebSockets, load the OMS snapshot, point values and risk limits'''
+        responses = await asyncio.gather(*(
+            websocket.request(urls.wss_user_sync, body={'users': [self.id]})
+            for websocket in self._websockets_account or ()
+        ))
+        for i, res in enumerate(responses):
+            self.oms.apply_sync(res.get('d') or {}, replace=i == 0)
+        # -The position snapshot already counts fills still waiting for their order
+        self._unmatched_fills.clear()
+        self.pnl.load(self.oms)
+        self.risk.load_positions(self.oms)
+        if self.rest is not None:
+            library = Contract_Library(self.rest)
+            account_ids = list(dict.fromkeys(
+                account['id'] for res in responses
+                for account in (res.get('d') or {}).get('accounts') or ()
+            ))
+            symbols = list(dict.fromkeys((
+                *self.symbols,
+                *(id_ for _, id_ in self._market_subscriptions if isinstance(id_, str)),
+            )))
+            await asyncio.gather(
+                self.pnl.load_point_values(library),
+                self.risk.load(Risk(self.rest), account_ids, library, symbols),
+            )
 
     async def unsubscribe_symbol(self, id_: int | str) -> None:
         '''Remove symbol from market subscription'''
-        await self._mdlive.request(urls.wss_market_usub, body={"symbol": id_})
-        await self._mdlive.request(urls.wss_market_dom_usub, body={"symbol": id_})
-        await self._mdlive.request(urls.wss_market_histogram_usub, body={"symbol": id_})
-        await self._mdlive.request(urls.wss_market_chart_usub, body={"symbol": id_})
+        for key in [key for key in self._market_subscriptions if key[1] == id_]:
+            del self._market_subscriptions[key]
+        await asyncio.gather(
+            self._mdlive.request(urls.wss_market_usub, body={"symbol": id_}),
+            self._mdlive.request(urls.wss_market_dom_usub, body={"symbol": id_}),
+            self._mdlive.request(urls.wss_market_histogram_usub, body={"symbol": id_}),
+            self._mdlive.request(urls.wss_market_chart_usub, body={"symbol": id_}),
+        )
 
     # -Properties: Private
     @property
@@ -332,6 +684,17 @@ class Client(Profile):
             return tuple(websockets)
         return None
 
+    # -Properties: Public
+    @property
+    def message_rates(self) -> dict[str, float]:
+        '''Frames and events received, totals and per second'''
+        return {
+            'frames': self._frames.total,
+            'frames_per_second': self._frames.rate,
+            'events': self._events.total,
+            'events_per_second': self._events.rate,
+        }
+
     # -Properties: Authenticated
     @property
     def authenticated(self) -> bool:
@@ -345,12 +708,12 @@ class Client(Profile):
     '''
     This is example logic to trading on tradovate
     '''
-    def logic_call_put(self, datas, support, ticker, interval):
+    def logic_call_put(self, datas: BarBuffer, support, ticker, interval):
         l_datas = len(datas)
         if l_datas < 200:
             return
 
-        now = datetime.now(pytz.timezone("America/Los_Angeles"))
+        now = self.clock.now(pytz.timezone("America/Los_Angeles"))
         h = now.hour
         m = now.minute
         s = now.second
@@ -375,33 +738,29 @@ class Client(Profile):
                 int(end_times[0]) > h or int(end_times[0]) == h and int(end_times[1]) > m):
             is_order = True
 
-        last11 = datas[l_datas - 12]
-        last5 = datas[l_datas - 6]
-        last4 = datas[l_datas - 5]
-        last3 = datas[l_datas - 4]
-        last2 = datas[l_datas - 3]
-        last1 = datas[l_datas - 2]
-        last = datas[l_datas - 1]
-        close1 = last1['close']
-        close = last['close']
-        low = last['low']
-        high = last['high']
+        closes = datas.close
+        lows = datas.low
+        highs = datas.high
+        close1 = closes[-2]
+        close = closes[-1]
+        low = lows[-1]
+        high = highs[-1]
         hl = (high + low) / 2
-        low1 = last1['low']
-        high1 = last1['high']
+        low1 = lows[-2]
+        high1 = highs[-2]
         hl1 = (low1 + high1) / 2
-        low2 = last2['low']
-        high2 = last2['high']
+        low2 = lows[-3]
+        high2 = highs[-3]
         hl2 = (low2 + high2) / 2
         is_increase = hl > hl1 or hl > hl2
         is_decrease = hl < hl1 or hl < hl2
-        is_strong_market = close >= last11['close']
-        is_weak_market = close < last11['close']
+        is_strong_market = close >= closes[-12]
+        is_weak_market = close < closes[-12]
 
-        df = pd.DataFrame.from_records(datas, index=['timestamp'])
-        wma200 = df.ta.wma(length=200)
-        wma48 = df.ta.wma(length=48)
-        wma13 = df.ta.wma(length=13)
+        indicators = self._get_indicators(ticker, interval)
+        wma200 = indicators['wma200']
+        wma48 = indicators['wma48']
+        wma13 = indicators['wma13']
 
         crossUpWMA13_48 = crossover(wma13, wma48)
         crossDownWMA13_48 = crossunder(wma13, wma48)
@@ -422,40 +781,42 @@ class Client(Profile):
         else:
             trend = 0
 
-        rsi = df.ta.rsi(length=9)
-        l_200 = wma200.size
-        l_48 = wma48.size
-        l_rsi = rsi.size
+        rsi = indicators['rsi9']
 
-        point5 = last5['close'] - wma200.iloc[l_200 - 6]
-        point2 = last2['close'] - wma200.iloc[l_200 - 3]
-        point1 = last1['close'] - wma200.iloc[l_200 - 2]
-        point = last['close'] - wma200.iloc[l_200 - 1]
+        point5 = closes[-6] - wma200[-6]
+        point2 = closes[-3] - wma200[-3]
+        point1 = closes[-2] - wma200[-2]
+        point = closes[-1] - wma200[-1]
 
         is_sideway = False
         if -5 <= point2 and 5 >= point2 and -5 <= point1 and 5 >= point1 and -5 <= point and 5 >= point:
             is_sideway = True
 
-        support_zone = self.f_calcFractalDownZone(support, datas, 0, 0)
+        key = (ticker, interval)
+        if key not in self._support_zones:
+            self._support_zones[key] = FractalDownZone(max_count=1)
+        support_zone = self._support_zones[key].update(
+            datas, indicators['wma_volume'], support
+        )
         if not support_zone:
             support_zone = low
 
         AWAY_EMA200 = point
         EMA_CHANGE_CALL = point - point1 >= point_in
         EMA_CHANGE_PUT = point - point1 <= -1 * point_in
-        BIGDROP = rsi.iloc[l_rsi - 1] + 8 < rsi.iloc[l_rsi - 2] and close > wma48.iloc[l_48 - 1]
+        BIGDROP = rsi[-1] + 8 < rsi[-2] and close > wma48[-1]
         if BIGDROP:
             self._bigdrop = 1
             self._bottomsupport = 0
 
-        BOTTOMSUPPORT = close > support_zone and close > close1 and rsi.iloc[l_rsi - 1] > rsi.iloc[l_rsi - 2] + 10
+        BOTTOMSUPPORT = close > support_zone and close > close1 and rsi[-1] > rsi[-2] + 10
         if BOTTOMSUPPORT:
             self._bigdrop = 0
             self._bottomsupport = 1
 
         # CALL:
         if not self._order:
-            es_order = redis_client.get("es_order_" + ticker + "_" + str(interval))
+            es_order = self.state.get("es_order_" + ticker + "_" + str(interval))
             if es_order:
                 self._order = json.loads(es_order)
                 self._time_candle = now.hour*60 + (now.minute - now.minute%interval)
@@ -469,7 +830,7 @@ class Client(Profile):
         if not is_sideway and not enter_order and not BIGDROP and is_order:
             call_order = {'ticker': ticker, 'interval': interval, 'type': 'Buy Long',
                           'stop_loss': close - stoploss_point,
-                          'close': close, 'number_share': 1, 'signal': 'TO', 'source': 'TradOvate', 'time': time.time()}
+                          'close': close, 'number_share': 1, 'signal': 'TO', 'source': 'TradOvate', 'time': self.clock.time()}
 
             if entry_in:
                 call_order['logic'] = 'CALL'
@@ -478,15 +839,15 @@ class Client(Profile):
                 self._order = call_order
 
         if self._order and 'pre_order' in self._order and self._order['type'] == 'Buy Long' and self._order['pre_order'] and is_last_second and close > self._order['close']:
-            self._time_order = time.time()
+            self._time_order = self.clock.time()
             self._order['stop_loss'] = close - stoploss_point
             self._order['close'] = close
             self._time_candle = now.hour*60 + (now.minute - now.minute%interval)
 
             del self._order['pre_order']
 
-            redis_client.set("es_order_" + ticker + "_" + str(interval), json.dumps(self._order))
-            redis_client.set("time_order_" + ticker + "_" + str(interval), self._time_order)
+            self.state.set("es_order_" + ticker + "_" + str(interval), json.dumps(self._order))
+            self.state.set("time_order_" + ticker + "_" + str(interval), self._time_order)
 
             # CALL Order
             print(">>>> CALL ORDER")
@@ -495,7 +856,7 @@ class Client(Profile):
         if not is_sideway and not enter_order and not BOTTOMSUPPORT and is_order:
             put_order = {'ticker': ticker, 'interval': interval, 'type': 'Sell Short',
                          'stop_loss': close + stoploss_point,
-                         'close': close, 'number_share': 1, 'signal': 'TO', 'source': 'TradOvate', 'time': time.time()}
+                         'close': close, 'number_share': 1, 'signal': 'TO', 'source': 'TradOvate', 'time': self.clock.time()}
 
             if entry_out:
                 put_order['logic'] = 'PUT Logic'
@@ -504,15 +865,15 @@ class Client(Profile):
                 self._order = put_order
 
         if self._order and 'pre_order' in self._order and self._order['type'] == 'Sell Short' and self._order['pre_order'] and is_last_second and close < self._order['close']:
-            self._time_order = time.time()
+            self._time_order = self.clock.time()
             del self._order['pre_order']
             self._order['stop_loss'] = close + stoploss_point
             self._order['close'] = close
 
             self._time_candle = now.hour*60 + (now.minute - now.minute%interval)
 
-            redis_client.set("order_" + ticker + "_" + str(interval), json.dumps(self._order))
-            redis_client.set("time_order_" + ticker + "_" + str(interval), self._time_order)
+            self.state.set("order_" + ticker + "_" + str(interval), json.dumps(self._order))
+            self.state.set("time_order_" + ticker + "_" + str(interval), self._time_order)
 
             # PUT ORDER
             print(">>>> PUT ORDER")
@@ -538,10 +899,10 @@ class Client(Profile):
                     order['gain'] = gain
 
                     self._order = None
-                    self._time_order = time.time()
+                    self._time_order = self.clock.time()
 
-                    redis_client.delete("order_" + ticker + "_" + str(interval))
-                    redis_client.set("time_order_" + ticker + "_" + str(interval), self._time_order)
+                    self.state.delete("order_" + ticker + "_" + str(interval))
+                    self.state.set("time_order_" + ticker + "_" + str(interval), self._time_order)
 
                     # PUT ORDER
                     print(">>>>> PUT ORDER")
@@ -554,10 +915,10 @@ class Client(Profile):
                     order['gain'] = gain
 
                     self._order = None
-                    self._time_order = time.time()
+                    self._time_order = self.clock.time()
 
-                    redis_client.delete("order_" + ticker + "_" + str(interval))
-                    redis_client.set("time_order_" + ticker + "_" + str(interval), self._time_order)
+                    self.state.delete("order_" + ticker + "_" + str(interval))
+                    self.state.set("time_order_" + ticker + "_" + str(interval), self._time_order)
 
                     # PUT ORDER
                     print(">>>>> PUT ORDER")
@@ -576,9 +937,9 @@ class Client(Profile):
                     order['gain'] = gain
 
                     self._order = None
-                    self._time_order = time.time()
-                    redis_client.delete("order_" + ticker + "_" + str(interval))
-                    redis_client.set("time_order_" + ticker + "_" + str(interval), self._time_order)
+                    self._time_order = self.clock.time()
+                    self.state.delete("order_" + ticker + "_" + str(interval))
+                    self.state.set("time_order_" + ticker + "_" + str(interval), self._time_order)
 
                     # CALL ORDER
                     print(">>>> CALL ORDER")
@@ -591,56 +952,42 @@ class Client(Profile):
                     order['gain'] = gain
 
                     self._order = None
-                    self._time_order = time.time()
-                    redis_client.delete("order_" + ticker + "_" + str(interval))
-                    redis_client.set("time_order_" + ticker + "_" + str(interval), self._time_order)
+                    self._time_order = self.clock.time()
+                    self.state.delete("order_" + ticker + "_" + str(interval))
+                    self.state.set("time_order_" + ticker + "_" + str(interval), self._time_order)
 
                     # CALL Order
                     print(">>>>CALL ORDER")
 
 
-    def f_calcFractalDownZone(self, support, datas, cnt = 0, max_count = 12):
-        df = pd.DataFrame.from_records(datas, index=['timestamp'])
-        wmaVol = df.ta.wma(length=6, close="offerVolume")
-
-        l_datas = len(datas)
-        down = datas[l_datas - 4]['low'] < datas[l_datas - 5]['low'] and datas[l_datas - 5]['low'] < datas[l_datas - 6]['low'] and datas[l_datas - 3]['low'] > datas[l_datas - 4]['low'] and datas[l_datas - 2]['low'] > datas[l_datas - 3]['low'] and datas[l_datas - 4]['offerVolume'] > wmaVol[wmaVol.size - 4]
+    def f_calcFractalDownZone(self, support, datas: BarBuffer, max_count = 12, wmaVol = None):
+        '''Most recent fractal down zone within the last max_count windows, else support'''
+        offer_volume = datas.offer_volume
+        wma_volume = wmaVol.tail(max_count + 6) if wmaVol is not None else wma(offer_volume, 6)
+        return fractal_down_zone(
+            datas.open, datas.close, datas.low, offer_volume,
+            wma_volume, support, max_count
+        )
 
-        if down and datas[l_datas - 4]['close'] >= datas[l_datas - 4]['open']:
-            return datas[l_datas - 4]['open']
-        else:
-            if down and datas[l_datas - 4]['close'] < datas[l_datas - 4]['open']:
-                return datas[l_datas - 4]['close']
-            else:
-                cnt = cnt + 1
-                if cnt < max_count:
-                    return self.f_calcFractalDownZone(support, datas[:-1], cnt, max_count)
-                else:
-                    return support
+def _series(series: Sequence | Number) -> Sequence:
+    '''Indexable values of a sequence, pandas Series or constant'''
+    # -pandas is only checked once loaded, it is never imported here
+    pandas = sys.modules.get('pandas')
+    if pandas is not None and isinstance(series, pandas.Series):
+        return series.values
+    return (series, series) if isinstance(series, Number) else series
 
 def crossover(series1: Sequence, series2: Sequence) -> bool:
-    series1 = (
-        series1.values if isinstance(series1, pd.Series) else
-        (series1, series1) if isinstance(series1, Number) else
-        series1)
-    series2 = (
-        series2.values if isinstance(series2, pd.Series) else
-        (series2, series2) if isinstance(series2, Number) else
-        series2)
+    series1 = _series(series1)
+    series2 = _series(series2)
     try:
         return series1[-2] < series2[-2] and series1[-1] > series2[-1]
     except IndexError:
         return False
 
 def crossunder(series1: Sequence, series2: Sequence) -> bool:
-    series1 = (
-        series1.values if isinstance(series1, pd.Series) else
-        (series1, series1) if isinstance(series1, Number) else
-        series1)
-    series2 = (
-        series2.values if isinstance(series2, pd.Series) else
-        (series2, series2) if isinstance(series2, Number) else
-        series2)
+    series1 = _series(series1)
+    series2 = _series(series2)
     try:
         return series1[-2] > series2[-2] and series1[-1] < series2[-1]
     except IndexError:
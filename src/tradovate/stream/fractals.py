@@ -0,0 +1,102 @@
+## Imports
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .bars import BarBuffer
+    from .indicators import Indicator
+
+## Constants
+NAN = float('nan')
+
+
+## Functions
+def fractal_down_zones(
+    open_: np.ndarray, close: np.ndarray, low: np.ndarray,
+    offer_volume: np.ndarray, wma_volume: np.ndarray
+) -> np.ndarray:
+    """Support zone of every fractal low in one vectorized pass, NaN elsewhere
+
+    Bar i is a fractal low when its low is below the two lows before it and
+    the two lows after it are rising, on above-average offer volume. The
+    zone is the bar's open for an up bar and its close for a down bar.
+    """
+    zones = np.full(len(low), NAN)
+    if len(low) < 5:
+        return zones
+    pivot = low[2:-2]
+    down = (
+        (pivot < low[1:-3]) & (low[1:-3] < low[:-4])
+        & (low[3:-1] > pivot) & (low[4:] > low[3:-1])
+        & (offer_volume[2:-2] > wma_volume[2:-2])
+    )
+    body = np.where(close[2:-2] >= open_[2:-2], open_[2:-2], close[2:-2])
+    zones[2:-2] = np.where(down, body, NAN)
+    return zones
+
+
+def fractal_down_zone(
+    open_: np.ndarray, close: np.ndarray, low: np.ndarray,
+    offer_volume: np.ndarray, wma_volume: np.ndarray,
+    support: float, max_count: int = 12
+) -> float:
+    """Most recent fractal support zone, scanning back up to max_count bars
+
+    The newest bar is never part of a window, window k ends on bar -(k+2)
+    so the pivot candidate is bar -(k+4). wma_volume is aligned to the end
+    of the bar arrays and may be shorter than them. Returns support when no
+    window holds a fractal low.
+    """
+    max_count = max(max_count, 1)
+    start = max(len(low) - max_count - 5, 0)
+    size = len(low) - start
+    wma_volume = np.asarray(wma_volume)[-size:]
+    if len(wma_volume) < size:
+        wma_volume = np.concatenate(
+            (np.full(size - len(wma_volume), NAN), wma_volume)
+        )
+    zones = fractal_down_zones(
+        open_[start:], close[start:], low[start:],
+        offer_volume[start:], wma_volume
+    )
+    candidates = zones[:size - 3][::-1][:max_count]
+    found = np.flatnonzero(~np.isnan(candidates))
+    if found.size:
+        return float(candidates[found[0]])
+    return support
+
+
+## Classes
+class FractalDownZone:
+    """Streaming fractal support zone
+
+    The live bar never takes part in a window, so the scan is only redone
+    when a bar is finalized (a new bar appended) or the buffer is rebuilt.
+    """
+
+    # -Constructor
+    def __init__(self, max_count: int = 12) -> FractalDownZone:
+        self.max_count: int = max_count
+        self._key: tuple[int, int] | None = None
+        self._zone: float = NAN
+
+    def __repr__(self) -> str:
+        return f"FractalDownZone(max_count={self.max_count}, zone={self._zone})"
+
+    # -Instance Methods: Public
+    def update(
+        self, datas: BarBuffer, wma_volume: Indicator, support: float
+    ) -> float:
+        '''Current support zone for the buffer, falling back to support'''
+        if len(datas) < 2:
+            return support
+        key = (int(datas.timestamp[-2]), datas.rebuilds)
+        if key != self._key:
+            self._key = key
+            self._zone = fractal_down_zone(
+                datas.open, datas.close, datas.low, datas.offer_volume,
+                wma_volume.tail(self.max_count + 6), NAN, self.max_count
+            )
+        return support if np.isnan(self._zone) else self._zone
@@ -0,0 +1,362 @@
+## Imports
+from __future__ import annotations
+import math
+from typing import Iterable, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .bars import BarBuffer
+
+## Constants
+NAN = float('nan')
+
+
+## Functions
+def wma(values: np.ndarray, length: int) -> np.ndarray:
+    """Weighted moving average of a whole array in one pass, matches pandas_ta.wma"""
+    values = np.asarray(values, dtype=np.float64)
+    output = np.full(len(values), NAN)
+    if len(values) >= length:
+        weights = np.arange(length, 0, -1, dtype=np.float64)
+        output[length - 1:] = (
+            np.convolve(values, weights, 'valid') / (0.5 * length * (length + 1))
+        )
+    return output
+
+
+def ewm_sum(values: np.ndarray, decay: float, block: int = 64) -> np.ndarray:
+    """Running sum s[i] = values[i] + decay * s[i - 1] of a whole array
+
+    Each block is a cumulative sum scaled by powers of decay, carrying the
+    last sum into the next block, so the powers stay within float range.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    output = np.empty(len(values))
+    powers = decay ** np.arange(block, dtype=np.float64)
+    carry = 0.0
+    for start in range(0, len(values), block):
+        chunk = values[start:start + block]
+        scale = powers[:len(chunk)]
+        sums = scale * (np.cumsum(chunk / scale) + decay * carry)
+        output[start:start + len(chunk)] = sums
+        carry = sums[-1]
+    return output
+
+
+def rsi_sums(values: np.ndarray, length: int) -> tuple[np.ndarray, np.ndarray]:
+    """Decayed sums of gains and losses behind rsi, the state RSI folds per bar"""
+    values = np.asarray(values, dtype=np.float64)
+    change = np.diff(values, prepend=values[:1])
+    decay = 1.0 - 1.0 / length
+    return (
+        ewm_sum(np.where(change > 0, change, 0.0), decay),
+        ewm_sum(np.where(change < 0, -change, 0.0), decay),
+    )
+
+
+def rsi(values: np.ndarray, length: int) -> np.ndarray:
+    """Relative strength index of a whole array in one pass, matches RSI"""
+    gain, loss = rsi_sums(values, length)
+    total = gain + loss
+    valid = (np.arange(len(total)) >= length) & (total != 0.0)
+    return np.where(valid, 100.0 * gain / np.where(valid, total, 1.0), NAN)
+
+
+## Classes
+class Indicator:
+    """Base streaming indicator
+
+    Subclasses fold one bar value at a time. `update` consumes a new bar,
+    `revise` replaces the value of the most recent bar (the live candle).
+    The last `depth` outputs are kept so callers can index them like
+    `series.iloc[-n]`.
+    """
+
+    # -Constructor
+    def __init__(self, length: int, *, depth: int = 16) -> Indicator:
+        self.length: int = length
+        self.depth: int = depth
+        self._history: np.ndarray = np.full(depth, NAN)
+        self._head: int = 0
+        self._count: int = 0
+
+    # -Dunder Methods
+    def __getitem__(self, index: int) -> float:
+        if index >= 0:
+            index -= self._count
+        if not -min(self._count, self.depth) <= index < 0:
+            raise IndexError(index)
+        return float(self._history[(self._head + index) % self.depth])
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(length={self.length}, value={self.value})"
+
+    # -Instance Methods: Private
+    def _push(self, value: float) -> float:
+        self._history[self._head] = value
+        self._head = (self._head + 1) % self.depth
+        self._count += 1
+        return value
+
+    def _replace(self, value: float) -> float:
+        self._history[(self._head - 1) % self.depth] = value
+        return value
+
+    def _reset(self) -> None:
+        self._history.fill(NAN)
+        self._head = 0
+        self._count = 0
+
+    # -Instance Methods: Public
+    def update(self, value: float) -> float:
+        '''Consume a new bar value, returns the new output'''
+        raise NotImplementedError
+
+    def revise(self, value: float) -> float:
+        '''Replace the most recent bar value, returns the revised output'''
+        raise NotImplementedError
+
+    def tail(self, n: int) -> np.ndarray:
+        '''Last n outputs oldest first, NaN padded beyond the kept history'''
+        output = np.full(n, NAN)
+        kept = min(n, self._count, self.depth)
+        for i in range(1, kept + 1):
+            output[-i] = self._history[(self._head - i) % self.depth]
+        return output
+
+    def seed(self, values: Iterable[float]) -> None:
+        '''Reset state and replay values oldest first'''
+        self._reset()
+        for value in values:
+            self.update(float(value))
+
+    # -Properties
+    @property
+    def value(self) -> float:
+        return self[-1] if self._count else NAN
+
+
+class WMA(Indicator):
+    """Linearly weighted moving average, matches pandas_ta.wma"""
+
+    # -Constructor
+    def __init__(self, length: int, *, depth: int = 16) -> WMA:
+        super().__init__(length, depth=depth)
+        self._weights: np.ndarray = np.arange(1, length + 1, dtype=np.float64)
+        self._weight: float = 0.5 * length * (length + 1)
+        self._window: np.ndarray = np.zeros(length)
+        self._sum: float = 0.0
+        self._numerator: float = 0.0
+
+    # -Instance Methods: Private
+    def _output(self, count: int) -> float:
+        if count < self.length:
+            return NAN
+        return self._numerator / self._weight
+
+    def _reset(self) -> None:
+        super()._reset()
+        self._window.fill(0.0)
+        self._sum = 0.0
+        self._numerator = 0.0
+
+    # -Instance Methods: Public
+    def update(self, value: float) -> float:
+        n = self.length
+        i = self._count % n
+        if self._count < n:
+            self._numerator += (self._count + 1) * value
+            self._sum += value
+            self._window[i] = value
+        elif i == 0:
+            # -Exact recompute once per lap keeps rounding drift bounded
+            self._window[i] = value
+            window = np.roll(self._window, -1)
+            self._numerator = float(np.dot(window, self._weights))
+            self._sum = float(window.sum())
+        else:
+            self._numerator += n * value - self._sum
+            self._sum += value - self._window[i]
+            self._window[i] = value
+        return self._push(self._output(self._count + 1))
+
+    def revise(self, value: float) -> float:
+        if not self._count:
+            return self.update(value)
+        i = (self._count - 1) % self.length
+        delta = value - self._window[i]
+        self._numerator += min(self._count, self.length) * delta
+        self._sum += delta
+        self._window[i] = value
+        return self._replace(self._output(self._count))
+
+
+class EMA(Indicator):
+    """Exponential moving average seeded by an SMA, matches pandas_ta.ema"""
+
+    # -Constructor
+    def __init__(self, length: int, *, depth: int = 16) -> EMA:
+        super().__init__(length, depth=depth)
+        self._alpha: float = 2.0 / (length + 1)
+        self._sum: float = 0.0
+        self._ema: float = NAN
+        self._previous: float = NAN
+        self._last: float = 0.0
+
+    # -Instance Methods: Private
+    def _fold(self, count: int, value: float) -> float:
+        '''EMA after the bar at position count, with _sum already including it'''
+        if count < self.length - 1:
+            return NAN
+        if count == self.length - 1:
+            return self._sum / self.length
+        return self._alpha * value + (1.0 - self._alpha) * self._previous
+
+    def _reset(self) -> None:
+        super()._reset()
+        self._sum = 0.0
+        self._ema = NAN
+        self._previous = NAN
+        self._last = 0.0
+
+    # -Instance Methods: Public
+    def update(self, value: float) -> float:
+        if self._count < self.length:
+            self._sum += value
+        self._previous = self._ema
+        self._ema = self._fold(self._count, value)
+        self._last = value
+        return self._push(self._ema)
+
+    def revise(self, value: float) -> float:
+        if not self._count:
+            return self.update(value)
+        count = self._count - 1
+        if count < self.length:
+            self._sum += value - self._last
+        self._ema = self._fold(count, value)
+        self._last = value
+        return self._replace(self._ema)
+
+
+class RSI(Indicator):
+    """Relative strength index over Wilder's RMA, matches pandas_ta.rsi"""
+
+    # -Constructor
+    def __init__(self, length: int, *, depth: int = 16) -> RSI:
+        super().__init__(length, depth=depth)
+        self._decay: float = 1.0 - 1.0 / length
+        self._close: float = NAN
+        self._previous_close: float = NAN
+        self._state: tuple[float, float, float, int] = (0.0, 0.0, 0.0, 0)
+        self._previous_state: tuple[float, float, float, int] = self._state
+
+    # -Instance Methods: Private
+    def _fold(
+        self, state: tuple[float, float, float, int], previous: float, value: float
+    ) -> tuple[float, float, float, int]:
+        '''Adjusted EWM numerators and denominator of gains and losses'''
+        if math.isnan(previous):
+            return state
+        gain, loss, weight, n = state
+        change = value - previous
+        decay = self._decay
+        return (
+            (change if change > 0 else 0.0) + decay * gain,
+            (-change if change < 0 else 0.0) + decay * loss,
+            1.0 + decay * weight, n + 1,
+        )
+
+    def _output(self) -> float:
+        gain, loss, _, n = self._state
+        if n < self.length or gain + loss == 0.0:
+            return NAN
+        return 100.0 * gain / (gain + loss)
+
+    def _reset(self) -> None:
+        super()._reset()
+        self._close = NAN
+        self._previous_close = NAN
+        self._state = self._previous_state = (0.0, 0.0, 0.0, 0)
+
+    # -Instance Methods: Public
+    def update(self, value: float) -> float:
+        self._previous_state = self._state
+        self._previous_close = self._close
+        self._state = self._fold(self._state, self._close, value)
+        self._close = value
+        return self._push(self._output())
+
+    def revise(self, value: float) -> float:
+        if not self._count:
+            return self.update(value)
+        self._state = self._fold(self._previous_state, self._previous_close, value)
+        self._close = value
+        return self._replace(self._output())
+
+
+class BarIndicators:
+    """Named streaming indicators kept in step with a bar buffer"""
+
+    # -Constructor
+    def __init__(self, indicators: dict[str, tuple[str, Indicator]]) -> BarIndicators:
+        self._indicators: dict[str, tuple[str, Indicator]] = indicators
+        self._timestamp: int | None = None
+        self._rebuilds: int = 0
+
+    # -Dunder Methods
+    def __getitem__(self, name: str) -> Indicator:
+        return self._indicators[name][1]
+
+    def __repr__(self) -> str:
+        return f"BarIndicators({', '.join(self._indicators)})"
+
+    # -Instance Methods: Public
+    def seed(self, datas: BarBuffer) -> None:
+        '''Recompute every indicator over the whole buffer'''
+        for field, indicator in self._indicators.values():
+            indicator.seed(datas.column(field))
+        self._timestamp = datas.last_timestamp
+        self._rebuilds = datas.rebuilds
+
+    def sync(self, datas: BarBuffer) -> None:
+        '''Fold bars appended or revised since the last sync'''
+        timestamps = datas.timestamp
+        if not len(timestamps):
+            return
+        start = (
+            int(np.searchsorted(timestamps, self._timestamp, 'right'))
+            if self._timestamp is not None else 0
+        )
+        if (
+            self._rebuilds != datas.rebuilds or not start
+            or timestamps[start - 1] != self._timestamp
+        ):
+            self.seed(datas)
+            return
+        for field, indicator in self._indicators.values():
+            column = datas.column(field)
+            indicator.revise(float(column[start - 1]))
+            for value in column[start:]:
+                indicator.update(float(value))
+        self._timestamp = int(timestamps[-1])
+
+
+if __name__ == "__main__":
+    # -Micro-benchmark: python -m tradovate.stream.indicators
+    import timeit
+
+    closes = 4000.0 + np.cumsum(np.random.default_rng(0).normal(0.0, 1.0, 240))
+    for indicator in (WMA(200), WMA(13), EMA(20), RSI(9)):
+        indicator.seed(closes)
+        number = 100_000
+        update = timeit.timeit(lambda: indicator.update(4000.0), number=number)
+        revise = timeit.timeit(lambda: indicator.revise(4001.0), number=number)
+        print(
+            f"{indicator!r:<40} update {update / number * 1e6:.2f}us"
+            f"  revise {revise / number * 1e6:.2f}us"
+        )
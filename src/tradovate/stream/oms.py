@@ -0,0 +1,206 @@
+## Imports
+from __future__ import annotations
+from types import MappingProxyType
+from typing import Hashable, Iterator, Mapping
+
+## Constants
+# -props entityType -> user/syncrequest snapshot field
+SYNC_FIELDS = {
+    'order': 'orders',
+    'orderVersion': 'orderVersions',
+    'fill': 'fills',
+    'executionReport': 'executionReports',
+    'position': 'positions',
+}
+WORKING_STATUSES = frozenset((
+    'PendingCancel', 'PendingNew', 'PendingReplace', 'Suspended', 'Working'
+))
+EMPTY: Mapping = MappingProxyType({})
+
+
+## Classes
+class Table:
+    """Entities of one type by id, with hash indexes on fields
+
+    An index is a field name or a tuple of field names for a composite key.
+    Each index maps a key to the {id: entity} bucket holding it, so lookups
+    are O(1) and updates move an entity between buckets as its fields change.
+    """
+
+    # -Constructor
+    def __init__(self, *indexes: str | tuple[str, ...]) -> Table:
+        self.rows: dict[int, dict] = {}
+        self._indexes: dict[str | tuple[str, ...], dict[Hashable, dict[int, dict]]] = {
+            index: {} for index in indexes
+        }
+
+    # -Dunder Methods
+    def __contains__(self, id_: int) -> bool:
+        return id_ in self.rows
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.rows.values())
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __repr__(self) -> str:
+        return f"Table(rows={len(self.rows)}, indexes={list(self._indexes)})"
+
+    # -Instance Methods: Private
+    @staticmethod
+    def _key(index: str | tuple[str, ...], entity: dict) -> Hashable:
+        if isinstance(index, tuple):
+            return tuple(entity.get(field) for field in index)
+        return entity.get(index)
+
+    def _unindex(self, entity: dict) -> None:
+        for index, buckets in self._indexes.items():
+            key = self._key(index, entity)
+            bucket = buckets.get(key)
+            if bucket is not None:
+                bucket.pop(entity['id'], None)
+                if not bucket:
+                    del buckets[key]
+
+    # -Instance Methods: Public
+    def by(self, index: str | tuple[str, ...], key: Hashable) -> Mapping[int, dict]:
+        '''Entities whose index fields equal key, a read-only {id: entity} view'''
+        bucket = self._indexes[index].get(key)
+        return EMPTY if bucket is None else MappingProxyType(bucket)
+
+    def clear(self) -> None:
+        self.rows.clear()
+        for buckets in self._indexes.values():
+            buckets.clear()
+
+    def delete(self, id_: int) -> dict | None:
+        '''Remove an entity, returns it if it was held'''
+        entity = self.rows.pop(id_, None)
+        if entity is not None:
+            self._unindex(entity)
+        return entity
+
+    def first(self, index: str | tuple[str, ...], key: Hashable) -> dict | None:
+        '''Any one entity whose index fields equal key'''
+        for entity in self.by(index, key).values():
+            return entity
+        return None
+
+    def get(self, id_: int) -> dict | None:
+        return self.rows.get(id_)
+
+    def upsert(self, entity: dict) -> None:
+        '''Insert or replace an entity by its id, keeping the indexes current'''
+        old = self.rows.get(entity['id'])
+        if old is not None:
+            self._unindex(old)
+        self.rows[entity['id']] = entity
+        for index, buckets in self._indexes.items():
+            key = self._key(index, entity)
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = {}
+            bucket[entity['id']] = entity
+
+
+class OMS:
+    """In-process order management state fed by account WebSocket events
+
+    `apply_sync` loads the user/syncrequest snapshot and `apply` folds each
+    props Created/Updated/Deleted event into the tables, so working orders,
+    fills and positions are answered from memory without REST polling.
+    """
+
+    # -Constructor
+    def __init__(self) -> OMS:
+        self.orders: Table = Table('accountId', 'contractId', 'clOrdId')
+        self.working: Table = Table('accountId', 'contractId', ('accountId', 'contractId'))
+        self.order_versions: Table = Table('orderId', 'clOrdId')
+        self.fills: Table = Table('orderId', 'contractId')
+        self.execution_reports: Table = Table('orderId', 'accountId', 'contractId', 'clOrdId')
+        self.positions: Table = Table('accountId', 'contractId', ('accountId', 'contractId'))
+        self.events: int = 0
+        self._tables: dict[str, Table] = {
+            'order': self.orders,
+            'orderVersion': self.order_versions,
+            'fill': self.fills,
+            'executionReport': self.execution_reports,
+            'position': self.positions,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"OMS(orders={len(self.orders)}, working={len(self.working)}, "
+            f"fills={len(self.fills)}, positions={len(self.positions)}, events={self.events})"
+        )
+
+    # -Instance Methods: Private
+    def _upsert(self, entity_type: str, entity: dict) -> None:
+        self._tables[entity_type].upsert(entity)
+        if entity_type == 'order':
+            if entity.get('ordStatus') in WORKING_STATUSES:
+                self.working.upsert(entity)
+            else:
+                self.working.delete(entity['id'])
+        elif entity_type == 'orderVersion' and entity.get('clOrdId') is not None:
+            # -Orders carry no clOrdId themselves, learn it from their versions
+            order = self.orders.get(entity.get('orderId'))
+            if order is not None and order.get('clOrdId') != entity['clOrdId']:
+                self._upsert('order', {**order, 'clOrdId': entity['clOrdId']})
+
+    def _delete(self, entity_type: str, id_: int) -> None:
+        self._tables[entity_type].delete(id_)
+        if entity_type == 'order':
+            self.working.delete(id_)
+
+    # -Instance Methods: Public
+    def apply(self, d: dict) -> str | None:
+        '''Fold one props event into the tables, returns its entityType if tracked'''
+        entity_type = d.get('entityType')
+        if entity_type not in self._tables:
+            return None
+        entity = d.get('entity')
+        if not isinstance(entity, dict) or 'id' not in entity:
+            return None
+        self.events += 1
+        if d.get('eventType') == 'Deleted':
+            self._delete(entity_type, entity['id'])
+        else:
+            if entity_type == 'order' and 'clOrdId' not in entity:
+                version = self.order_versions.first('orderId', entity['id'])
+                if version is not None and version.get('clOrdId') is not None:
+                    entity = {**entity, 'clOrdId': version['clOrdId']}
+            self._upsert(entity_type, entity)
+        return entity_type
+
+    def apply_sync(self, d: dict, replace: bool = True) -> None:
+        '''Load a user/syncrequest snapshot, replacing the tables unless merging'''
+        if replace:
+            for table in (*self._tables.values(), self.working):
+                table.clear()
+        for entity_type, field in SYNC_FIELDS.items():
+            for entity in d.get(field) or ():
+                self._upsert(entity_type, entity)
+
+    def order(self, *, id_: int | None = None, cl_ord_id: str | None = None) -> dict | None:
+        '''Order by id or by clOrdId'''
+        if id_ is not None:
+            return self.orders.get(id_)
+        return self.orders.first('clOrdId', cl_ord_id)
+
+    def position(self, account_id: int, contract_id: int) -> dict | None:
+        '''Position of an account in a contract'''
+        return self.positions.first(('accountId', 'contractId'), (account_id, contract_id))
+
+    def working_orders(
+        self, account_id: int | None = None, contract_id: int | None = None
+    ) -> Mapping[int, dict]:
+        '''Working orders, optionally of one account and/or contract, a read-only {id: order} view'''
+        if account_id is not None and contract_id is not None:
+            return self.working.by(('accountId', 'contractId'), (account_id, contract_id))
+        if account_id is not None:
+            return self.working.by('accountId', account_id)
+        if contract_id is not None:
+            return self.working.by('contractId', contract_id)
+        return MappingProxyType(self.working.rows)
@@ -0,0 +1,316 @@
+## Imports
+from __future__ import annotations
+import json,math,time
+from decimal import Decimal
+from numbers import Integral, Number, Real
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Iterable
+
+from ..bulk import BulkResult, RateLimiter, bulk
+from .utils import urls
+from .utils.errors import OrderRejectedException, RiskRejectedException
+from .utils.metrics import LatencyStats
+
+if TYPE_CHECKING:
+    from .oms import OMS
+    from .profile.session import WebSocket
+    from .risk import RiskGate
+
+
+## Constants
+# -Fields held by the cached order templates
+TEMPLATE_FIELDS = frozenset((
+    'accountSpec', 'accountId', 'action', 'symbol', 'orderType',
+    'timeInForce', 'isAutomated',
+))
+
+
+## Functions
+def strip_nulls(payload: dict) -> dict:
+    """Copy of a request payload without None fields, nested dicts included"""
+    return {
+        key: strip_nulls(val) if isinstance(val, dict) else val
+        for key, val in payload.items() if val is not None
+    }
+
+
+def encode_number(value: Number) -> str:
+    """JSON number for an order quantity or price, never rounded
+
+    Integers are written as such, Decimals as their exact text and other
+    reals, numpy floats included, as the shortest float repr.
+    """
+    if isinstance(value, bool) or not isinstance(value, (Real, Decimal)):
+        raise TypeError(f"Invalid order number: {value!r}")
+    if isinstance(value, Integral):
+        return str(int(value))
+    if isinstance(value, Decimal):
+        if not value.is_finite():
+            raise ValueError(f"Invalid order number: {value}")
+        return str(value)
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError(f"Invalid order number: {value}")
+    return repr(value)
+
+
+## Classes
+class OrderEntry:
+    """Order entry for one account over an authorized account WebSocket
+
+    Requests go out on the socket with request-id correlation instead of a
+    HTTP round trip. Each (symbol, action, order type) combination gets a
+    pre-encoded JSON template holding the account and the static fields, so
+    placing an order only formats the quantity, prices and clOrdId into it.
+
+    With a `risk` gate, new orders are checked locally first and refused
+    with RiskRejectedException, or reduced to the allowed size with `clip`.
+    A modify is checked for the quantity it adds to the working order, read
+    from the `oms` order versions, and refused when the order is unknown.
+
+    The *_many operations send their requests concurrently, `concurrency` at
+    a time through the `limiter` token bucket, and yield BulkResults in
+    completion order.
+    """
+
+    # -Constructor
+    def __init__(
+        self, websocket: WebSocket, account_id: int, account_spec: str, *,
+        is_automated: bool = True, timeout: float | None = None,
+        risk: RiskGate | None = None, clip: bool = False,
+        oms: OMS | None = None, limiter: RateLimiter | None = None,
+        concurrency: int = 8
+    ) -> OrderEntry:
+        self.websocket: WebSocket = websocket
+        self.account_id: int = account_id
+        self.account_spec: str = account_spec
+        self.is_automated: bool = is_automated
+        self.timeout: float | None = timeout
+        self.risk: RiskGate | None = risk
+        self.clip: bool = clip
+        self.oms: OMS | None = oms
+        self.limiter: RateLimiter = limiter or RateLimiter()
+        self.concurrency: int = concurrency
+        self.latency: LatencyStats = LatencyStats()
+        self._templates: dict[tuple, str] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"OrderEntry(account={self.account_spec}, "
+            f"templates={len(self._templates)}, latency={self.latency})"
+        )
+
+    # -Instance Methods: Private
+    def _static(
+        self, symbol: str, action: str, order_type: str,
+        time_in_force: str | None
+    ) -> dict:
+        '''Order fields fixed by the template key'''
+        return strip_nulls({
+            "accountSpec": self.account_spec,
+            "accountId": self.account_id,
+            "action": action,
+            "symbol": symbol,
+            "orderType": order_type,
+            "timeInForce": time_in_force,
+            "isAutomated": self.is_automated,
+        })
+
+    def _template(
+        self, symbol: str, action: str, order_type: str,
+        time_in_force: str | None
+    ) -> str:
+        '''Open JSON object with the static order fields, cached per key'''
+        key = (symbol, action, order_type, time_in_force)
+        template = self._templates.get(key)
+        if template is None:
+            template = self._templates[key] = json.dumps(
+                self._static(symbol, action, order_type, time_in_force),
+                separators=(',', ':')
+            )[:-1]
+        return template
+
+    async def _request(self, url: str, body: str) -> dict:
+        '''Send an order request, returns its response data or raises on rejection'''
+        start = time.perf_counter()
+        res = await self.websocket.request(url, body=body, timeout=self.timeout)
+        self.latency.add(time.perf_counter() - start)
+        data = res.get('d')
+        if res.get('s') != 200 or (
+            isinstance(data, dict) and data.get('failureReason')
+        ):
+            raise OrderRejectedException(url, res)
+        return data
+
+    def _approve(self, action: str, symbol: str, order_qty: int) -> int:
+        '''Quantity allowed by the risk gate, raises when nothing is'''
+        if self.risk is None:
+            return order_qty
+        check = self.risk.check(self.account_id, symbol, action, order_qty, self.clip)
+        if not check:
+            raise RiskRejectedException(symbol, action, order_qty, check.reason)
+        return check.qty
+
+    def _approve_modify(self, order_id: int, order_qty: int) -> int:
+        '''Quantity allowed for a modify, only the increase over the working quantity is checked'''
+        if self.risk is None:
+            return order_qty
+        order = self.oms.orders.get(order_id) if self.oms is not None else None
+        if order is None:
+            raise RiskRejectedException(f"order {order_id}", 'Modify', order_qty, 'unknown-order')
+        versions = self.oms.order_versions.by('orderId', order_id)
+        # -No version yet: the whole quantity counts as added
+        working = (versions[max(versions)].get('orderQty') or 0) if versions else 0
+        if order_qty <= working:
+            return order_qty
+        check = self.risk.check(
+            order.get('accountId', self.account_id), order['contractId'],
+            order['action'], order_qty - working, self.clip
+        )
+        if not check:
+            raise RiskRejectedException(order['contractId'], order['action'], order_qty - working, check.reason)
+        return working + check.qty
+
+    # -Instance Methods: Public
+    def order_body(
+        self, action: str, symbol: str, order_qty: int, order_type: str, *,
+        price: float | None = None, stop_price: float | None = None,
+        cl_ord_id: str | None = None, time_in_force: str | None = None,
+        **fields
+    ) -> str:
+        '''JSON body of an order, extra camelCase fields (when not None) replace same-named ones'''
+        values = {'orderQty': encode_number(order_qty)}
+        if price is not None:
+            values['price'] = encode_number(price)
+        if stop_price is not None:
+            values['stopPrice'] = encode_number(stop_price)
+        if cl_ord_id is not None:
+            values['clOrdId'] = json.dumps(cl_ord_id)
+        for key, val in fields.items():
+            if val is not None:
+                values[key] = json.dumps(val)
+        if TEMPLATE_FIELDS.isdisjoint(values):
+            body = self._template(symbol, action, order_type, time_in_force)
+        else:
+            # -Overridden template fields: encode the static part without them
+            static = self._static(symbol, action, order_type, time_in_force)
+            body = json.dumps(
+                {key: val for key, val in static.items() if key not in values},
+                separators=(',', ':')
+            )[:-1]
+        return body + (',' if len(body) > 1 else '') + ','.join(
+            f'{json.dumps(key)}:{val}' for key, val in values.items()
+        ) + '}'
+
+    async def place_order(
+        self, action: str, symbol: str, order_qty: int, order_type: str, *,
+        price: float | None = None, stop_price: float | None = None,
+        cl_ord_id: str | None = None, time_in_force: str | None = None,
+        **fields
+    ) -> dict:
+        '''Place an order, returns the response data holding its orderId'''
+        order_qty = self._approve(action, symbol, order_qty)
+        return await self._request(urls.wss_order_place, self.order_body(
+            action, symbol, order_qty, order_type, price=price,
+            stop_price=stop_price, cl_ord_id=cl_ord_id,
+            time_in_force=time_in_force, **fields
+        ))
+
+    async def place_oco(
+        self, action: str, symbol: str, order_qty: int, order_type: str,
+        other: dict, *, price: float | None = None,
+        stop_price: float | None = None, cl_ord_id: str | None = None,
+        time_in_force: str | None = None, **fields
+    ) -> dict:
+        '''Place an Order Cancels Order strategy, other is the linked order'''
+        order_qty = self._approve(action, symbol, order_qty)
+        body = self.order_body(
+            action, symbol, order_qty, order_type, price=price,
+            stop_price=stop_price, cl_ord_id=cl_ord_id,
+            time_in_force=time_in_force, **fields
+        )
+        body = body[:-1] + f',"other":{json.dumps(strip_nulls(other))}}}'
+        return await self._request(urls.wss_order_place_oco, body)
+
+    async def place_oso(
+        self, action: str, symbol: str, order_qty: int, order_type: str,
+        bracket1: dict, bracket2: dict | None = None, *,
+        price: float | None = None, stop_price: float | None = None,
+        cl_ord_id: str | None = None, time_in_force: str | None = None,
+        **fields
+    ) -> dict:
+        '''Place an Order Sends Order strategy with one or two brackets'''
+        order_qty = self._approve(action, symbol, order_qty)
+        body = self.order_body(
+            action, symbol, order_qty, order_type, price=price,
+            stop_price=stop_price, cl_ord_id=cl_ord_id,
+            time_in_force=time_in_force, **fields
+        )[:-1] + f',"bracket1":{json.dumps(strip_nulls(bracket1))}'
+        if bracket2:
+            body += f',"bracket2":{json.dumps(strip_nulls(bracket2))}'
+        return await self._request(urls.wss_order_place_oso, body + '}')
+
+    async def cancel_order(self, order_id: int, **fields) -> dict:
+        '''Request the cancellation of an order'''
+        return await self._request(urls.wss_order_cancel, json.dumps(
+            strip_nulls({"orderId": order_id, "isAutomated": self.is_automated, **fields})
+        ))
+
+    async def liquidate_position(
+        self, contract_id: int, *, admin: bool = False, **fields
+    ) -> dict:
+        '''Request cancelling the working orders of a contract and closing its position'''
+        return await self._request(urls.wss_order_liquidate, json.dumps(strip_nulls({
+            "accountId": self.account_id, "contractId": contract_id,
+            "admin": admin, **fields,
+        })))
+
+    async def modify_order(
+        self, order_id: int, order_qty: int, order_type: str, *,
+        price: float | None = None, stop_price: float | None = None,
+        **fields
+    ) -> dict:
+        '''Request a change of quantity or prices of a working order, an increase is risk checked'''
+        order_qty = self._approve_modify(order_id, order_qty)
+        return await self._request(urls.wss_order_modify, json.dumps(strip_nulls({
+            "orderId": order_id, "orderQty": order_qty, "orderType": order_type,
+            "price": price, "stopPrice": stop_price,
+            "isAutomated": self.is_automated, **fields,
+        })))
+
+    def cancel_many(
+        self, order_ids: Iterable[int], *, concurrency: int | None = None,
+        **fields
+    ) -> AsyncIterator[BulkResult]:
+        '''Cancel orders concurrently, yields a result keyed by order id as each completes'''
+        return bulk((
+            (order_id, lambda order_id=order_id, **extra: self.cancel_order(
+                order_id, **fields, **extra
+            )) for order_id in order_ids
+        ), concurrency=concurrency or self.concurrency, limiter=self.limiter)
+
+    def modify_many(
+        self, changes: Iterable[dict], *, concurrency: int | None = None
+    ) -> AsyncIterator[BulkResult]:
+        '''Modify orders concurrently, changes are modifyorder bodies keyed by their orderId'''
+        def call(change: dict, **extra) -> Awaitable[dict]:
+            change = {**change, **extra}
+            return self.modify_order(
+                change.pop('orderId'), change.pop('orderQty'), change.pop('orderType'),
+                price=change.pop('price', None), stop_price=change.pop('stopPrice', None),
+                **change
+            )
+        return bulk((
+            (change['orderId'], lambda change=change, **extra: call(change, **extra))
+            for change in changes
+        ), concurrency=concurrency or self.concurrency, limiter=self.limiter)
+
+    def flatten_all(
+        self, contract_ids: Iterable[int], *, admin: bool = False,
+        concurrency: int | None = None
+    ) -> AsyncIterator[BulkResult]:
+        '''Liquidate positions concurrently, yields a result keyed by contract id as each completes'''
+        return bulk((
+            (contract_id, lambda contract_id=contract_id, **extra: self.liquidate_position(
+                contract_id, admin=admin, **extra
+            )) for contract_id in contract_ids
+        ), concurrency=concurrency or self.concurrency, limiter=self.limiter)
@@ -0,0 +1,232 @@
+## Imports
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from ..contractLibrary import Contract_Library
+    from .oms import OMS
+
+## Constants
+NAN = float('nan')
+
+
+## Classes
+class PnLEngine:
+    """Net position, average price and PnL per (account, contract)
+
+    Every (account, contract) pair owns a slot in preallocated arrays. A
+    fill updates its slot with average-cost accounting and a quote only
+    writes the contract's mark price into the slots trading it, so the hot
+    path allocates nothing. PnL is kept in points and converted with the
+    contract point value when read. Totals leave out the slots whose point
+    value (or, for unrealized PnL, mark) is not known yet, see `unpriced`.
+    """
+
+    # -Constructor
+    def __init__(self, capacity: int = 64) -> PnLEngine:
+        self._slots: dict[tuple[int, int], int] = {}
+        self._contract_slots: dict[int, list[int]] = {}
+        self._point_values: dict[int, float] = {}
+        self._fills: set[int] = set()
+        self._size: int = 0
+        self.net: np.ndarray = np.zeros(capacity)
+        self.avg_price: np.ndarray = np.zeros(capacity)
+        self.realized_points: np.ndarray = np.zeros(capacity)
+        self.mark: np.ndarray = np.full(capacity, NAN)
+        self.point_value: np.ndarray = np.full(capacity, NAN)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return (
+            f"PnLEngine(positions={self._size}, "
+            f"realized={self.realized():.2f}, unrealized={self.unrealized():.2f})"
+        )
+
+    # -Instance Methods: Private
+    def _grow(self) -> None:
+        capacity = 2 * len(self.net)
+        for name, fill in (
+            ('net', 0.0), ('avg_price', 0.0), ('realized_points', 0.0),
+            ('mark', NAN), ('point_value', NAN),
+        ):
+            old = getattr(self, name)
+            new = np.full(capacity, fill)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _slot(self, account_id: int, contract_id: int) -> int:
+        '''Slot of an (account, contract) pair, allocated on first use'''
+        slot = self._slots.get((account_id, contract_id))
+        if slot is None:
+            if self._size == len(self.net):
+                self._grow()
+            slot = self._slots[(account_id, contract_id)] = self._size
+            self._size += 1
+            self._contract_slots.setdefault(contract_id, []).append(slot)
+            self.point_value[slot] = self._point_values.get(contract_id, NAN)
+        return slot
+
+    def _select(self, account_id: int | None, contract_id: int | None) -> list[int] | slice:
+        if account_id is None and contract_id is None:
+            return slice(0, self._size)
+        return [
+            slot for (account, contract), slot in self._slots.items()
+            if (account_id is None or account == account_id)
+            and (contract_id is None or contract == contract_id)
+        ]
+
+    # -Instance Methods: Public
+    def fill(
+        self, account_id: int, contract_id: int, qty: float, price: float,
+        fill_id: int | None = None
+    ) -> None:
+        '''Apply a fill, qty signed positive for Buy and negative for Sell'''
+        if fill_id is not None:
+            if fill_id in self._fills:
+                return
+            self._fills.add(fill_id)
+        slot = self._slot(account_id, contract_id)
+        net = self.net[slot]
+        avg = self.avg_price[slot]
+        if net == 0 or (net > 0) == (qty > 0):
+            self.avg_price[slot] = (avg * net + price * qty) / (net + qty)
+        else:
+            closed = min(abs(qty), abs(net))
+            self.realized_points[slot] += (price - avg) * closed * (1 if net > 0 else -1)
+            if abs(qty) > abs(net):
+                self.avg_price[slot] = price
+            elif abs(qty) == abs(net):
+                self.avg_price[slot] = 0.0
+        self.net[slot] = net + qty
+
+    def on_fill(self, fill: dict, account_id: int) -> None:
+        '''Apply a fill entity of the given account'''
+        qty = fill['qty'] if fill['action'] == 'Buy' else -fill['qty']
+        self.fill(account_id, fill['contractId'], qty, fill['price'], fill.get('id'))
+
+    def on_quote(self, contract_id: int, price: float) -> None:
+        '''Mark every position in the contract to a new price'''
+        for slot in self._contract_slots.get(contract_id, ()):
+            self.mark[slot] = price
+
+    def load(self, oms: OMS) -> None:
+        '''Reset from the OMS position snapshot, its fills count as applied'''
+        self.net[:] = 0.0
+        self.avg_price[:] = 0.0
+        self.realized_points[:] = 0.0
+        for position in oms.positions:
+            slot = self._slot(position['accountId'], position['contractId'])
+            net = position.get('netPos') or 0
+            price = position.get('netPrice') or 0.0
+            self.net[slot] = net
+            self.avg_price[slot] = price if net else 0.0
+            if 'soldValue' in position and 'boughtValue' in position:
+                self.realized_points[slot] = (
+                    position['soldValue'] - position['boughtValue'] + net * price
+                )
+        self._fills = set(oms.fills.rows)
+
+    def set_point_value(self, contract_id: int, value: float) -> None:
+        '''Currency value of one point of price for a contract'''
+        self._point_values[contract_id] = value
+        for slot in self._contract_slots.get(contract_id, ()):
+            self.point_value[slot] = value
+
+    def has_point_value(self, contract_id: int) -> bool:
+        '''Whether the point value of a contract is known'''
+        return contract_id in self._point_values
+
+    def unpriced(self) -> list[int]:
+        '''Contracts held in a slot without a known point value'''
+        return [
+            contract_id for contract_id in self._contract_slots
+            if contract_id not in self._point_values
+        ]
+
+    async def load_point_values(
+        self, library: Contract_Library, contract_ids: list[int] | None = None
+    ) -> None:
+        '''Resolve point values through contract -> maturity -> product valuePerPoint'''
+        ids = list(contract_ids or self._contract_slots)
+        if not ids:
+            return
+        contracts = await library.contract_items(ids)
+        maturities = {
+            maturity['id']: maturity for maturity in await library.contract_maturity_items(
+                list({contract['contractMaturityId'] for contract in contracts})
+            )
+        }
+        products = {
+            product['id']: product for product in await library.product_items(
+                list({maturity['productId'] for maturity in maturities.values()})
+            )
+        }
+        for contract in contracts:
+            maturity = maturities.get(contract['contractMaturityId'])
+            product = products.get(maturity['productId']) if maturity else None
+            if product and 'valuePerPoint' in product:
+                self.set_point_value(contract['id'], product['valuePerPoint'])
+
+    def position(self, account_id: int, contract_id: int) -> dict | None:
+        '''Position summary of an (account, contract) pair'''
+        slot = self._slots.get((account_id, contract_id))
+        if slot is None:
+            return None
+        net = float(self.net[slot])
+        avg = float(self.avg_price[slot])
+        pv = float(self.point_value[slot])
+        return {
+            'accountId': account_id,
+            'contractId': contract_id,
+            'netPos': net,
+            'avgPrice': avg if net else NAN,
+            'realized': float(self.realized_points[slot]) * pv,
+            'unrealized': (float(self.mark[slot]) - avg) * net * pv if net else 0.0,
+        }
+
+    def realized(
+        self, account_id: int | None = None, contract_id: int | None = None
+    ) -> float:
+        '''Realized PnL, in total or of an account and/or contract, over the priced slots'''
+        slots = self._select(account_id, contract_id)
+        pv = self.point_value[slots]
+        known = ~np.isnan(pv)
+        return float(np.sum((self.realized_points[slots] * pv)[known]))
+
+    def unrealized(
+        self, account_id: int | None = None, contract_id: int | None = None
+    ) -> float:
+        '''Unrealized PnL at the last marks, in total or of an account and/or contract, over the priced slots'''
+        slots = self._select(account_id, contract_id)
+        net = self.net[slots]
+        pnl = (self.mark[slots] - self.avg_price[slots]) * net * self.point_value[slots]
+        return float(np.sum(pnl[(net != 0) & ~np.isnan(pnl)]))
+
+
+if __name__ == "__main__":
+    # -Micro-benchmark: python -m tradovate.stream.pnl
+    import timeit
+
+    engine = PnLEngine()
+    for account_id in range(4):
+        for contract_id in range(8):
+            engine.set_point_value(contract_id, 5.0)
+            engine.fill(account_id, contract_id, 2, 4000.0)
+            engine.on_quote(contract_id, 4000.25)
+    prices = (4000.0 + np.random.default_rng(0).normal(0.0, 1.0, 1000)).tolist()
+    number = 200
+    quotes = timeit.timeit(
+        lambda: [engine.on_quote(3, price) for price in prices], number=number
+    ) / (number * len(prices))
+    fills = timeit.timeit(
+        lambda: engine.fill(1, 3, 1, 4001.0), number=100_000
+    ) / 100_000
+    reads = timeit.timeit(lambda: engine.unrealized(1), number=10_000) / 10_000
+    print(
+        f"{engine!r}\n quote {quotes * 1e6:.2f}us ({1 / quotes:,.0f}/s)"
+        f"  fill {fills * 1e6:.2f}us  unrealized(account) {reads * 1e6:.2f}us"
+    )
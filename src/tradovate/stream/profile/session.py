@@ -1,6 +1,6 @@
 ## Imports
 from __future__ import annotations
-import asyncio,os,requests,json,logging
+import asyncio,os,requests,json,logging,time
 from asyncio import AbstractEventLoop
 from datetime import datetime, timedelta, timezone
 
@@ -11,8 +11,10 @@ from ..utils import timestamp_to_datetime, urls
 from ..utils.errors import (
     LoginInvalidException, LoginCaptchaException,
     WebSocketOpenException, WebSocketAuthorizationException,
-    WebSocketClosedException
+    WebSocketClosedException, WebSocketTimeoutException
 )
+from ..utils.metrics import LatencyStats, RateCounter
+from ..subscription import OVERFLOW, Subscription
 from ..utils.typing import CredentialAuthDict
 
 ## Constants
@@ -27,6 +29,8 @@ class Session:
     def __init__(self, *, loop: AbstractEventLoop | None = None) -> Session:
         self.authenticated: asyncio.Event = asyncio.Event()
         self.token_expiration: datetime | None = None
+        self.access_token: str | None = None
+        self.md_access_token: str | None = None
         self._aiosession: aiohttp.ClientSession | None = None
         self._loop: AbstractEventLoop = loop if loop else asyncio.get_event_loop()
         self._loop.create_task(self.__ainit__(), name="session-init")
@@ -65,6 +69,8 @@ class Session:
         log.debug("Session event 'authorized'")
         self.authenticated.set()
         self.token_expiration = timestamp_to_datetime(res_dict['expirationTime'])
+        self.access_token = res_dict['accessToken']
+        self.md_access_token = res_dict.get('mdAccessToken', self.md_access_token)
         self._aiosession.headers.update({
             'AUTHORIZATION': "Bearer " + res_dict['accessToken']
         })
@@ -123,20 +129,37 @@ class Session:
 
 
 class WebSocket:
-    """Tradovate WebSocket"""
+    """Tradovate WebSocket
+
+    A single reader task owns the socket and decodes each frame once.
+    Responses are matched to their request by id and resolve the future
+    awaited in `request`, every other event is fanned out to each
+    `Subscription`, including the default one read by `poll_message`.
+    """
 
     # -Constructor
     def __init__(
         self, url: str, websocket: ClientWebSocket, *,
-        loop: AbstractEventLoop | None = None
+        loop: AbstractEventLoop | None = None, timeout: float = 10.0,
+        frames: RateCounter | None = None, overflow: OVERFLOW = OVERFLOW.BLOCK
     ) -> WebSocket:
         self.id: int = WebSocket.id
         WebSocket.id += 1
         self.url: str = url
+        self.timeout: float = timeout
         self.connected: asyncio.Event = asyncio.Event()
         self.authenticated: asyncio.Event = asyncio.Event()
+        self.latency: LatencyStats = LatencyStats()
+        # -May be shared so a count survives the socket being replaced
+        self.frames: RateCounter = frames if frames is not None else RateCounter()
         self._request: int = 0
+        self._pending: dict[int, tuple[asyncio.Future, float]] = {}
+        # -The poll_message queue feeds the strategy, OMS and PnL: by default a
+        # -slow consumer pauses the reader rather than losing events
+        self._messages: Subscription = Subscription(10000, overflow)
+        self._subscriptions: list[Subscription] = [self._messages]
         self._aiowebsocket: ClientWebSocket = websocket
+        self._reader: asyncio.Task | None = None
         self._loop: AbstractEventLoop = loop if loop else asyncio.get_event_loop()
         self._loop.create_task(self.__ainit__(), name=f"websocket[{self.id}]-init")
 
@@ -148,6 +171,9 @@ class WebSocket:
         self._loop.create_task(
             self._heartbeat(), name=f"websocket[{self.id}]-heartbeat"
         )
+        self._reader = self._loop.create_task(
+            self._read(), name=f"websocket[{self.id}]-reader"
+        )
 
     def __repr__(self) -> str:
         return (
@@ -156,53 +182,110 @@ class WebSocket:
         )
 
     # -Instance Methods: Private
+    def _disconnect(self) -> None:
+        '''Mark closed, fail pending requests and wake the consumer'''
+        self.connected.clear()
+        self.authenticated.clear()
+        for future, _ in self._pending.values():
+            if not future.done():
+                future.set_exception(WebSocketClosedException(self.url))
+        self._pending.clear()
+        for subscription in self._subscriptions:
+            subscription.close()
+
     async def _heartbeat(self) -> None:
         '''Send heartbeat packet to aiowebsocket'''
         while self.connected.is_set():
             await asyncio.sleep(2.5)
             await self._aiowebsocket.send_str("[]")
 
-    async def _socket_send(self, url: str, query: str = "", body: str = "") -> None:
-        '''Send formatted request string to aiowebsocket'''
-        req = f"{url}\n{self._request}\n{query}\n{body}"
-        self._request += 1
+    async def _read(self) -> None:
+        '''Reader task: resolve responses by request id, queue event frames'''
+        try:
+            while self.connected.is_set():
+                ws_res = await self._aiowebsocket.receive()
+                if ws_res.type in (
+                    aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSED,
+                    aiohttp.WSMsgType.ERROR
+                ):
+                    break
+                if not ws_res.data or not isinstance(ws_res.data, str):
+                    continue
+                init_ = ws_res.data[0]
+                if init_ == 'c':
+                    break
+                if init_ != 'a':
+                    continue
+                self.frames.add()
+                for msg in json.loads(ws_res.data[1:]):
+                    if 'i' in msg and 'e' not in msg:
+                        self._resolve(msg)
+                        continue
+                    for subscription in self._subscriptions:
+                        await subscription.put(msg)
+        finally:
+            self._disconnect()
+
+    def _resolve(self, msg: dict) -> None:
+        '''Complete the future of the request the response id belongs to'''
+        pending = self._pending.pop(msg['i'], None)
+        if pending is None:
+            return
+        future, sent = pending
+        self.latency.add(time.perf_counter() - sent)
+        if not future.done():
+            future.set_result(msg)
+
+    async def _send(self, id_: int, url: str, query: str, body: str) -> None:
+        '''Send a reserved request once connected, failing its future on error'''
+        try:
+            await self.connected.wait()
+            await self._socket_send(url, query, body, id_=id_)
+        except Exception as exc:
+            pending = self._pending.pop(id_, None)
+            if pending and not pending[0].done():
+                pending[0].set_exception(exc)
+
+    async def _socket_send(
+        self, url: str, query: str = "", body: str = "", *, id_: int | None = None
+    ) -> int:
+        '''Send formatted request string to aiowebsocket, returns request id'''
+        if id_ is None:
+            id_ = self._request
+            self._request += 1
+        req = f"{url}\n{id_}\n{query}\n{body}"
         await self._aiowebsocket.send_str(req)
+        return id_
 
     # -Instance Methods: Public
     async def authorize(self, token: str) -> None:
         '''Request WebSocket authorization'''
-        await self._socket_send(urls.wss_auth, body=token)
-        res = (await self.poll_message())
-        if res == None:
+        try:
+            ws_res = await self.request(urls.wss_auth, body=token)
+        except (WebSocketClosedException, WebSocketTimeoutException):
             raise WebSocketAuthorizationException(self.url, token)
-        ws_res = res[0]
         if not ws_res or ws_res['s'] != 200:
             raise WebSocketAuthorizationException(self.url, token)
         self.authenticated.set()
 
     async def close(self) -> None:
-        if self.connected.is_set():
-            await self._aiowebsocket.close()
-        self.connected.clear()
-        self.authenticated.clear()
-
-    async def poll_message(self, ticker = None, interval = None) -> None:
-        '''Recieve dictionary object or None from aiowebsocket'''
-        ws_res = await self._aiowebsocket.receive()
-        #print("*****************************************>>",len(ws_res.data), "<<*****************************************")
-        if not ws_res or not ws_res.data or isinstance(ws_res.data, int):
-            return None
-        init_ = ws_res.data[0]
-        if init_ == 'a':
-            return json.loads(ws_res.data[1:])
-        elif init_ == 'c':
+        # -Also closes a socket that never opened or authorized
+        await self._aiowebsocket.close()
+        if self._reader:
+            self._reader.cancel()
+        self._disconnect()
+
+    async def poll_message(self, ticker = None, interval = None) -> list[dict] | None:
+        '''Recieve the queued event dictionaries from the default subscription'''
+        msgs = await self._messages.get_many()
+        if msgs is None:
             raise WebSocketClosedException(self.url)
-        return None
+        return msgs
 
-    async def request(
-        self, url: str, *, body: dict[str, str] | None = None, **kwargs
-    ) -> None:
-        '''Send a formatted request to aiowebsocket'''
+    def request_nowait(
+        self, url: str, *, body: dict[str, str] | str | None = None, **kwargs
+    ) -> asyncio.Future:
+        '''Send a formatted request, returns a future of its response'''
         log.debug(f"WebSocket[{self.id}] event '{url}'")
         if kwargs:
             fields = []
@@ -213,20 +296,55 @@ class WebSocket:
             query = '&'.join(fields)
         else:
             query = ""
-        body = json.dumps(body) if body else ""
-        await self._socket_send(url, query, body)
+        if body and not isinstance(body, str):
+            body = json.dumps(body)
+        future = self._loop.create_future()
+        id_ = self._request
+        self._request += 1
+        self._pending[id_] = (future, time.perf_counter())
+        future.add_done_callback(lambda _: self._pending.pop(id_, None))
+        self._loop.create_task(self._send(id_, url, query, body or ""))
+        return future
+
+    async def request(
+        self, url: str, *, body: dict[str, str] | str | None = None,
+        timeout: float | None = None, **kwargs
+    ) -> dict:
+        '''Send a formatted request and await its response'''
+        future = self.request_nowait(url, body=body, **kwargs)
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise WebSocketTimeoutException(self.url, url, timeout)
+
+    def subscribe(
+        self, maxsize: int = 1024, overflow: OVERFLOW = OVERFLOW.BLOCK, **kwargs
+    ) -> Subscription:
+        '''Attach a new consumer queue to the reader task'''
+        subscription = Subscription(maxsize, overflow, **kwargs)
+        if not self.connected.is_set() and self._reader and self._reader.done():
+            subscription.close()
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        '''Detach a consumer queue from the reader task'''
+        subscription.close()
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
 
     # -Class Methods
     @classmethod
     async def from_session(
         cls, url: str, session: Session, *,
-        loop: AbstractEventLoop | None = None
+        loop: AbstractEventLoop | None = None, frames: RateCounter | None = None
     ) -> WebSocket:
         '''Create WebSocket from Session'''
         loop = loop if loop else session.loop
         websocket = await session.create_websocket(url)
         return cls(
-            url, websocket, loop=loop
+            url, websocket, loop=loop, frames=frames
         )
 
     # -Class Properties
@@ -0,0 +1,217 @@
+## Imports
+from __future__ import annotations
+import asyncio,gzip,json,struct,time
+from collections import deque
+from typing import TYPE_CHECKING, BinaryIO, Iterator
+
+import aiohttp
+
+from .utils.clock import SimulatedClock
+
+if TYPE_CHECKING:
+    from aiohttp import ClientWebSocketResponse as ClientWebSocket
+    from .profile.session import WebSocket
+
+## Constants
+# -Record header: receive time (epoch seconds), payload length
+FRAME = struct.Struct('<dI')
+CLOSED = aiohttp.WSMessage(aiohttp.WSMsgType.CLOSED, None, None)
+
+
+## Functions
+def open_frames(path: str, mode: str) -> BinaryIO:
+    """Frame file, gzip compressed when the path ends with .gz"""
+    if path.endswith('.gz'):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+def read_frames(path: str) -> Iterator[tuple[float, str]]:
+    """(receive time, raw frame) records of a frame file in order"""
+    with open_frames(path, 'rb') as file:
+        while True:
+            header = file.read(FRAME.size)
+            if len(header) < FRAME.size:
+                return
+            ts, size = FRAME.unpack(header)
+            payload = file.read(size)
+            if len(payload) < size:
+                return
+            yield ts, payload.decode()
+
+
+## Classes
+class _RecordingSocket:
+    """aiohttp socket proxy handing every received event frame to a recorder"""
+
+    # -Constructor
+    def __init__(self, websocket: ClientWebSocket, recorder: FrameRecorder) -> _RecordingSocket:
+        self._websocket = websocket
+        self._recorder = recorder
+
+    def __getattr__(self, name: str):
+        return getattr(self._websocket, name)
+
+    # -Instance Methods: Public
+    async def receive(self, *args, **kwargs) -> aiohttp.WSMessage:
+        msg = await self._websocket.receive(*args, **kwargs)
+        if msg.type == aiohttp.WSMsgType.TEXT and msg.data and msg.data[0] == 'a':
+            self._recorder.write(msg.data)
+        return msg
+
+
+class FrameRecorder:
+    """Append-only file of raw WebSocket frames with their receive time
+
+    Each record is a packed (time, length) header followed by the frame as
+    received, so nothing is decoded on the way in. Only 'a' event frames are
+    kept; open, heartbeat and close frames are protocol noise for a replay.
+    """
+
+    # -Constructor
+    def __init__(self, path: str) -> FrameRecorder:
+        self.path: str = path
+        self.frames: int = 0
+        self.bytes: int = 0
+        self._file: BinaryIO = open_frames(path, 'ab')
+
+    def __repr__(self) -> str:
+        return f"FrameRecorder(path={self.path}, frames={self.frames}, bytes={self.bytes})"
+
+    # -Instance Methods: Public
+    def attach(self, websocket: WebSocket) -> None:
+        '''Record the frames read by a WebSocket from now on'''
+        socket = websocket._aiowebsocket
+        if isinstance(socket, _RecordingSocket):
+            socket = socket._websocket
+        websocket._aiowebsocket = _RecordingSocket(socket, self)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def write(self, frame: str, ts: float | None = None) -> None:
+        payload = frame.encode()
+        self._file.write(FRAME.pack(time.time() if ts is None else ts, len(payload)))
+        self._file.write(payload)
+        self.frames += 1
+        self.bytes += FRAME.size + len(payload)
+
+
+class ReplaySocket:
+    """Stand-in for an aiohttp socket serving recorded frames to a WebSocket
+
+    Frames are released at their recorded pace divided by `speed`, or back
+    to back with `speed=None`, and the `clock` is set to each frame's receive
+    time before it is handed over. Requests sent through the WebSocket are
+    answered with an empty 200 response so subscriptions and authorization
+    go through; the socket reports closed after the last frame.
+    """
+
+    # -Constructor
+    def __init__(
+        self, path: str, speed: float | None = 1.0,
+        clock: SimulatedClock | None = None
+    ) -> ReplaySocket:
+        self.path: str = path
+        self.speed: float | None = speed
+        self.clock: SimulatedClock = clock if clock is not None else SimulatedClock()
+        self.frames: int = 0
+        self._frames: Iterator[tuple[float, str]] = read_frames(path)
+        self._next: tuple[float, str] | None = None
+        self._responses: deque[str] = deque()
+        self._wake: asyncio.Event = asyncio.Event()
+        self._start: tuple[float, float] | None = None
+        self._closed: bool = False
+
+    def __repr__(self) -> str:
+        return f"ReplaySocket(path={self.path}, speed={self.speed}, frames={self.frames})"
+
+    # -Instance Methods: Private
+    async def _pace(self, ts: float) -> None:
+        '''Wait until a frame is due, answering requests meanwhile'''
+        loop = asyncio.get_running_loop()
+        if self._start is None:
+            self._start = (loop.time(), ts)
+        while True:
+            delay = self._start[0] + (ts - self._start[1]) / self.speed - loop.time()
+            if delay <= 0 or self._responses or self._closed:
+                return
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                return
+
+    # -Instance Methods: Public
+    async def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+
+    async def receive(self, *args, **kwargs) -> aiohttp.WSMessage:
+        while not self._closed:
+            if self._responses:
+                return aiohttp.WSMessage(aiohttp.WSMsgType.TEXT, self._responses.popleft(), None)
+            frame = self._next or next(self._frames, None)
+            if frame is None:
+                break
+            ts, data = frame
+            if self.speed:
+                await self._pace(ts)
+                if self._responses:
+                    # -Answer first, the frame stays next in line
+                    self._next = frame
+                    continue
+            else:
+                await asyncio.sleep(0)
+            self._next = None
+            self.clock.set(ts)
+            self.frames += 1
+            return aiohttp.WSMessage(aiohttp.WSMsgType.TEXT, data, None)
+        return CLOSED
+
+    async def receive_str(self, *args, **kwargs) -> str:
+        return 'o'
+
+    async def send_str(self, data: str, *args, **kwargs) -> None:
+        if data == '[]':
+            return
+        url, id_, *_ = data.split('\n', 3)
+        self._responses.append('a' + json.dumps([{'s': 200, 'i': int(id_), 'd': {}}]))
+        self._wake.set()
+
+
+if __name__ == "__main__":
+    # -Micro-benchmark: python -m tradovate.stream.replay
+    import os,tempfile
+    # -Module import, WebSocket itself is only imported for type checking above
+    from .profile import session
+    from .utils.errors import WebSocketClosedException
+
+    async def main(n: int = 50_000) -> None:
+        path = os.path.join(tempfile.mkdtemp(), 'quotes.frames')
+        recorder = FrameRecorder(path)
+        for i in range(n):
+            recorder.write('a' + json.dumps([{'e': 'md', 'd': {'quotes': [
+                {'contractId': 1, 'entries': {'Trade': {'price': 4000.0 + i % 8, 'size': 1}}}
+            ]}}]), ts=1_700_000_000.0 + i * 0.001)
+        recorder.close()
+        socket = ReplaySocket(path, speed=None)
+        websocket = session.WebSocket('replay://', socket, loop=asyncio.get_running_loop())
+        await websocket.connected.wait()
+        events = 0
+        start = time.perf_counter()
+        try:
+            while True:
+                events += len(await websocket.poll_message())
+        except WebSocketClosedException:
+            pass
+        elapsed = time.perf_counter() - start
+        print(
+            f"{recorder!r}\n{socket!r}\n {events} events in {elapsed:.3f}s"
+            f" ({events / elapsed:,.0f}/s, {os.path.getsize(path) / n:.0f} bytes/frame)"
+        )
+
+    asyncio.run(main())
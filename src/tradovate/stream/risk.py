@@ -0,0 +1,283 @@
+## Imports
+from __future__ import annotations
+import asyncio
+from collections import Counter
+from typing import TYPE_CHECKING
+
+from .utils.errors import RiskConfigurationException
+
+if TYPE_CHECKING:
+    from ..contractLibrary import Contract_Library
+    from ..risks import Risk
+    from .oms import OMS
+    from .pnl import PnLEngine
+
+## Constants
+INF = float('inf')
+
+
+## Classes
+class RiskCheck:
+    """Outcome of a pre-trade check: the quantity allowed and why it was cut"""
+    __slots__ = ('qty', 'requested', 'reason')
+
+    # -Constructor
+    def __init__(self, qty: int, requested: int, reason: str | None = None) -> RiskCheck:
+        self.qty: int = qty
+        self.requested: int = requested
+        self.reason: str | None = reason
+
+    def __bool__(self) -> bool:
+        return self.qty > 0
+
+    def __repr__(self) -> str:
+        return f"RiskCheck(qty={self.qty}/{self.requested}, reason={self.reason})"
+
+    # -Properties
+    @property
+    def clipped(self) -> bool:
+        return 0 < self.qty < self.requested
+
+
+class RiskGate:
+    """Local pre-trade risk checks against cached account limits
+
+    Position limits, risk parameters, auto-liquidation thresholds and
+    margins are loaded once through the REST Risk API and kept in dicts
+    keyed by account and contract or product, with net positions tracked
+    from fills. `check` is pure in-process arithmetic, so an order is
+    rejected or clipped before anything is sent.
+
+    Checking before the limits were loaded (`load` or `set_limits`) raises
+    RiskConfigurationException rather than rejecting every symbol.
+    """
+
+    # -Constructor
+    def __init__(self, pnl: PnLEngine | None = None) -> RiskGate:
+        self.pnl: PnLEngine | None = pnl
+        self.rejections: Counter = Counter()
+        self.configured: bool = False
+        self._net: dict[tuple[int, int], int] = {}
+        self._symbols: dict[str, int] = {}
+        self._products: dict[int, int] = {}
+        # -(account, contract) or (account, product) or (account, None) -> limit
+        self._limits: dict[tuple[int, int | None], dict] = {}
+        self._product_limits: dict[tuple[int, int], dict] = {}
+        self._params: dict[int, dict] = {}
+        self._auto_liq: dict[int, dict] = {}
+        self._margins: dict[int, float] = {}
+        self._product_margins: dict[int, float] = {}
+        self._buying_power: dict[int, float] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"RiskGate(configured={self.configured}, contracts={len(self._symbols)}, "
+            f"limits={len(self._limits) + len(self._product_limits)}, "
+            f"rejections={sum(self.rejections.values())})"
+        )
+
+    # -Instance Methods: Private
+    def _reject(self, requested: int, reason: str) -> RiskCheck:
+        self.rejections[reason] += 1
+        return RiskCheck(0, requested, reason)
+
+    def _limit(self, account_id: int, contract_id: int) -> dict | None:
+        '''Most specific active position limit: contract, then product, then account'''
+        limit = self._limits.get((account_id, contract_id))
+        if limit is None:
+            product_id = self._products.get(contract_id)
+            limit = self._product_limits.get((account_id, product_id))
+            if limit is None:
+                limit = self._limits.get((account_id, None))
+        return limit
+
+    def _initial_margin(self, contract_id: int) -> float:
+        margin = self._margins.get(contract_id)
+        if margin is None:
+            margin = self._product_margins.get(self._products.get(contract_id), 0.0)
+        return margin
+
+    # -Instance Methods: Public
+    def check(
+        self, account_id: int, symbol: str | int, action: str, qty: int,
+        clip: bool = False
+    ) -> RiskCheck:
+        '''Allowed quantity of an order, 0 with a reason when rejected'''
+        if not self.configured:
+            raise RiskConfigurationException(
+                "Risk limits are not loaded, call RiskGate.load (Client.rest) before checking orders"
+            )
+        contract_id = self._symbols.get(symbol) if isinstance(symbol, str) else symbol
+        if contract_id is None:
+            return self._reject(qty, 'unknown-contract')
+        if qty <= 0:
+            return self._reject(qty, 'invalid-qty')
+        net = self._net.get((account_id, contract_id), 0)
+        signed = qty if action == 'Buy' else -qty
+        closing = min(qty, abs(net)) if net and (net > 0) != (signed > 0) else 0
+        opening = qty - closing
+        allowed = qty
+        reason = None
+
+        # -Auto-liquidation: past the liq-only loss only closing orders pass
+        auto_liq = self._auto_liq.get(account_id)
+        if auto_liq is not None and self.pnl is not None and opening:
+            loss = -(self.pnl.realized(account_id) + self.pnl.unrealized(account_id))
+            if loss >= auto_liq['liqOnly']:
+                if not closing or not clip:
+                    return self._reject(qty, 'daily-loss-liq-only')
+                allowed, opening, reason = closing, 0, 'daily-loss-liq-only'
+
+        limit = self._limit(account_id, contract_id)
+        if limit is not None:
+            params = self._params.get(limit['id'])
+            if params is not None:
+                if opening > params['maxOpening']:
+                    if not clip:
+                        return self._reject(qty, 'max-opening-qty')
+                    allowed, opening, reason = closing + params['maxOpening'], params['maxOpening'], 'max-opening-qty'
+                if closing > params['maxClosing']:
+                    return self._reject(qty, 'max-closing-qty')
+            if opening:
+                room = (limit['long'] - max(net, 0)) if signed > 0 else (limit['short'] - max(-net, 0))
+                room = min(room, limit['exposed'] - abs(net) + closing)
+                if opening > room:
+                    if not clip or room <= 0:
+                        return self._reject(qty, 'position-limit')
+                    allowed, opening, reason = closing + room, room, 'position-limit'
+
+        buying_power = self._buying_power.get(account_id)
+        if buying_power is not None and opening:
+            margin = self._initial_margin(contract_id)
+            if margin and opening * margin > buying_power:
+                fits = int(buying_power // margin)
+                if not clip or closing + fits <= 0:
+                    return self._reject(qty, 'margin')
+                allowed, reason = closing + fits, 'margin'
+        if reason is not None:
+            self.rejections[reason] += 1
+        return RiskCheck(allowed, qty, reason)
+
+    def on_fill(self, account_id: int, contract_id: int, qty: int) -> None:
+        '''Track exposure, qty signed positive for Buy and negative for Sell'''
+        key = (account_id, contract_id)
+        self._net[key] = self._net.get(key, 0) + qty
+
+    def load_positions(self, oms: OMS) -> None:
+        '''Reset net positions from the OMS position snapshot'''
+        self._net = {
+            (position['accountId'], position['contractId']): position.get('netPos') or 0
+            for position in oms.positions
+        }
+
+    def set_buying_power(self, account_id: int, amount: float | None) -> None:
+        '''Cash available for initial margin of opening orders, None to disable'''
+        if amount is None:
+            self._buying_power.pop(account_id, None)
+        else:
+            self._buying_power[account_id] = amount
+
+    def set_contract(self, contract_id: int, name: str, product_id: int | None = None) -> None:
+        '''Map a symbol to its contract and product'''
+        self._symbols[name] = contract_id
+        if product_id is not None:
+            self._products[contract_id] = product_id
+
+    def set_limits(
+        self, position_limits: list[dict], risk_parameters: list[dict] = (),
+        auto_liqs: list[dict] = ()
+    ) -> None:
+        '''Index UserAccountPositionLimit, UserAccountRiskParameter and UserAccountAutoLiq entities'''
+        self._limits.clear()
+        self._product_limits.clear()
+        for limit in position_limits:
+            if not limit.get('active', True):
+                continue
+            entry = {
+                'id': limit['id'],
+                'long': limit.get('longLimit') if limit.get('longLimit') is not None else INF,
+                'short': limit.get('shortLimit') if limit.get('shortLimit') is not None else INF,
+                'exposed': limit.get('exposedLimit') if limit.get('exposedLimit') is not None else INF,
+            }
+            if limit.get('contractId') is not None:
+                self._limits[(limit['accountId'], limit['contractId'])] = entry
+            elif limit.get('productId') is not None:
+                self._product_limits[(limit['accountId'], limit['productId'])] = entry
+            else:
+                self._limits[(limit['accountId'], None)] = entry
+        self._params = {
+            param['userAccountPositionLimitId']: {
+                'maxOpening': param.get('maxOpeningOrderQty') if param.get('maxOpeningOrderQty') is not None else INF,
+                'maxClosing': param.get('maxClosingOrderQty') if param.get('maxClosingOrderQty') is not None else INF,
+            }
+            for param in risk_parameters
+        }
+        self._auto_liq = {
+            auto_liq['id']: {'liqOnly': auto_liq['dailyLossLiqOnly']}
+            for auto_liq in auto_liqs if auto_liq.get('dailyLossLiqOnly')
+        }
+        self.configured = True
+
+    def set_margins(self, contract_margins: list[dict] = (), product_margins: list[dict] = ()) -> None:
+        '''Index ContractMargin and ProductMargin initial margins, keyed by their id'''
+        self._margins = {m['id']: m['initialMargin'] for m in contract_margins if 'initialMargin' in m}
+        self._product_margins = {m['id']: m['initialMargin'] for m in product_margins if 'initialMargin' in m}
+
+    async def load(
+        self, risk: Risk, account_ids: list[int],
+        library: Contract_Library | None = None, symbols: list[str] = ()
+    ) -> None:
+        '''Fetch limits, risk parameters, auto-liq settings and margins concurrently'''
+        if library is not None and symbols:
+            contracts = await asyncio.gather(*(library.contract_find(name) for name in symbols))
+            maturities = await library.contract_maturity_items(
+                list({contract['contractMaturityId'] for contract in contracts if contract})
+            )
+            products = {maturity['id']: maturity['productId'] for maturity in maturities}
+            for contract in contracts:
+                if contract:
+                    self.set_contract(
+                        contract['id'], contract['name'],
+                        products.get(contract['contractMaturityId'])
+                    )
+        limits, auto_liqs, product_margins, contract_margins = await asyncio.gather(
+            risk.user_account_position_limit_L_dependents(account_ids),
+            risk.user_account_auto_liq_items(account_ids),
+            risk.product_margin_list(),
+            risk.contract_margin_items(list(self._symbols.values()))
+            if self._symbols else asyncio.sleep(0, []),
+        )
+        limits = limits if isinstance(limits, list) else []
+        params = await risk.user_account_risk_parameter_L_dependents(
+            [limit['id'] for limit in limits]
+        ) if limits else []
+        self.set_limits(
+            limits, params if isinstance(params, list) else [],
+            auto_liqs if isinstance(auto_liqs, list) else []
+        )
+        self.set_margins(
+            contract_margins if isinstance(contract_margins, list) else [],
+            product_margins if isinstance(product_margins, list) else []
+        )
+
+
+if __name__ == "__main__":
+    # -Micro-benchmark: python -m tradovate.stream.risk
+    import timeit
+
+    gate = RiskGate()
+    gate.set_contract(1, 'ESZ6', product_id=10)
+    gate.set_limits(
+        [{'id': 5, 'accountId': 7, 'productId': 10, 'longLimit': 4, 'shortLimit': 4, 'exposedLimit': 6}],
+        [{'userAccountPositionLimitId': 5, 'maxOpeningOrderQty': 3, 'maxClosingOrderQty': 10}],
+    )
+    gate.set_margins(product_margins=[{'id': 10, 'initialMargin': 12000.0}])
+    gate.set_buying_power(7, 30000.0)
+    gate.on_fill(7, 1, 2)
+    number = 200_000
+    checks = timeit.timeit(lambda: gate.check(7, 'ESZ6', 'Buy', 1), number=number) / number
+    clips = timeit.timeit(lambda: gate.check(7, 'ESZ6', 'Buy', 5, clip=True), number=number) / number
+    print(
+        f"{gate!r}\n {gate.check(7, 'ESZ6', 'Buy', 5, clip=True)!r}"
+        f"\n check {checks * 1e6:.2f}us  clipped check {clips * 1e6:.2f}us"
+    )
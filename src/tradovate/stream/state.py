@@ -0,0 +1,133 @@
+## Imports
+from __future__ import annotations
+import asyncio,logging
+from typing import Any, Iterable
+
+from ..store import pipelined, shared_redis
+
+## Constants
+log = logging.getLogger(__name__)
+DELETED = object()
+
+
+## Classes
+class StateStore:
+    """Strategy state kept in memory and written behind to Redis
+
+    Reads never leave the process: the in-memory copy is authoritative and
+    Redis is only read by `load` at startup to recover it. Writes mark keys
+    dirty, later writes to a key replace earlier ones, and a background task
+    sends the dirty keys in one pipeline every `flush_interval` seconds on
+    the shared asyncio client, so the event loop never blocks on Redis.
+    Keys stay dirty until the write holding them succeeded, so a failed or
+    cancelled write loses nothing; `close` waits for the write in flight and
+    flushes what is left.
+    """
+
+    # -Constructor
+    def __init__(self, redis_client = None, flush_interval: float = 0.05) -> StateStore:
+        self.redis = redis_client if redis_client is not None else shared_redis
+        self.flush_interval: float = flush_interval
+        self.flushes: int = 0
+        self.writes: int = 0
+        self._data: dict[str, Any] = {}
+        self._dirty: dict[str, Any] = {}
+        self._task: asyncio.Task | None = None
+        self._writing: asyncio.Task | None = None
+
+    # -Dunder Methods
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return (
+            f"StateStore(keys={len(self._data)}, dirty={len(self._dirty)}, "
+            f"flushes={self.flushes}, writes={self.writes})"
+        )
+
+    # -Instance Methods: Private
+    def _mark(self, key: str, value: Any) -> None:
+        self._dirty[key] = value
+        if self._task is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+            self._task = loop.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        try:
+            await asyncio.sleep(self.flush_interval)
+        finally:
+            self._task = None
+        await self.flush()
+
+    async def _write(self, batch: dict[str, Any]) -> None:
+        '''Send a batch of sets and deletes in one pipeline round trip'''
+        await pipelined((
+            ('delete', key) if value is DELETED else ('set', key, value)
+            for key, value in batch.items()
+        ), client=self.redis)
+
+    async def _commit(self, batch: dict[str, Any]) -> None:
+        '''Write task of a batch: its keys are only cleared once written, and unless rewritten since'''
+        try:
+            await self._write(batch)
+        except Exception as exc:
+            log.warning(f"StateStore flush of {len(batch)} keys failed: {exc}")
+            if self._task is None:
+                self._task = asyncio.get_running_loop().create_task(self._flush_later())
+            return
+        finally:
+            self._writing = None
+        for key, value in batch.items():
+            if key in self._dirty and self._dirty[key] is value:
+                del self._dirty[key]
+        self.flushes += 1
+        self.writes += len(batch)
+
+    # -Instance Methods: Public
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._data.get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        self._data[key] = value
+        self._mark(key, value)
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+        self._mark(key, DELETED)
+
+    async def load(self, patterns: Iterable[str] = ('*',)) -> int:
+        '''Recover the keys matching the patterns from Redis, returns how many were read'''
+        keys = [key for pattern in patterns async for key in self.redis.scan_iter(match=pattern)]
+        found = dict(zip(keys, await self.redis.mget(keys))) if keys else {}
+        for key, value in found.items():
+            if value is not None and key not in self._dirty:
+                self._data[key] = value
+        return len(found)
+
+    async def flush(self) -> None:
+        '''Write the dirty keys now, after the write in flight; they stay dirty when it fails'''
+        while self._writing is not None:
+            await asyncio.wait((self._writing,))
+        if not self._dirty:
+            return
+        self._writing = asyncio.get_running_loop().create_task(self._commit(dict(self._dirty)))
+        # -Cancelling the caller leaves the write running, close() waits for it
+        await asyncio.shield(self._writing)
+
+    async def close(self) -> None:
+        '''Cancel the pending flush, wait for the write in flight and write everything still dirty'''
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+        if self._task is not None:
+            # -The final write failed: nothing will retry it after close
+            self._task.cancel()
+            self._task = None
+            log.error(f"StateStore closed with {len(self._dirty)} unwritten keys")
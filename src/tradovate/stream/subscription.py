@@ -0,0 +1,137 @@
+## Imports
+from __future__ import annotations
+import asyncio,itertools,logging
+from collections import OrderedDict, deque
+from enum import Enum
+from typing import Callable, Hashable
+
+## Constants
+log = logging.getLogger(__name__)
+
+
+## Functions
+def event_key(msg: dict) -> Hashable:
+    """Conflation key of an event: its type plus the first entity id"""
+    d = msg.get('d')
+    if isinstance(d, dict):
+        for field in ('quotes', 'doms', 'histograms', 'charts'):
+            items = d.get(field)
+            if items:
+                return msg.get('e'), field, items[0].get('contractId', items[0].get('id'))
+    return msg.get('e')
+
+
+## Classes
+class OVERFLOW(Enum):
+    """Subscription overflow policy Enum"""
+    BLOCK = 'block'                 # -Reader waits for room: backpressure
+    DROP_OLDEST = 'drop-oldest'     # -Oldest queued event is discarded
+    CONFLATE = 'conflate'           # -Only the latest event per key is kept
+
+
+class Subscription:
+    """Bounded queue of websocket events for one consumer"""
+
+    # -Constructor
+    def __init__(
+        self, maxsize: int = 1024, overflow: OVERFLOW = OVERFLOW.BLOCK, *,
+        key: Callable[[dict], Hashable] = event_key
+    ) -> Subscription:
+        self.maxsize: int = maxsize
+        self.overflow: OVERFLOW = overflow
+        self.dropped: int = 0
+        self.conflated: int = 0
+        self.closed: bool = False
+        self._key: Callable[[dict], Hashable] = key
+        self._items: deque | OrderedDict = (
+            OrderedDict() if overflow == OVERFLOW.CONFLATE else deque()
+        )
+        self._unique = itertools.count()
+        self._readable: asyncio.Event = asyncio.Event()
+        self._writable: asyncio.Event = asyncio.Event()
+        self._writable.set()
+
+    # -Dunder Methods
+    def __aiter__(self) -> Subscription:
+        return self
+
+    async def __anext__(self) -> list[dict]:
+        events = await self.get_many()
+        if events is None:
+            raise StopAsyncIteration
+        return events
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __repr__(self) -> str:
+        return (
+            f"Subscription(overflow={self.overflow.value}, size={len(self)}/"
+            f"{self.maxsize}, dropped={self.dropped}, conflated={self.conflated})"
+        )
+
+    # -Instance Methods: Private
+    def _dropped(self) -> None:
+        '''Count a discarded event, logged at the 1st, 2nd, 4th, 8th... drop'''
+        self.dropped += 1
+        if not self.dropped & (self.dropped - 1):
+            log.warning(f"{self!r} dropped {self.dropped} events, the consumer is behind")
+
+    def _put_conflate(self, msg: dict) -> None:
+        key = self._key(msg)
+        if key is None:
+            key = (None, next(self._unique))
+        if key in self._items:
+            self._items[key] = msg
+            self.conflated += 1
+            return
+        if len(self._items) >= self.maxsize:
+            self._items.popitem(last=False)
+            self._dropped()
+        self._items[key] = msg
+
+    # -Instance Methods: Public
+    def close(self) -> None:
+        '''Stop accepting events, consumers drain what is queued then stop'''
+        self.closed = True
+        self._readable.set()
+        self._writable.set()
+
+    async def get_many(self, limit: int | None = None) -> list[dict] | None:
+        '''Wait for events and take all queued ones, None once closed and drained'''
+        while not self._items:
+            if self.closed:
+                return None
+            self._readable.clear()
+            await self._readable.wait()
+        if self.overflow == OVERFLOW.CONFLATE:
+            n = len(self._items) if limit is None else min(limit, len(self._items))
+            events = [self._items.popitem(last=False)[1] for _ in range(n)]
+        elif limit is None or limit >= len(self._items):
+            events = list(self._items)
+            self._items.clear()
+        else:
+            events = [self._items.popleft() for _ in range(limit)]
+        self._writable.set()
+        return events
+
+    async def put(self, msg: dict) -> None:
+        '''Queue an event, applying the overflow policy when full'''
+        if self.closed:
+            return
+        if self.overflow == OVERFLOW.CONFLATE:
+            self._put_conflate(msg)
+        elif len(self._items) < self.maxsize:
+            self._items.append(msg)
+        elif self.overflow == OVERFLOW.DROP_OLDEST:
+            self._items.popleft()
+            self._items.append(msg)
+            self._dropped()
+        else:
+            while len(self._items) >= self.maxsize and not self.closed:
+                self._writable.clear()
+                await self._writable.wait()
+            if self.closed:
+                return
+            self._items.append(msg)
+        self._readable.set()
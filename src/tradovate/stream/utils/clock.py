@@ -0,0 +1,40 @@
+## Imports
+from __future__ import annotations
+import time
+from datetime import datetime, tzinfo
+
+
+## Classes
+class Clock:
+    """Wall clock read by the strategy, replaced to replay or backtest"""
+
+    # -Instance Methods: Public
+    def now(self, tz: tzinfo | None = None) -> datetime:
+        return datetime.now(tz)
+
+    def time(self) -> float:
+        return time.time()
+
+
+class SimulatedClock(Clock):
+    """Clock that only moves when set, e.g. to the time of a replayed frame"""
+
+    # -Constructor
+    def __init__(self, t: float = 0.0) -> SimulatedClock:
+        self.t: float = t
+
+    def __repr__(self) -> str:
+        return f"SimulatedClock({datetime.fromtimestamp(self.t).isoformat()})"
+
+    # -Instance Methods: Public
+    def advance(self, seconds: float) -> None:
+        self.t += seconds
+
+    def now(self, tz: tzinfo | None = None) -> datetime:
+        return datetime.fromtimestamp(self.t, tz)
+
+    def set(self, t: float) -> None:
+        self.t = t
+
+    def time(self) -> float:
+        return self.t
@@ -60,3 +60,46 @@ class WebSocketClosedException(Exception):
     # -Constructor
     def __init__(self, url: str) -> WebSocketOpenException:
         super().__init__(f"Connection with address: {url} has expired.")
+
+
+class WebSocketTimeoutException(WebSocketException):
+    """WebSocket exception for a request without a response in time"""
+
+    # -Constructor
+    def __init__(self, url: str, request: str, timeout: float) -> WebSocketTimeoutException:
+        super().__init__(
+            f"No response to '{request}' from address: {url} within {timeout} seconds."
+        )
+
+
+class OrderRejectedException(WebSocketException):
+    """WebSocket exception for an order request refused by the server"""
+
+    # -Constructor
+    def __init__(self, request: str, response: dict) -> OrderRejectedException:
+        self.response: dict = response
+        data = response.get('d')
+        reason = (
+            data.get('failureText') or data.get('failureReason')
+            if isinstance(data, dict) else data
+        )
+        super().__init__(
+            f"Order request '{request}' rejected with status {response.get('s')}: {reason}"
+        )
+
+
+class RiskRejectedException(Exception):
+    """Order refused by the local pre-trade risk checks before being sent"""
+
+    # -Constructor
+    def __init__(self, symbol: str, action: str, qty: int, reason: str) -> RiskRejectedException:
+        self.reason: str = reason
+        super().__init__(f"{action} {qty} {symbol} rejected by risk checks: {reason}")
+
+
+class RiskConfigurationException(Exception):
+    """Risk checks used before the account limits and contracts were loaded"""
+
+    # -Constructor
+    def __init__(self, message: str) -> RiskConfigurationException:
+        super().__init__(message)
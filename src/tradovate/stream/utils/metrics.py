@@ -0,0 +1,61 @@
+## Imports
+from __future__ import annotations
+import time
+
+
+## Classes
+class RateCounter:
+    """Running total with a per-second rate over a rolling window"""
+
+    # -Constructor
+    def __init__(self, window: float = 1.0) -> RateCounter:
+        self.window: float = window
+        self.total: int = 0
+        self.rate: float = 0.0
+        self._count: int = 0
+        self._start: float = time.monotonic()
+
+    def __repr__(self) -> str:
+        return f"RateCounter(total={self.total}, rate={self.rate:.1f}/s)"
+
+    # -Instance Methods: Public
+    def add(self, n: int = 1) -> None:
+        '''Count n occurrences, rolling the rate once per window'''
+        self.total += n
+        self._count += n
+        now = time.monotonic()
+        elapsed = now - self._start
+        if elapsed >= self.window:
+            self.rate = self._count / elapsed
+            self._count = 0
+            self._start = now
+
+
+class LatencyStats:
+    """Count, last, mean and max of a latency in seconds"""
+
+    # -Constructor
+    def __init__(self) -> LatencyStats:
+        self.count: int = 0
+        self.last: float = 0.0
+        self.max: float = 0.0
+        self._sum: float = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"LatencyStats(count={self.count}, last={self.last * 1e3:.2f}ms, "
+            f"mean={self.mean * 1e3:.2f}ms, max={self.max * 1e3:.2f}ms)"
+        )
+
+    # -Instance Methods: Public
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.last = seconds
+        self._sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    # -Properties
+    @property
+    def mean(self) -> float:
+        return self._sum / self.count if self.count else 0.0
@@ -29,6 +29,13 @@ http_auth_me = http_base_auth + "me"
 wss_auth = "authorize"
 # -User
 wss_user_sync = "user/syncrequest"
+# -Orders
+wss_order_place = "order/placeorder"
+wss_order_place_oco = "order/placeoco"
+wss_order_place_oso = "order/placeoso"
+wss_order_cancel = "order/cancelorder"
+wss_order_modify = "order/modifyorder"
+wss_order_liquidate = "order/liquidateposition"
 # -Market
 wss_market_sub = "md/subscribeQuote"
 wss_market_usub = "md/unsubscribeQuote"
@@ -0,0 +1,108 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from tradovate.stream.replay import FrameRecorder
+
+START = datetime(2022, 8, 1, tzinfo=timezone.utc)
+
+
+def stamp(i: int) -> str:
+    return (START + timedelta(minutes=5 * i)).strftime('%Y-%m-%dT%H:%MZ')
+
+
+def frame(bars: list[dict]) -> str:
+    return 'a' + json.dumps([{'e': 'chart', 'd': {'charts': [{'id': 1, 'bars': bars}]}}])
+
+
+def record(path: str, bars: int, seed: int) -> None:
+    '''240 bars of history, then live 5 minute bars updated a few times each'''
+    rng = np.random.default_rng(seed)
+    recorder = FrameRecorder(path)
+    price = 4000.0
+    history = []
+    for i in range(240):
+        close = price + rng.normal(0, 3)
+        history.append({
+            'timestamp': stamp(i), 'open': price, 'close': close,
+            'high': max(price, close) + abs(rng.normal(0, 1)),
+            'low': min(price, close) - abs(rng.normal(0, 1)),
+            'offerVolume': float(rng.integers(1, 100)),
+        })
+        price = close
+    recorder.write(frame(history), START.timestamp() + 240 * 300 - 5)
+    for i in range(240, 240 + bars):
+        high = low = close = open_ = price
+        volume = 0.0
+        for second in sorted(set(rng.integers(0, 300, 3).tolist()) | {298}):
+            close += rng.normal(0, 2.5)
+            high, low = max(high, close), min(low, close)
+            volume += float(rng.integers(1, 40))
+            recorder.write(frame([{
+                'timestamp': stamp(i), 'open': open_, 'high': high, 'low': low,
+                'close': close, 'offerVolume': volume,
+            }]), START.timestamp() + i * 300 + second + 0.25)
+        price = close
+    recorder.close()
+
+
+def replay(path: str):
+    '''Live strategy over the frame file through Client.replay, with its entries and exits'''
+    from tradovate.stream.client import Client
+
+    class Recording(Client):
+        @property
+        def _order(self):
+            return self.__dict__.get('order')
+
+        @_order.setter
+        def _order(self, value):
+            previous = self.__dict__.get('order')
+            if value is None and previous is not None and 'gain' in previous:
+                self.exits.append((self.clock.time(), previous['close'], previous['gain']))
+            self.__dict__['order'] = value
+
+    client = Recording()
+    client.exits = []
+    client.entries = []
+    client._start_times, client._end_times = ['0', '00'], ['23', '59']
+    set_ = client.state.set
+
+    def set_state(key, value):
+        if key.startswith(('es_order_', 'order_')):
+            order = json.loads(value)
+            client.entries.append((client.clock.time(), order['type'], order['close']))
+        set_(key, value)
+
+    client.state.set = set_state
+
+    async def main():
+        await client.replay(path, 'ES', 5, speed=None)
+        await client.state.close()
+        await client._session.close()
+
+    client._loop.run_until_complete(main())
+    client._loop.close()
+    return client
+
+
+@pytest.mark.parametrize('seed', [1, 2])
+def test_replay_and_backtest_agree(tmp_path, monkeypatch, seed):
+    from tradovate.stream import client as client_module
+    from tradovate.stream.backtest import Backtest
+
+    monkeypatch.setenv('REDIS_URL', 'memory://')
+    monkeypatch.setattr(client_module, 'print', lambda *args, **kwargs: None, raising=False)
+    path = str(tmp_path / 'es.frames.gz')
+    record(path, 400, seed)
+    live = replay(path)
+    result = Backtest('ES', 5, start_times='0:00', end_times='23:59').run_frames(path)
+
+    assert len(result.trades) >= 5
+    entries = sorted({(t.entry_time, t.side, t.entry_price) for t in result.trades})
+    assert live.entries == entries
+    assert live.exits == [(t.exit_time, t.exit_price, t.gain) for t in result.trades]
+    assert live._order == result.order
+    assert dict(live.state._data) == result.state
@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from tradovate.stream.bars import BAR_FIELDS, BarBuffer, BarStore, bar_timestamp
+
+START = datetime(2022, 8, 1, tzinfo=timezone.utc)
+
+
+def bar(minute: int, value: float) -> dict:
+    return {
+        'timestamp': (START + timedelta(minutes=minute)).strftime('%Y-%m-%dT%H:%MZ'),
+        'open': value, 'high': value + 1, 'low': value - 1, 'close': value + 0.5,
+        'offerVolume': value * 10,
+    }
+
+
+class ListModel:
+    """Reference: the last `capacity` bars by timestamp, later writes replacing earlier ones"""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.bars: dict[int, dict] = {}
+
+    def add(self, bar: dict) -> None:
+        self.bars[bar_timestamp(bar['timestamp'])] = bar
+        self.bars = dict(sorted(self.bars.items())[-self.capacity:])
+
+    def column(self, field: str) -> list[float]:
+        return [bar.get(field, 0.0) for bar in self.bars.values()]
+
+
+def assert_matches(buffer: BarBuffer, model: ListModel) -> None:
+    assert len(buffer) == len(model.bars)
+    assert buffer.timestamp.tolist() == list(model.bars)
+    for field in BAR_FIELDS:
+        column = buffer.column(field)
+        assert column.tolist() == model.column(field)
+        # -Zero-copy contiguous views into the mirrored ring, wrapped or not
+        assert column.flags.c_contiguous and not column.flags.writeable
+        assert np.shares_memory(column, buffer._columns)
+    if model.bars:
+        assert buffer.last_timestamp == list(model.bars)[-1]
+        assert buffer.record(-1)['timestamp'] == list(model.bars.values())[-1]['timestamp']
+
+
+def test_append_new_bars_and_overwrite_live_bar():
+    buffer, model = BarBuffer(4), ListModel(4)
+    assert buffer.append(bar(0, 1.0)) is True
+    assert buffer.append(bar(5, 2.0)) is True
+    assert buffer.append(bar(5, 2.5)) is False
+    for b in (bar(0, 1.0), bar(5, 2.0), bar(5, 2.5)):
+        model.add(b)
+    assert_matches(buffer, model)
+    assert buffer.rebuilds == 0
+
+
+def test_capacity_evicts_oldest_and_wraps():
+    buffer, model = BarBuffer(5), ListModel(5)
+    for i in range(23):
+        buffer.append(bar(5 * i, float(i)))
+        model.add(bar(5 * i, float(i)))
+        assert_matches(buffer, model)
+    assert buffer.full and buffer.rebuilds == 0
+
+
+def test_extend_out_of_order_history_rebuilds_once():
+    buffer, model = BarBuffer(6), ListModel(6)
+    for i in range(5, 10):
+        buffer.append(bar(5 * i, float(i)))
+        model.add(bar(5 * i, float(i)))
+    history = [bar(5 * i, 100.0 + i) for i in (3, 0, 7, 4, 1)]
+    buffer.extend(history)
+    for b in sorted(history, key=lambda b: b['timestamp']):
+        model.add(b)
+    assert buffer.rebuilds == 1
+    assert_matches(buffer, model)
+
+
+def test_late_bar_appended_out_of_order():
+    buffer, model = BarBuffer(4), ListModel(4)
+    for i in (0, 2, 3):
+        buffer.append(bar(5 * i, float(i)))
+        model.add(bar(5 * i, float(i)))
+    assert buffer.append(bar(5, 1.0)) is False
+    model.add(bar(5, 1.0))
+    assert_matches(buffer, model)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random_operations_match_list_model(seed):
+    rng = np.random.default_rng(seed)
+    buffer, model = BarBuffer(16), ListModel(16)
+    minute = 0
+    for _ in range(400):
+        op = rng.random()
+        if op < 0.5 or not model.bars:
+            minute += 5
+            b = bar(minute, float(rng.normal()))
+            buffer.append(b)
+        elif op < 0.8:
+            b = bar(minute, float(rng.normal()))
+            assert buffer.append(b) is False
+        else:
+            bars = [bar(5 * int(m), float(rng.normal())) for m in rng.integers(0, minute // 5 + 1, 3)]
+            buffer.extend(bars)
+            for b in sorted(bars, key=lambda b: b['timestamp']):
+                model.add(b)
+            assert_matches(buffer, model)
+            continue
+        model.add(b)
+        assert_matches(buffer, model)
+
+
+def test_bar_store_keys_buffers():
+    store = BarStore(8)
+    assert store.get('ES', 5) is store.get('ES', 5)
+    assert ('ES', 5) in store and ('ES', 1) not in store
+    store.remove('ES', 5)
+    assert ('ES', 5) not in store
@@ -0,0 +1,108 @@
+import asyncio
+import time
+
+from tradovate.bulk import BulkResult, RateLimiter, bulk, penalty
+
+
+class FakeCall:
+    """Request stand-in recording concurrency, kwargs and cancellations"""
+
+    def __init__(self, delay: float = 0.01, responses: list | None = None) -> None:
+        self.delay = delay
+        self.responses = responses or []
+        self.active = 0
+        self.peak = 0
+        self.calls: list[tuple] = []
+        self.cancelled = 0
+        self.times: list[float] = []
+
+    async def __call__(self, key, **extra):
+        self.calls.append((key, extra))
+        self.times.append(time.monotonic())
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.active -= 1
+        response = self.responses.pop(0) if self.responses else {'id': key}
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def keyed(self, keys) -> list[tuple]:
+        return [(key, lambda key=key, **extra: self(key, **extra)) for key in keys]
+
+
+async def collect(calls, **kwargs) -> list[BulkResult]:
+    return [result async for result in bulk(calls, **kwargs)]
+
+
+class TicketError(Exception):
+    def __init__(self, response) -> None:
+        self.response = response
+
+
+def test_concurrency_cap():
+    call = FakeCall()
+    results = asyncio.run(collect(call.keyed(range(20)), concurrency=3))
+    assert sorted(result.key for result in results) == list(range(20))
+    assert all(result.ok and result.data == {'id': result.key} for result in results)
+    assert call.peak == 3
+
+
+def test_errors_yielded_not_raised():
+    call = FakeCall(responses=[RuntimeError('boom')])
+    results = asyncio.run(collect(call.keyed([1]), concurrency=1))
+    assert not results[0].ok and isinstance(results[0].error, RuntimeError)
+
+
+def test_token_bucket_paces_calls():
+    call = FakeCall(delay=0)
+    limiter = RateLimiter(rate=50, burst=2)
+    start = time.monotonic()
+    asyncio.run(collect(call.keyed(range(6)), concurrency=6, limiter=limiter))
+    # -2 from the burst, then never more than one token per 20ms
+    assert time.monotonic() - start >= 0.075
+    assert all(at - start >= (i - 1) / 50 - 0.002 for i, at in enumerate(call.times))
+    assert limiter.waited > 0
+
+
+def test_p_ticket_pauses_limiter_and_retries():
+    ticket = {'s': 200, 'd': {'p-ticket': 'T1', 'p-time': 0.1}}
+    call = FakeCall(delay=0, responses=[ticket])
+    limiter = RateLimiter(rate=1000, burst=1000)
+    start = time.monotonic()
+    results = asyncio.run(collect(call.keyed(['a', 'b']), concurrency=1, limiter=limiter))
+    assert [call_[1] for call_ in call.calls] == [{}, {'p-ticket': 'T1'}, {}]
+    assert call.times[1] - start >= 0.095 and call.times[2] - start >= 0.095
+    assert [result.data for result in results] == [{'id': 'a'}, {'id': 'b'}]
+
+
+def test_p_ticket_exception_retried_once():
+    error = TicketError({'p-ticket': 'T2', 'p-time': 0})
+    call = FakeCall(delay=0, responses=[error, error])
+    results = asyncio.run(collect(call.keyed(['a']), limiter=RateLimiter()))
+    assert [call_[1] for call_ in call.calls] == [{}, {'p-ticket': 'T2'}]
+    assert results[0].error is error
+    assert penalty(error) == ('T2', 0.0)
+
+
+def test_early_stop_awaits_cancelled_calls():
+    call = FakeCall(delay=0.05)
+
+    async def run():
+        calls = call.keyed(range(5))
+        calls[0] = (0, lambda **extra: asyncio.sleep(0, {'id': 0}))
+        results = bulk(calls, concurrency=5)
+        async for result in results:
+            break
+        await results.aclose()
+        # -Checked before asyncio.run cancels and drains leftover tasks
+        assert call.cancelled == 4 and call.active == 0
+        return result
+
+    assert asyncio.run(run()).key == 0
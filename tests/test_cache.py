@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from tradovate import cache as cache_module
+from tradovate.cache import TTLCache, is_missing
+
+
+class Clock:
+    """time.monotonic stand-in advanced by hand"""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, 'monotonic', clock)
+    return clock
+
+
+@pytest.mark.parametrize('value, missing', [
+    (None, True), ({}, True), ([], False), (0, False), ('', False),
+    ({'id': 1}, False), ({'errorText': 'Not found'}, False),
+])
+def test_is_missing(value, missing):
+    assert is_missing(value) is missing
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(10)
+    cache.set('a', {'id': 1})
+    clock.now += 10
+    assert cache.get('a') == {'id': 1}
+    clock.now += 0.1
+    assert cache.get('a', 'expired') == 'expired'
+
+
+def test_lru_eviction(clock):
+    cache = TTLCache(10, maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c'), len(cache)) == (1, 3, 2)
+
+
+@pytest.mark.parametrize('value', [None, {}])
+def test_misses_use_negative_ttl(clock, value):
+    cache = TTLCache(3600, negative_ttl=30)
+    cache.set('a', value)
+    clock.now += 30
+    assert 'a' in cache._entries and cache.get('a', 'expired') == value
+    clock.now += 1
+    assert cache.get('a', 'expired') == 'expired'
+
+
+def test_empty_list_keeps_full_ttl(clock):
+    cache = TTLCache(3600, negative_ttl=30)
+    cache.set('a', [])
+    clock.now += 60
+    assert cache.get('a', 'expired') == []
+
+
+def test_errors_not_cached(clock):
+    cache = TTLCache(3600)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        return {'errorText': 'Too many requests'}
+
+    async def run():
+        await cache.get_or_load('a', load)
+        return await cache.get_or_load('a', load)
+
+    assert asyncio.run(run()) == {'errorText': 'Too many requests'}
+    assert len(calls) == 2 and len(cache) == 0
+
+
+def test_single_flight_load():
+    cache = TTLCache(10)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {'id': 1}
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_load('a', load) for _ in range(5)))
+
+    assert asyncio.run(run()) == [{'id': 1}] * 5
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (0, 5)
+    assert cache._loading == {}
+
+
+def test_failed_load_not_cached():
+    cache = TTLCache(10)
+
+    async def fail():
+        raise RuntimeError('boom')
+
+    async def run():
+        results = await asyncio.gather(
+            cache.get_or_load('a', fail), cache.get_or_load('a', fail),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, RuntimeError) for result in results)
+        return await cache.get_or_load('a', lambda: asyncio.sleep(0, {'id': 2}))
+
+    assert asyncio.run(run()) == {'id': 2}
@@ -0,0 +1,140 @@
+import math
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from tradovate.stream import fractals
+from tradovate.stream.bars import BarBuffer
+from tradovate.stream.fractals import FractalDownZone, fractal_down_zone, fractal_down_zones
+from tradovate.stream.indicators import WMA, wma
+
+START = datetime(2022, 8, 1, tzinfo=timezone.utc)
+
+
+def reference(support, datas, cnt=0, max_count=12, wma_vol=None):
+    '''The former recursive f_calcFractalDownZone, one bar dropped per step'''
+    low = datas['low']
+    down = (
+        low[-4] < low[-5] and low[-5] < low[-6] and low[-3] > low[-4]
+        and low[-2] > low[-3] and datas['offerVolume'][-4] > wma_vol[-4 - cnt]
+    )
+    if down and datas['close'][-4] >= datas['open'][-4]:
+        return datas['open'][-4]
+    if down and datas['close'][-4] < datas['open'][-4]:
+        return datas['close'][-4]
+    cnt = cnt + 1
+    if cnt < max_count:
+        return reference(
+            support, {field: column[:-1] for field, column in datas.items()},
+            cnt, max_count, wma_vol
+        )
+    return support
+
+
+def random_bars(seed: int, n: int) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    # -Coarse lows with a V shape, i.e. a fractal low candidate, planted every few bars
+    low = 4000.0 + rng.integers(-8, 8, n) * 0.25
+    for pivot in range(2, n - 2, 7):
+        low[pivot - 2:pivot + 3] = low[pivot] + np.array([2.0, 1.0, 0.0, 1.0, 2.0])
+    open_ = low + rng.integers(0, 8, n) * 0.25
+    close = low + rng.integers(0, 8, n) * 0.25
+    return {
+        'open': open_, 'close': close, 'low': low,
+        'offerVolume': rng.integers(1, 100, n).astype(np.float64),
+    }
+
+
+def zone(datas, support, max_count, wma_volume):
+    return fractal_down_zone(
+        datas['open'], datas['close'], datas['low'], datas['offerVolume'],
+        wma_volume, support, max_count
+    )
+
+
+def same(a: float, b: float) -> bool:
+    return (math.isnan(a) and math.isnan(b)) or a == b
+
+
+@pytest.mark.parametrize('max_count', [1, 12])
+@pytest.mark.parametrize('seed', range(20))
+def test_matches_recursive_reference(seed, max_count):
+    datas = random_bars(seed, 60)
+    wma_volume = wma(datas['offerVolume'], 6)
+    found = 0
+    for end in range(max_count + 6, 61):
+        window = {field: column[:end] for field, column in datas.items()}
+        expected = reference(-1.0, window, 0, max_count, wma_volume[:end])
+        # -Full aligned average, and the short tail the streaming path passes
+        assert zone(window, -1.0, max_count, wma_volume[:end]) == expected
+        assert zone(window, -1.0, max_count, wma_volume[:end][-(max_count + 6):]) == expected
+        found += expected != -1.0
+    assert found
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_whole_history_pass_matches_reference(seed):
+    datas = random_bars(seed, 200)
+    wma_volume = wma(datas['offerVolume'], 6)
+    zones = fractal_down_zones(
+        datas['open'], datas['close'], datas['low'], datas['offerVolume'], wma_volume
+    )
+    assert np.isnan(zones[:2]).all() and np.isnan(zones[-2:]).all()
+    # -Pivot i is bar -4 of the window ending at bar i + 3
+    for i in range(2, 197):
+        window = {field: column[:i + 4] for field, column in datas.items()}
+        expected = reference(math.nan, window, 0, 1, wma_volume[:i + 4])
+        assert same(float(zones[i]), expected), i
+    assert not np.isnan(zones).all()
+
+
+def bar(i: int, datas: dict, low: float | None = None) -> dict:
+    return {
+        'timestamp': (START + timedelta(minutes=5 * i)).strftime('%Y-%m-%dT%H:%MZ'),
+        'open': float(datas['open'][i]), 'close': float(datas['close'][i]),
+        'low': float(datas['low'][i]) if low is None else low,
+        'high': float(datas['open'][i]) + 2, 'offerVolume': float(datas['offerVolume'][i]),
+    }
+
+
+def test_streaming_rescans_only_on_new_bar_or_rebuild(monkeypatch):
+    datas = random_bars(3, 80)
+    scans = []
+    scan = fractals.fractal_down_zone
+    monkeypatch.setattr(fractals, 'fractal_down_zone', lambda *a: scans.append(a) or scan(*a))
+
+    buffer, volume, streaming = BarBuffer(64), WMA(6), FractalDownZone(12)
+
+    def check(support=-1.0):
+        value = streaming.update(buffer, volume, support)
+        columns = {field: np.array(buffer.column(field)) for field in datas}
+        if len(buffer) < 18:
+            return value
+        assert value == reference(support, columns, 0, 12, wma(columns['offerVolume'], 6))
+        return value
+
+    for i in range(40):
+        buffer.append(bar(i, datas))
+        volume.update(float(datas['offerVolume'][i]))
+        check()
+    assert len(scans) == 39
+
+    # -Revising the live bar keeps the cache key (timestamp[-2], rebuilds)
+    key = streaming._key
+    for low in (3990.0, 4010.0):
+        buffer.append(bar(39, datas, low))
+        check()
+    assert streaming._key == key and len(scans) == 39
+
+    # -A finalized bar moves timestamp[-2]
+    buffer.append(bar(40, datas))
+    volume.update(float(datas['offerVolume'][40]))
+    check()
+    assert len(scans) == 40
+
+    # -A rebuild keeps timestamp[-2] but bumps rebuilds
+    buffer.extend([bar(5, datas, 3000.0)])
+    key = (int(buffer.timestamp[-2]), buffer.rebuilds)
+    check()
+    assert streaming._key == key and len(scans) == 41
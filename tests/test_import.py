@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+
+def run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, 'PYTHONPATH': SRC}
+    return subprocess.run(
+        [sys.executable, *flags, '-c', code], env=env,
+        capture_output=True, text=True, check=True,
+    )
+
+
+def test_import_leaves_heavy_dependencies_unloaded():
+    out = run(
+        "import sys, tradovate; "
+        "print(','.join(m for m in ('pandas', 'numpy', 'aiohttp') if m in sys.modules))"
+    )
+    assert out.stdout.strip() == ''
+
+
+# -Cumulative import time of the package: about 0.5 ms here, numpy alone takes ~80 ms
+IMPORT_BUDGET_US = 50_000
+
+
+def importtime() -> dict[str, int]:
+    '''Cumulative microseconds of every module imported by `import tradovate`, outermost wins'''
+    err = run('import tradovate', '-X', 'importtime').stderr
+    cumulative = {}
+    for line in err.splitlines()[1:]:
+        _, total, name = line.split('|')
+        package = name.strip().split('.')[0]
+        cumulative[package] = max(int(total), cumulative.get(package, 0))
+    return cumulative
+
+
+def test_importtime_within_budget():
+    runs = [importtime() for _ in range(3)]
+    assert all('tradovate' in run_ for run_ in runs)
+    assert not set(runs[0]) & {'pandas', 'numpy', 'aiohttp'}
+    # -Best of three, so a busy CI machine does not fail the budget
+    assert min(run_['tradovate'] for run_ in runs) < IMPORT_BUDGET_US
+
+
+def test_lazy_attribute_loads_its_module():
+    out = run("import sys, tradovate; tradovate.Contract_Library; print('tradovate.contractLibrary' in sys.modules)")
+    assert out.stdout.strip() == 'True'
@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from tradovate.stream.indicators import EMA, RSI, WMA, rsi, wma
+
+
+# -Reference formulas, as pandas_ta computes them
+def ref_wma(values, length):
+    weights = np.arange(1, length + 1, dtype=float)
+    return pd.Series(values).rolling(length).apply(
+        lambda window: np.dot(window, weights) / weights.sum(), raw=True
+    ).to_numpy()
+
+
+def ref_ema(values, length):
+    series = pd.Series(values)
+    seeded = series.copy()
+    seeded.iloc[:length - 1] = np.nan
+    seeded.iloc[length - 1] = series.iloc[:length].mean()
+    ema = seeded.iloc[length - 1:].ewm(span=length, adjust=False).mean()
+    return pd.concat([seeded.iloc[:length - 1], ema]).to_numpy()
+
+
+def ref_rsi(values, length):
+    change = pd.Series(values).diff()
+    gain = change.clip(lower=0)
+    loss = change.clip(upper=0).abs()
+    gain = gain.ewm(alpha=1 / length, min_periods=length).mean()
+    loss = loss.ewm(alpha=1 / length, min_periods=length).mean()
+    return (100 * gain / (gain + loss)).to_numpy()
+
+
+REFERENCES = {WMA: ref_wma, EMA: ref_ema, RSI: ref_rsi}
+CASES = [(WMA, 6), (WMA, 13), (WMA, 200), (EMA, 9), (EMA, 20), (RSI, 9), (RSI, 14)]
+
+
+@pytest.fixture
+def closes():
+    return 4000.0 + np.cumsum(np.random.default_rng(0).normal(0.0, 2.0, 700))
+
+
+def stream(cls, length, values):
+    indicator = cls(length, depth=len(values))
+    return np.array([indicator.update(float(value)) for value in values]), indicator
+
+
+@pytest.mark.parametrize('cls,length', CASES)
+def test_update_matches_reference(cls, length, closes):
+    '''Every output, warm-up NaNs included, and for WMA several exact-recompute laps'''
+    outputs, indicator = stream(cls, length, closes)
+    expected = REFERENCES[cls](closes, length)
+    np.testing.assert_array_equal(np.isnan(outputs), np.isnan(expected))
+    np.testing.assert_allclose(outputs, expected, rtol=0, atol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(indicator.tail(len(closes)), outputs, equal_nan=True)
+
+
+@pytest.mark.parametrize('cls,length', CASES)
+def test_revise_matches_reference(cls, length, closes):
+    '''Revising the live bar gives the output of the final value, at every position'''
+    indicator = cls(length, depth=len(closes))
+    expected = REFERENCES[cls](closes, length)
+    rng = np.random.default_rng(1)
+    for i, value in enumerate(closes):
+        indicator.update(float(value) + rng.normal(0.0, 3.0))
+        indicator.revise(float(value) + rng.normal(0.0, 3.0))
+        output = indicator.revise(float(value))
+        if np.isnan(expected[i]):
+            assert np.isnan(output), i
+        else:
+            assert output == pytest.approx(expected[i], abs=1e-9), i
+
+
+@pytest.mark.parametrize('length', [6, 13])
+def test_wma_lap_boundary(length, closes):
+    '''Updates and revisions straddling the once-per-lap recompute stay exact'''
+    indicator = WMA(length)
+    expected = ref_wma(closes, length)
+    for i, value in enumerate(closes[:5 * length + 1]):
+        indicator.update(float(value))
+        if (i + 1) % length in (0, 1) and i >= length:
+            indicator.revise(float(value) + 10.0)
+            assert indicator.revise(float(value)) == pytest.approx(expected[i], abs=1e-9)
+        assert indicator.value == pytest.approx(expected[i], abs=1e-9, nan_ok=True)
+
+
+@pytest.mark.parametrize('cls,length', CASES)
+def test_seed_matches_update(cls, length, closes):
+    indicator = cls(length)
+    indicator.seed(closes)
+    assert indicator.value == pytest.approx(REFERENCES[cls](closes, length)[-1], abs=1e-9)
+    assert len(indicator) == len(closes)
+
+
+@pytest.mark.parametrize('length', [1, 6, 200, 701])
+def test_vectorized_wma(length, closes):
+    np.testing.assert_allclose(
+        wma(closes, length), ref_wma(closes, length), rtol=0, atol=1e-9, equal_nan=True
+    )
+
+
+@pytest.mark.parametrize('length', [9, 14])
+def test_vectorized_rsi(length, closes):
+    long = 4000.0 + np.cumsum(np.random.default_rng(2).normal(0.0, 2.0, 20_000))
+    for values in (closes, long, np.full(50, 4000.0)):
+        np.testing.assert_allclose(
+            rsi(values, length), ref_rsi(values, length), rtol=0, atol=1e-9, equal_nan=True
+        )
+
+
+def test_indexing():
+    indicator = WMA(3, depth=4)
+    assert np.isnan(indicator.value)
+    for value in (1.0, 2.0, 3.0, 4.0, 5.0, 6.0):
+        indicator.update(value)
+    assert indicator[-1] == pytest.approx((4 + 10 + 18) / 6)
+    assert indicator[-4] == pytest.approx((1 + 4 + 9) / 6)
+    with pytest.raises(IndexError):
+        indicator[-5]
@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+
+from tradovate.auth.session import Session
+from tradovate.contractLibrary import Contract_Library
+from tradovate.loader import ItemLoader
+
+
+class FakeGet:
+    """items endpoint stand-in recording each URL, returns the known ids"""
+
+    def __init__(self, known=range(100), error: Exception | None = None) -> None:
+        self.urls: list[str] = []
+        self.known = set(known)
+        self.error = error
+
+    async def __call__(self, url: str):
+        self.urls.append(url)
+        await asyncio.sleep(0)
+        if self.error is not None:
+            raise self.error
+        ids = [int(id) for id in url.split('ids=')[1].split(',')]
+        return [{'id': id, 'name': f"C{id}"} for id in ids if id in self.known]
+
+    def ids(self, i: int = 0) -> list[int]:
+        return [int(id) for id in self.urls[i].split('ids=')[1].split(',')]
+
+
+def test_concurrent_loads_batched():
+    get = FakeGet()
+    loader = ItemLoader('contract', get)
+
+    async def run():
+        return await asyncio.gather(*(loader.load(id) for id in (3, 1, 2)))
+
+    assert [item['id'] for item in asyncio.run(run())] == [3, 1, 2]
+    assert get.urls == ['contract/items?ids=3,1,2']
+    assert loader.requests == 1 and loader.loads == 3
+
+
+def test_repeated_ids_deduplicated():
+    get = FakeGet()
+    loader = ItemLoader('contract', get)
+
+    async def run():
+        return await asyncio.gather(loader.load(1), loader.load('1'), loader.load(2), loader.load(1))
+
+    items = asyncio.run(run())
+    assert get.ids() == [1, 2]
+    assert items[0] is items[1] is items[3]
+    assert loader.loads == 4
+
+
+def test_missing_id_resolves_none():
+    get = FakeGet(known=[1])
+    loader = ItemLoader('contract', get)
+    assert asyncio.run(loader.load_many([1, 5])) == [{'id': 1, 'name': 'C1'}, None]
+
+
+def test_error_reaches_every_waiter():
+    get = FakeGet(error=RuntimeError('boom'))
+    loader = ItemLoader('contract', get)
+
+    async def run():
+        return await asyncio.gather(
+            loader.load(1), loader.load(1), loader.load(2), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert len(get.urls) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_later_ticks_get_new_requests():
+    get = FakeGet()
+    loader = ItemLoader('contract', get)
+
+    async def run():
+        await loader.load(1)
+        await loader.load(1)
+
+    asyncio.run(run())
+    assert get.urls == ['contract/items?ids=1', 'contract/items?ids=1']
+
+
+def test_window_collects_across_ticks():
+    get = FakeGet()
+    loader = ItemLoader('contract', get, window=0.01)
+
+    async def run():
+        first = asyncio.ensure_future(loader.load(1))
+        await asyncio.sleep(0)
+        return await asyncio.gather(first, loader.load(2))
+
+    asyncio.run(run())
+    assert get.urls == ['contract/items?ids=1,2']
+
+
+@pytest.mark.parametrize('max_url_length', [25, 40])
+def test_chunks_respect_url_length(max_url_length):
+    get = FakeGet()
+    loader = ItemLoader('contract', get, max_url_length=max_url_length)
+    items = asyncio.run(loader.load_many(range(10, 30)))
+    assert [item['id'] for item in items] == list(range(10, 30))
+    assert len(get.urls) > 1
+    assert all(len(url) <= max_url_length for url in get.urls)
+    assert sorted(id for i in range(len(get.urls)) for id in get.ids(i)) == list(range(10, 30))
+
+
+def test_session_item_calls_share_one_request():
+    get = FakeGet()
+
+    async def run():
+        session = Session(loop=asyncio.get_running_loop())
+        session.get = get
+        library = Contract_Library(session)
+        return await asyncio.gather(
+            library.contract_item(4), library.contract_item(5), library.contract_item(4)
+        )
+
+    items = asyncio.run(run())
+    assert [item['id'] for item in items] == [4, 5, 4]
+    assert get.urls == ['contract/items?ids=4,5']
@@ -0,0 +1,119 @@
+from types import MappingProxyType
+
+import pytest
+
+from tradovate.stream.oms import OMS, Table
+
+
+def event(entity_type: str, entity: dict, event_type: str = 'Created') -> dict:
+    return {'entityType': entity_type, 'eventType': event_type, 'entity': entity}
+
+
+def order(id_: int, status: str = 'Working', account_id: int = 1, contract_id: int = 10, **fields) -> dict:
+    return {'id': id_, 'accountId': account_id, 'contractId': contract_id, 'ordStatus': status, **fields}
+
+
+SNAPSHOT = {
+    'orders': [order(1), order(2, 'Filled')],
+    'orderVersions': [{'id': 11, 'orderId': 1, 'clOrdId': 'a', 'orderQty': 2}],
+    'fills': [{'id': 21, 'orderId': 2, 'contractId': 10, 'qty': 1}],
+    'positions': [{'id': 31, 'accountId': 1, 'contractId': 10, 'netPos': 1}],
+}
+
+
+def test_apply_sync_loads_snapshot():
+    oms = OMS()
+    oms.apply_sync(SNAPSHOT)
+    assert (len(oms.orders), len(oms.fills), len(oms.positions)) == (2, 1, 1)
+    assert list(oms.working_orders()) == [1]
+    assert oms.order(cl_ord_id='a')['id'] == 1
+    assert oms.position(1, 10)['netPos'] == 1
+
+
+def test_apply_sync_replace_drops_old_entities():
+    oms = OMS()
+    oms.apply(event('order', order(5)))
+    oms.apply_sync(SNAPSHOT)
+    assert 5 not in oms.orders
+    assert sorted(oms.working_orders(account_id=1)) == [1]
+
+
+def test_apply_sync_merge_keeps_old_entities():
+    oms = OMS()
+    oms.apply(event('order', order(5)))
+    oms.apply(event('order', order(1, 'Filled')))
+    oms.apply_sync(SNAPSHOT, replace=False)
+    assert sorted(oms.orders.rows) == [1, 2, 5]
+    # -The snapshot wins for entities it holds
+    assert sorted(oms.working_orders(account_id=1)) == [1, 5]
+
+
+def test_orders_move_in_and_out_of_working():
+    oms = OMS()
+    assert oms.apply(event('order', order(1, 'PendingNew'))) == 'order'
+    assert list(oms.working_orders(1, 10)) == [1]
+    oms.apply(event('order', order(1, 'Filled'), 'Updated'))
+    assert len(oms.working) == 0 and oms.working_orders(1, 10) == {}
+    assert oms.orders.get(1)['ordStatus'] == 'Filled'
+    oms.apply(event('order', order(1, 'Working', contract_id=20), 'Updated'))
+    assert list(oms.working_orders(contract_id=20)) == [1]
+    assert oms.working_orders(contract_id=10) == {}
+
+
+def test_cl_ord_id_learned_from_order_version():
+    oms = OMS()
+    oms.apply(event('order', order(1)))
+    assert oms.order(cl_ord_id='a') is None
+    oms.apply(event('orderVersion', {'id': 11, 'orderId': 1, 'clOrdId': 'a'}))
+    assert oms.order(cl_ord_id='a')['id'] == 1
+    assert oms.working.get(1)['clOrdId'] == 'a'
+    # -An order update without clOrdId keeps the learned one
+    oms.apply(event('order', order(1, 'Filled'), 'Updated'))
+    assert oms.order(cl_ord_id='a')['ordStatus'] == 'Filled'
+
+
+def test_version_before_order_sets_cl_ord_id():
+    oms = OMS()
+    oms.apply(event('orderVersion', {'id': 11, 'orderId': 1, 'clOrdId': 'a'}))
+    oms.apply(event('order', order(1)))
+    assert oms.order(cl_ord_id='a')['id'] == 1
+
+
+def test_deleted_events_remove_entities():
+    oms = OMS()
+    oms.apply(event('order', order(1)))
+    oms.apply(event('fill', {'id': 21, 'orderId': 1, 'contractId': 10}))
+    oms.apply(event('order', {'id': 1}, 'Deleted'))
+    oms.apply(event('fill', {'id': 21}, 'Deleted'))
+    assert 1 not in oms.orders and len(oms.working) == 0
+    assert oms.orders.by('accountId', 1) == {}
+    assert oms.fills.by('orderId', 1) == {}
+    assert oms.events == 4
+
+
+def test_untracked_events_ignored():
+    oms = OMS()
+    assert oms.apply(event('cashBalance', {'id': 1})) is None
+    assert oms.apply(event('order', {'accountId': 1})) is None
+    assert oms.events == 0
+
+
+def test_by_returns_read_only_view():
+    table = Table('accountId')
+    table.upsert({'id': 1, 'accountId': 7})
+    view = table.by('accountId', 7)
+    assert isinstance(view, MappingProxyType) and dict(view) == {1: {'id': 1, 'accountId': 7}}
+    with pytest.raises(TypeError):
+        view[2] = {'id': 2, 'accountId': 7}
+    with pytest.raises(TypeError):
+        table.by('accountId', 8)[1] = {}
+    assert table.by('accountId', 7) == {1: {'id': 1, 'accountId': 7}}
+
+
+def test_working_orders_read_only():
+    oms = OMS()
+    oms.apply(event('order', order(1)))
+    with pytest.raises(TypeError):
+        oms.working_orders()[2] = order(2)
+    with pytest.raises(TypeError):
+        del oms.working_orders(1)[1]
@@ -0,0 +1,192 @@
+import asyncio
+import json
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from tradovate.orders import Orders
+from tradovate.stream.oms import OMS
+from tradovate.stream.orders import OrderEntry, encode_number
+from tradovate.stream.risk import RiskGate
+from tradovate.stream.utils.errors import RiskRejectedException
+
+
+def entry() -> OrderEntry:
+    return OrderEntry(None, 1, 'DEMO1', is_automated=True)
+
+
+def pairs(body: str) -> list[tuple]:
+    return json.loads(body, object_pairs_hook=list)
+
+
+def test_body_matches_plain_json():
+    body = entry().order_body('Buy', 'ESZ6', 2, 'Limit', price=4500.25, cl_ord_id='a')
+    assert json.loads(body) == {
+        'accountSpec': 'DEMO1', 'accountId': 1, 'action': 'Buy', 'symbol': 'ESZ6',
+        'orderType': 'Limit', 'isAutomated': True, 'orderQty': 2,
+        'price': 4500.25, 'clOrdId': 'a',
+    }
+
+
+def test_fields_override_template_keys_once():
+    orders = entry()
+    orders.order_body('Buy', 'ESZ6', 1, 'Limit', price=4500.25)
+    body = orders.order_body(
+        'Buy', 'ESZ6', 1, 'Limit', price=4500.25, isAutomated=False, orderQty=3
+    )
+    keys = [key for key, _ in pairs(body)]
+    assert len(keys) == len(set(keys))
+    assert json.loads(body)['isAutomated'] is False
+    assert json.loads(body)['orderQty'] == 3
+    # -The cached template is left untouched
+    assert json.loads(orders.order_body('Buy', 'ESZ6', 1, 'Limit'))['isAutomated'] is True
+
+
+def test_template_keys_overridden():
+    fields = {
+        'accountSpec': 'X', 'accountId': 2, 'orderType': 'Market',
+        'timeInForce': 'Day', 'isAutomated': False,
+    }
+    body = entry().order_body('Buy', 'ESZ6', 1, 'Limit', **fields)
+    assert json.loads(body) == {**fields, 'action': 'Buy', 'symbol': 'ESZ6', 'orderQty': 1}
+
+
+@pytest.mark.parametrize('value, text', [
+    (3, '3'),
+    (np.int64(3), '3'),
+    (4500.25, '4500.25'),
+    (np.float64(4500.25), '4500.25'),
+    (np.float32(0.5), '0.5'),
+    (Decimal('4500.25'), '4500.25'),
+])
+def test_encode_number_keeps_value(value, text):
+    assert encode_number(value) == text
+
+
+@pytest.mark.parametrize('value', [float('nan'), float('inf'), Decimal('NaN')])
+def test_encode_number_rejects_non_finite(value):
+    with pytest.raises(ValueError):
+        encode_number(value)
+
+
+@pytest.mark.parametrize('value', [True, '1', None])
+def test_encode_number_rejects_non_numbers(value):
+    with pytest.raises(TypeError):
+        encode_number(value)
+
+
+def test_decimal_price_not_truncated():
+    body = entry().order_body('Buy', 'ESZ6', 1, 'Limit', price=Decimal('4500.25'))
+    assert json.loads(body)['price'] == 4500.25
+
+
+def gate() -> RiskGate:
+    risk = RiskGate()
+    risk.set_contract(1, 'ESZ6')
+    risk.set_limits(
+        [{'id': 5, 'accountId': 1, 'contractId': 1, 'longLimit': 3, 'shortLimit': 3}],
+        [{'userAccountPositionLimitId': 5, 'maxOpeningOrderQty': 2}],
+    )
+    return risk
+
+
+class SentSocket:
+    """Account WebSocket stand-in recording request bodies"""
+
+    def __init__(self) -> None:
+        self.sent: list[dict] = []
+
+    async def request(self, url, body=None, **kwargs):
+        self.sent.append(json.loads(body))
+        return {'s': 200, 'd': {'orderId': 10}}
+
+
+def modify_entry(clip: bool = False) -> tuple[OrderEntry, SentSocket]:
+    oms = OMS()
+    oms.apply({'entityType': 'order', 'eventType': 'Created', 'entity': {
+        'id': 10, 'accountId': 1, 'contractId': 1, 'action': 'Buy', 'ordStatus': 'Working',
+    }})
+    oms.apply({'entityType': 'orderVersion', 'eventType': 'Created', 'entity': {
+        'id': 100, 'orderId': 10, 'orderQty': 1,
+    }})
+    socket = SentSocket()
+    return OrderEntry(socket, 1, 'DEMO1', risk=gate(), clip=clip, oms=oms), socket
+
+
+def test_modify_decrease_not_checked():
+    entry, socket = modify_entry()
+    entry.risk.on_fill(1, 1, 3)
+    asyncio.run(entry.modify_order(10, 1, 'Limit', price=4500))
+    assert socket.sent[0]['orderQty'] == 1
+
+
+def test_modify_increase_checked():
+    entry, socket = modify_entry()
+    asyncio.run(entry.modify_order(10, 3, 'Limit', price=4500))
+    with pytest.raises(RiskRejectedException) as exc:
+        asyncio.run(entry.modify_order(10, 4, 'Limit', price=4500))
+    assert exc.value.reason == 'max-opening-qty'
+    assert [body['orderQty'] for body in socket.sent] == [3]
+
+
+def test_modify_increase_clipped_to_limit():
+    entry, socket = modify_entry(clip=True)
+    entry.risk.on_fill(1, 1, 1)
+    asyncio.run(entry.modify_order(10, 5, 'Limit', price=4500))
+    # -Working 1 plus 2 more reaches the long limit of 3 with the position of 1
+    assert socket.sent[0]['orderQty'] == 3
+
+
+def test_modify_latest_version_is_working_qty():
+    entry, socket = modify_entry()
+    entry.oms.apply({'entityType': 'orderVersion', 'eventType': 'Created', 'entity': {
+        'id': 101, 'orderId': 10, 'orderQty': 3,
+    }})
+    asyncio.run(entry.modify_order(10, 4, 'Limit', price=4500))
+    assert socket.sent[0]['orderQty'] == 4
+
+
+def test_modify_unknown_order_refused():
+    entry, socket = modify_entry()
+    with pytest.raises(RiskRejectedException) as exc:
+        asyncio.run(entry.modify_order(11, 1, 'Limit', price=4500))
+    assert exc.value.reason == 'unknown-order'
+    assert socket.sent == []
+
+
+class PostSession:
+    """REST session stand-in recording posted payloads"""
+
+    def __init__(self) -> None:
+        self.posted: list[tuple[str, dict]] = []
+
+    async def post(self, url, payload):
+        self.posted.append((url, payload))
+        return {'orderId': 10}
+
+
+def rest_orders() -> Orders:
+    orders = Orders.__new__(Orders)
+    orders._session = PostSession()
+    orders.id = 1
+    orders.risk = gate()
+    return orders
+
+
+def test_rest_place_order_checked():
+    orders = rest_orders()
+    asyncio.run(orders.place_order('Buy', 'ESZ6', 2, 'Market'))
+    with pytest.raises(RiskRejectedException) as exc:
+        asyncio.run(orders.place_order('Buy', 'ESZ6', 3, 'Market'))
+    assert exc.value.reason == 'max-opening-qty'
+    with pytest.raises(RiskRejectedException):
+        asyncio.run(orders.place_OSO('Buy', 'ESZ6', 3, 'Market', 'Sell', 'Limit'))
+    assert [url for url, _ in orders._session.posted] == ['order/placeorder']
+
+
+def test_rest_place_order_without_gate():
+    orders = rest_orders()
+    orders.risk = None
+    asyncio.run(orders.place_order('Buy', 'ESZ6', 30, 'Market'))
+    assert orders._session.posted[0][1]['orderQty'] == 30
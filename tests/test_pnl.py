@@ -0,0 +1,198 @@
+import asyncio
+import math
+
+from tradovate.stream.oms import OMS
+from tradovate.stream.pnl import PnLEngine
+from tradovate.stream.risk import RiskGate
+
+
+class FakeLibrary:
+    """Contract_Library stand-in over in-memory contracts, maturities and products"""
+
+    def __init__(self, value_per_point: dict[int, float]) -> None:
+        self.contracts = {cid: {'id': cid, 'name': f'C{cid}', 'contractMaturityId': 100 + cid} for cid in value_per_point}
+        self.maturities = {100 + cid: {'id': 100 + cid, 'productId': 200 + cid} for cid in value_per_point}
+        self.products = {200 + cid: {'id': 200 + cid, 'valuePerPoint': pv} for cid, pv in value_per_point.items()}
+        self.requested: list[list[int]] = []
+
+    async def contract_items(self, ids):
+        self.requested.append(list(ids))
+        return [self.contracts[id] for id in ids if id in self.contracts]
+
+    async def contract_maturity_items(self, ids):
+        return [self.maturities[id] for id in ids if id in self.maturities]
+
+    async def contract_find(self, name):
+        return next((c for c in self.contracts.values() if c['name'] == name), {})
+
+    async def product_items(self, ids):
+        return [self.products[id] for id in ids if id in self.products]
+
+
+def test_totals_skip_unpriced_slots():
+    pnl = PnLEngine()
+    pnl.set_point_value(1, 50.0)
+    pnl.fill(7, 1, 1, 4000.0)
+    pnl.fill(7, 1, -1, 3990.0)
+    pnl.fill(7, 2, 2, 100.0)
+    pnl.fill(7, 2, -1, 90.0)
+    assert pnl.realized(7) == -500.0
+    assert pnl.unrealized(7) == 0.0
+    assert pnl.unpriced() == [2]
+    pnl.set_point_value(2, 10.0)
+    assert pnl.realized(7) == -600.0
+    pnl.on_quote(2, 95.0)
+    assert pnl.unrealized(7) == -50.0
+    assert pnl.unpriced() == []
+
+
+def test_unmarked_positions_do_not_make_totals_nan():
+    pnl = PnLEngine()
+    pnl.set_point_value(1, 50.0)
+    pnl.fill(7, 1, 1, 4000.0)
+    assert not math.isnan(pnl.unrealized())
+    assert not math.isnan(pnl.realized())
+
+
+def test_load_point_values_through_library():
+    pnl = PnLEngine()
+    pnl.fill(7, 1, 1, 4000.0)
+    pnl.fill(7, 2, 1, 100.0)
+    asyncio.run(pnl.load_point_values(FakeLibrary({1: 50.0, 2: 5.0})))
+    assert pnl.position(7, 1)['realized'] == 0.0
+    assert pnl.has_point_value(1) and pnl.has_point_value(2)
+    assert float(pnl.point_value[1]) == 5.0
+
+
+def test_daily_loss_liq_only_fires_with_loaded_point_values():
+    pnl = PnLEngine()
+    gate = RiskGate(pnl)
+    gate.set_contract(1, 'ESZ6')
+    gate.set_limits([], auto_liqs=[{'id': 7, 'dailyLossLiqOnly': 1000.0}])
+    pnl.fill(7, 1, 2, 4000.0)
+    gate.on_fill(7, 1, 2)
+    pnl.on_quote(1, 3985.0)
+    asyncio.run(pnl.load_point_values(FakeLibrary({1: 50.0})))
+    assert pnl.unrealized(7) == -1500.0
+    assert gate.check(7, 'ESZ6', 'Buy', 1).reason == 'daily-loss-liq-only'
+    assert gate.check(7, 'ESZ6', 'Sell', 1, clip=True)
+
+
+class FakeRisk:
+    """Risk API stand-in without any limits"""
+
+    def __init__(self, session) -> None:
+        self.session = session
+
+    async def user_account_position_limit_L_dependents(self, ids):
+        return []
+
+    async def user_account_risk_parameter_L_dependents(self, ids):
+        return []
+
+    async def user_account_auto_liq_items(self, ids):
+        return []
+
+    async def product_margin_list(self):
+        return []
+
+    async def contract_margin_items(self, ids):
+        return []
+
+
+class SyncSocket:
+    """Account WebSocket stand-in answering user/syncrequest with a snapshot"""
+
+    def __init__(self, snapshot: dict) -> None:
+        self.snapshot = snapshot
+
+    async def request(self, url, body=None, **kwargs):
+        return {'s': 200, 'd': self.snapshot}
+
+
+def test_sync_websockets_loads_point_values(monkeypatch):
+    from tradovate.stream import client as client_module
+    from tradovate.stream.client import Client
+
+    library = FakeLibrary({1: 50.0})
+    monkeypatch.setattr(client_module, 'Contract_Library', lambda session: library)
+    monkeypatch.setattr(client_module, 'Risk', FakeRisk)
+    client = Client.__new__(Client)
+    client.id = 3
+    client._live = SyncSocket({'positions': [
+        {'id': 9, 'accountId': 7, 'contractId': 1, 'netPos': 1, 'netPrice': 4000.0},
+    ]})
+    client._demo = None
+    client.oms = OMS()
+    client.pnl = PnLEngine()
+    client.risk = RiskGate(client.pnl)
+    client._unmatched_fills = {}
+    client.rest = object()
+    client.symbols = []
+    client._market_subscriptions = {}
+    asyncio.run(client.sync_websockets())
+    client.pnl.on_quote(1, 4001.0)
+    assert library.requested == [[1]]
+    assert client.pnl.unrealized(7) == 50.0
+
+
+def props_client(monkeypatch, library):
+    from tradovate.stream import client as client_module
+    from tradovate.stream.client import Client
+
+    monkeypatch.setattr(client_module, 'Contract_Library', lambda session: library)
+    client = Client.__new__(Client)
+    client._loop = asyncio.new_event_loop()
+    client.oms = OMS()
+    client.pnl = PnLEngine()
+    client.risk = RiskGate(client.pnl)
+    client.rest = object()
+    client._unmatched_fills = {}
+    client._point_value_loads = {}
+    return client
+
+
+def props(client, entity_type: str, entity: dict, event_type: str = 'Created') -> None:
+    client._on_props('props', {'entityType': entity_type, 'eventType': event_type, 'entity': entity}, None, None)
+
+
+FILL = {'id': 31, 'orderId': 21, 'contractId': 1, 'action': 'Buy', 'qty': 2, 'price': 4000.0}
+ORDER = {'id': 21, 'accountId': 7, 'contractId': 1, 'action': 'Buy', 'ordStatus': 'Working'}
+
+
+def test_fill_before_order_applied_when_order_arrives(monkeypatch):
+    client = props_client(monkeypatch, FakeLibrary({1: 50.0}))
+    props(client, 'fill', FILL)
+    assert client.pnl.position(7, 1) is None and client.risk._net == {}
+    props(client, 'order', ORDER)
+    assert client.pnl.position(7, 1)['netPos'] == 2
+    assert client.risk._net == {(7, 1): 2}
+    assert client._unmatched_fills == {}
+    # -Later order updates do not apply the fill again
+    props(client, 'order', {**ORDER, 'ordStatus': 'Filled'}, 'Updated')
+    assert client.pnl.position(7, 1)['netPos'] == 2
+    client._loop.run_until_complete(client._point_value_loads[1])
+    client._loop.close()
+
+
+def test_fill_of_deleted_order_dropped(monkeypatch, caplog):
+    client = props_client(monkeypatch, FakeLibrary({1: 50.0}))
+    props(client, 'fill', FILL)
+    props(client, 'order', {'id': 21}, 'Deleted')
+    assert client._unmatched_fills == {} and client.risk._net == {}
+    assert 'unapplied fills' in caplog.text
+    client._loop.close()
+
+
+def test_one_point_value_load_per_contract(monkeypatch):
+    library = FakeLibrary({1: 50.0})
+    client = props_client(monkeypatch, library)
+    props(client, 'order', ORDER)
+    props(client, 'fill', FILL)
+    props(client, 'fill', {**FILL, 'id': 32})
+    task = client._point_value_loads[1]
+    assert len(client._point_value_loads) == 1
+    client._loop.run_until_complete(task)
+    assert library.requested == [[1]]
+    assert client._point_value_loads == {} and client.pnl.has_point_value(1)
+    client._loop.close()
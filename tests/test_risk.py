@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from tradovate.stream.oms import OMS
+from tradovate.stream.pnl import PnLEngine
+from tradovate.stream.risk import RiskGate
+from tradovate.stream.utils.errors import RiskConfigurationException
+
+
+class FakeLibrary:
+    """Contract_Library stand-in knowing a single ESZ6 contract"""
+
+    contract = {'id': 1, 'name': 'ESZ6', 'contractMaturityId': 11}
+
+    def __init__(self, session=None) -> None:
+        self.session = session
+
+    async def contract_find(self, name):
+        return self.contract if name == 'ESZ6' else {}
+
+    async def contract_items(self, ids):
+        return [self.contract] if 1 in ids else []
+
+    async def contract_maturity_items(self, ids):
+        return [{'id': 11, 'productId': 21}] if 11 in ids else []
+
+    async def product_items(self, ids):
+        return [{'id': 21, 'valuePerPoint': 50.0}] if 21 in ids else []
+
+
+class FakeRisk:
+    """Risk API stand-in with one product position limit on account 7"""
+
+    requested: list[list[int]] = []
+
+    def __init__(self, session) -> None:
+        self.session = session
+
+    async def user_account_position_limit_L_dependents(self, ids):
+        FakeRisk.requested.append(list(ids))
+        return [{'id': 5, 'accountId': 7, 'productId': 21, 'longLimit': 2, 'shortLimit': 2, 'exposedLimit': 2}]
+
+    async def user_account_risk_parameter_L_dependents(self, ids):
+        return [{'userAccountPositionLimitId': 5, 'maxOpeningOrderQty': 2}]
+
+    async def user_account_auto_liq_items(self, ids):
+        return []
+
+    async def product_margin_list(self):
+        return []
+
+    async def contract_margin_items(self, ids):
+        return []
+
+
+class SyncSocket:
+    """Account WebSocket stand-in answering user/syncrequest with one account"""
+
+    async def request(self, url, body=None, **kwargs):
+        return {'s': 200, 'd': {'accounts': [{'id': 7, 'name': 'DEMO7'}], 'positions': []}}
+
+
+def client(monkeypatch, rest):
+    from tradovate.stream import client as client_module
+    from tradovate.stream.client import Client
+
+    monkeypatch.setattr(client_module, 'Contract_Library', FakeLibrary)
+    monkeypatch.setattr(client_module, 'Risk', FakeRisk)
+    client = Client.__new__(Client)
+    client.id = 3
+    client._live = SyncSocket()
+    client._demo = None
+    client._order_entries = {}
+    client._market_subscriptions = {}
+    client.oms = OMS()
+    client.pnl = PnLEngine()
+    client.risk = RiskGate(client.pnl)
+    client._unmatched_fills = {}
+    client.rest = rest
+    client.symbols = ['ESZ6']
+    return client
+
+
+def test_check_before_load_is_a_configuration_error():
+    gate = RiskGate()
+    gate.set_contract(1, 'ESZ6')
+    with pytest.raises(RiskConfigurationException):
+        gate.check(7, 'ESZ6', 'Buy', 1)
+
+
+def test_sync_websockets_loads_limits_and_contracts(monkeypatch):
+    FakeRisk.requested.clear()
+    live = client(monkeypatch, object())
+    asyncio.run(live.sync_websockets())
+    assert FakeRisk.requested == [[7]]
+    assert live.risk.configured
+    assert live.risk.check(7, 'ESZ6', 'Buy', 1)
+    assert live.risk.check(7, 'ESZ6', 'Buy', 3).reason == 'max-opening-qty'
+    assert live.risk.check(7, 'NQZ6', 'Buy', 1).reason == 'unknown-contract'
+
+
+def test_order_entry_without_limits_fails_explicitly(monkeypatch):
+    live = client(monkeypatch, None)
+    asyncio.run(live.sync_websockets())
+    with pytest.raises(RiskConfigurationException):
+        live.order_entry(7, 'DEMO7')
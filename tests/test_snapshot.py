@@ -0,0 +1,113 @@
+import asyncio
+import time
+
+from tradovate import client as client_module
+from tradovate.auth.session import Session
+from tradovate.client import Client
+from tradovate.snapshot import ReferenceSnapshot
+
+
+def entities(contracts: int = 5000, products: int = 2000) -> dict[str, list[dict]]:
+    return {
+        'contract': [{'id': i, 'name': f"C{i}"} for i in range(contracts)],
+        'product': [{'id': i, 'name': f"P{i}"} for i in range(products)],
+        'contractMaturity': [{'id': i, 'productId': i % max(products, 1)} for i in range(contracts)],
+    }
+
+
+def test_warm_start_serves_every_seeded_entity(tmp_path):
+    async def main():
+        session = Session(loop=asyncio.get_running_loop(), cache_size=1024)
+
+        async def offline(*args, **kwargs):
+            raise AssertionError(f"network lookup {args}")
+
+        session.get = session.item = offline
+        snapshot = ReferenceSnapshot(session, path=str(tmp_path / 'reference.json'))
+        data = entities()
+        snapshot.save(data, created=0.0)
+        assert snapshot.load()
+        for item in data['contract']:
+            assert await session.cached_item('contract', item['id']) == item
+            assert await session.cached_find('contract', item['name']) == item
+        for item in data['product']:
+            assert await session.cached_find('product', item['name']) == item
+        assert await session.cached_items('contractMaturity', range(5000)) == data['contractMaturity']
+        return session.cache_stats
+
+    stats = asyncio.run(main())
+    assert stats['contract'] == {'hits': 10_000, 'misses': 0, 'size': 10_000}
+    assert stats['product']['misses'] == 0
+    assert stats['contractMaturity'] == {'hits': 5000, 'misses': 0, 'size': 5000}
+
+
+def test_seed_keeps_headroom_for_on_demand_loads():
+    async def main():
+        session = Session(loop=asyncio.get_running_loop(), cache_size=16)
+        snapshot = ReferenceSnapshot(session)
+        snapshot.seed(entities(contracts=100, products=0))
+        snapshot.seed(entities(contracts=100, products=0))
+        cache = session.reference_cache('contract')
+        assert cache.maxsize == 200 + 16
+        for i in range(16):
+            cache.set(('item', 10_000 + i), {'id': 10_000 + i})
+        assert all(cache.get(('item', i)) for i in range(100))
+        cache.set(('item', 20_000), {'id': 20_000})
+        assert len(cache) == cache.maxsize
+
+    asyncio.run(main())
+
+
+class FakeAccounting:
+    """Accounting stand-in with a single account"""
+
+    def __init__(self, session) -> None:
+        self.session = session
+
+    async def account_list(self):
+        return [{'id': 7, 'name': 'DEMO7'}]
+
+
+def test_create_serves_existing_snapshot(tmp_path, monkeypatch):
+    path = str(tmp_path / 'reference.json')
+    monkeypatch.setenv('TO_SNAPSHOT_PATH', path)
+    monkeypatch.setattr(client_module, 'Accounting', FakeAccounting)
+
+    async def fetch(self):
+        raise AssertionError("fresh snapshot refreshed")
+
+    monkeypatch.setattr(ReferenceSnapshot, 'fetch', fetch)
+
+    async def main():
+        session = Session(loop=asyncio.get_running_loop())
+        ReferenceSnapshot(session, path=path).save(entities(10, 2), created=time.time())
+        client = await Client.create(session=session)
+        assert (client.id, client.name) == (7, 'DEMO7')
+        assert client.reference._refreshing is None
+        assert session.reference_cache('contract').get(('find', 'C3')) == {'id': 3, 'name': 'C3'}
+
+    asyncio.run(main())
+
+
+def test_create_refreshes_missing_snapshot_in_background(tmp_path, monkeypatch):
+    monkeypatch.setenv('TO_SNAPSHOT_PATH', str(tmp_path / 'reference.json'))
+    monkeypatch.setattr(client_module, 'Accounting', FakeAccounting)
+
+    async def main():
+        release = asyncio.Event()
+
+        async def fetch(self):
+            await release.wait()
+            return entities(10, 2)
+
+        monkeypatch.setattr(ReferenceSnapshot, 'fetch', fetch)
+        session = Session(loop=asyncio.get_running_loop())
+        client = await asyncio.wait_for(Client.create(session=session), 1)
+        refreshing = client.reference._refreshing
+        assert client.id == 7 and not refreshing.done()
+        release.set()
+        await refreshing
+        assert session.reference_cache('contract').get(('item', 3)) == {'id': 3, 'name': 'C3'}
+        assert ReferenceSnapshot(session).load()
+
+    asyncio.run(main())
@@ -0,0 +1,113 @@
+import asyncio
+import uuid
+
+from tradovate.store import MemoryRedis
+from tradovate.stream.state import StateStore
+
+
+class SlowRedis(MemoryRedis):
+    """MemoryRedis whose pipelines wait for `release`, or fail while `failing`"""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.started = asyncio.Event()
+        self.failing = 0
+
+    def pipeline(self, transaction: bool = True):
+        pipe = super().pipeline(transaction)
+        execute = pipe.execute
+
+        async def slow_execute():
+            self.started.set()
+            if self.failing:
+                self.failing -= 1
+                raise ConnectionError('redis down')
+            await self.release.wait()
+            return await execute()
+
+        pipe.execute = slow_execute
+        return pipe
+
+
+def key(name: str) -> str:
+    return f"test-state-{uuid.uuid4().hex}-{name}"
+
+
+def test_close_waits_for_the_write_in_flight():
+    async def main():
+        redis = SlowRedis()
+        state = StateStore(redis, flush_interval=0.001)
+        a = key('a')
+        state.set(a, 'one')
+        await redis.started.wait()
+        assert state._task is None and state._writing is not None
+        closing = asyncio.ensure_future(state.close())
+        await asyncio.sleep(0.01)
+        assert not closing.done()
+        redis.release.set()
+        await closing
+        return await redis.get(a), state
+
+    value, state = asyncio.run(main())
+    assert value == 'one'
+    assert not state._dirty and state.flushes == 1
+
+
+def test_cancelled_write_is_rewritten_by_close():
+    async def main():
+        redis = SlowRedis()
+        state = StateStore(redis, flush_interval=0.001)
+        a, b = key('a'), key('b')
+        state.set(a, 'one')
+        state.delete(b)
+        await redis.started.wait()
+        # -Shutdown: every task is cancelled before close() runs
+        for task in asyncio.all_tasks():
+            if task is not asyncio.current_task():
+                task.cancel()
+        await asyncio.sleep(0)
+        assert set(state._dirty) == {a, b}
+        redis.release.set()
+        await state.close()
+        return await redis.get(a), state
+
+    value, state = asyncio.run(main())
+    assert value == 'one'
+    assert not state._dirty
+
+
+def test_failed_write_keeps_keys_and_retries():
+    async def main():
+        redis = SlowRedis()
+        redis.failing = 1
+        redis.release.set()
+        state = StateStore(redis, flush_interval=0.001)
+        a = key('a')
+        state.set(a, 'one')
+        await state.flush()
+        assert state._dirty == {a: 'one'} and state.flushes == 0
+        assert state._task is not None
+        await state._task
+        return await redis.get(a), state
+
+    value, state = asyncio.run(main())
+    assert value == 'one'
+    assert not state._dirty and state.flushes == 1
+
+
+def test_key_rewritten_during_a_write_stays_dirty():
+    async def main():
+        redis = SlowRedis()
+        state = StateStore(redis, flush_interval=60)
+        a = key('a')
+        state.set(a, 'one')
+        flushing = asyncio.ensure_future(state.flush())
+        await redis.started.wait()
+        state.set(a, 'two')
+        redis.release.set()
+        await flushing
+        assert state._dirty == {a: 'two'}
+        await state.close()
+        return await redis.get(a)
+
+    assert asyncio.run(main()) == 'two'
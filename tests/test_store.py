@@ -0,0 +1,97 @@
+import asyncio
+import uuid
+
+from tradovate import store
+from tradovate.store import COMPARE_AND_DELETE, MemoryRedis, get_redis, pipelined
+
+
+def key(name: str) -> str:
+    return f"test-store-{uuid.uuid4().hex}-{name}"
+
+
+def test_memory_redis_commands():
+    async def main():
+        redis = MemoryRedis()
+        prefix = key('')
+        a, b, lock = prefix + 'a', prefix + 'b', prefix + 'lock'
+        assert await redis.set(a, 1) is True
+        assert await redis.get(a) == '1'
+        assert await redis.set(a, 2, nx=True) is None
+        assert await redis.mget([a, b]) == ['1', None]
+        assert await redis.set(lock, 'me', nx=True, px=20)
+        assert await redis.eval(COMPARE_AND_DELETE, 1, lock, 'other') == 0
+        assert await redis.eval(COMPARE_AND_DELETE, 1, lock, 'me') == 1
+        assert await redis.set(lock, 'me', px=10)
+        await asyncio.sleep(0.02)
+        assert await redis.get(lock) is None
+        await redis.set(b, 'x')
+        assert sorted([k async for k in redis.scan_iter(match=prefix + '*')]) == [a, b]
+        assert await redis.delete(a, b, prefix + 'missing') == 2
+        assert [k async for k in redis.scan_iter(match=prefix + '*')] == []
+
+    asyncio.run(main())
+
+
+def test_memory_redis_keyspace_is_shared_and_publishes():
+    async def main():
+        a, channel = key('a'), key('channel')
+        await MemoryRedis().set(a, 'v')
+        received = []
+        pubsub = MemoryRedis().pubsub()
+        await pubsub.subscribe(**{channel: received.append})
+        assert await MemoryRedis().publish(channel, 'hello') == 1
+        await asyncio.sleep(0)
+        await pubsub.aclose()
+        assert await MemoryRedis().publish(channel, 'bye') == 0
+        return await MemoryRedis().get(a), received
+
+    value, received = asyncio.run(main())
+    assert value == 'v'
+    assert [message['data'] for message in received] == ['hello']
+
+
+def test_pipelined_sends_commands_in_order_with_kwargs():
+    async def main():
+        redis = MemoryRedis()
+        a, b = key('a'), key('b')
+        replies = await pipelined((
+            ('set', a, 'one'),
+            ('set', a, 'two', {'nx': True}),
+            ('set', b, 'three', {'px': 10_000}),
+            ('get', a),
+            ('delete', b),
+        ), client=redis)
+        return replies
+
+    assert asyncio.run(main()) == [True, None, True, 'one', 1]
+
+
+def test_get_redis_is_cached_per_loop(monkeypatch):
+    monkeypatch.setenv('REDIS_URL', 'memory://')
+
+    async def clients():
+        first, second = get_redis(), get_redis()
+        assert first is second
+        return first
+
+    a, b = asyncio.run(clients()), asyncio.run(clients())
+    assert isinstance(a, MemoryRedis) and a is not b
+
+    async def close():
+        client = get_redis()
+        await store.close_redis()
+        return client, get_redis()
+
+    before, after = asyncio.run(close())
+    assert before is not after
+
+
+def test_shared_redis_resolves_on_the_running_loop(monkeypatch):
+    monkeypatch.setenv('REDIS_URL', 'memory://')
+
+    async def main():
+        a = key('a')
+        await store.shared_redis.set(a, 'v')
+        return store.shared_redis.get.__self__ is get_redis(), await get_redis().get(a)
+
+    assert asyncio.run(main()) == (True, 'v')
@@ -0,0 +1,120 @@
+import asyncio
+import itertools
+import json
+from datetime import datetime, timedelta, timezone
+
+from tradovate.auth.tokens import TokenManager
+from tradovate.store import MemoryRedis
+
+_keys = itertools.count()
+
+
+def tokens(name: str, hours: float = 2.0) -> dict:
+    expiration = datetime.now(timezone.utc) + timedelta(hours=hours)
+    return {
+        'accessToken': name, 'mdAccessToken': f"md-{name}",
+        'expirationTime': expiration.strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+    }
+
+
+def tokens_json(name: str, hours: float = 2.0) -> str:
+    return json.dumps(tokens(name, hours))
+
+
+def manager(key: str, **kwargs) -> TokenManager:
+    return TokenManager(key, store=MemoryRedis(), channel=f"{key}:updates", poll_interval=0.01, **kwargs)
+
+
+class Renewer:
+    """fetch callable counting renewals, slow enough for callers to pile up"""
+
+    def __init__(self, delay: float = 0.05) -> None:
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self, held: TokenManager) -> dict:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return tokens(f"renewed-{self.calls}")
+
+
+def test_ensure_is_single_flight():
+    async def main():
+        held = manager(f"TEST_TOKEN_{next(_keys)}")
+        fetch = Renewer()
+        results = await asyncio.gather(*(held.ensure(fetch) for _ in range(20)))
+        assert fetch.calls == 1
+        assert set(results) == {'renewed-1'}
+        assert held.fresh and held.renewals == 1
+        # -Fresh tokens are served without touching the store or fetch
+        assert await held.ensure(fetch) == 'renewed-1'
+        assert fetch.calls == 1
+
+    asyncio.run(main())
+
+
+def test_one_leader_renews_for_two_managers():
+    async def main():
+        key = f"TEST_TOKEN_{next(_keys)}"
+        first, second = manager(key), manager(key)
+        fetch_first, fetch_second = Renewer(), Renewer()
+        results = await asyncio.gather(first.ensure(fetch_first), second.ensure(fetch_second))
+        assert fetch_first.calls + fetch_second.calls == 1
+        assert results[0] == results[1]
+        assert first.access_token == second.access_token
+        # -The lock is released once the leader has published
+        assert await MemoryRedis().get(f"{key}:lock") is None
+        assert await MemoryRedis().get(key) is not None
+
+    asyncio.run(main())
+
+
+def test_alisten_adopts_published_tokens():
+    async def main():
+        key = f"TEST_TOKEN_{next(_keys)}"
+        leader, follower = manager(key), manager(key)
+        await follower.alisten()
+        leader.set(tokens('published'))
+        await leader.asave()
+        for _ in range(100):
+            if follower.received:
+                break
+            await asyncio.sleep(0.01)
+        fetch = Renewer()
+        assert await follower.ensure(fetch) == 'published'
+        assert follower.received == 1 and fetch.calls == 0
+        await follower.aclose()
+
+    asyncio.run(main())
+
+
+def test_lock_winner_rereads_tokens_published_before_it():
+    async def main():
+        key = f"TEST_TOKEN_{next(_keys)}"
+        late = manager(key)
+        acquire = late._aacquire
+
+        async def acquire_after_other_leader():
+            # -Another process renews and releases the lock just before this one takes it
+            await MemoryRedis().set(key, tokens_json('other-leader'))
+            return await acquire()
+
+        late._aacquire = acquire_after_other_leader
+        fetch = Renewer()
+        assert await late.ensure(fetch) == 'other-leader'
+        assert fetch.calls == 0 and late.renewals == 0
+        assert await MemoryRedis().get(f"{key}:lock") is None
+
+    asyncio.run(main())
+
+
+def test_expired_store_tokens_are_renewed():
+    async def main():
+        key = f"TEST_TOKEN_{next(_keys)}"
+        await MemoryRedis().set(key, tokens_json('stale', hours=0.05))
+        held = manager(key)
+        fetch = Renewer(delay=0.0)
+        assert await held.ensure(fetch) == 'renewed-1'
+        assert fetch.calls == 1
+
+    asyncio.run(main())
@@ -0,0 +1,221 @@
+import asyncio
+import json
+
+import aiohttp
+
+from tradovate.stream.profile.session import WebSocket
+from tradovate.stream.subscription import OVERFLOW, Subscription
+from tradovate.stream.utils.metrics import RateCounter
+
+
+class FakeSocket:
+    """aiohttp socket stand-in: answers every request with 200, frames can be injected"""
+
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.queue.put_nowait(aiohttp.WSMessage(aiohttp.WSMsgType.TEXT, 'o', None))
+        self.sent: list[str] = []
+        self.closed = False
+
+    async def receive_str(self) -> str:
+        return (await self.queue.get()).data
+
+    async def receive(self) -> aiohttp.WSMessage:
+        return await self.queue.get()
+
+    async def send_str(self, data: str) -> None:
+        self.sent.append(data)
+        if data != '[]':
+            _, id_, *_ = data.split('\n', 3)
+            self.inject([{'s': 200, 'i': int(id_), 'd': {}}])
+
+    async def close(self) -> None:
+        self.closed = True
+        self.queue.put_nowait(aiohttp.WSMessage(aiohttp.WSMsgType.CLOSED, None, None))
+
+    def inject(self, events: list[dict]) -> None:
+        self.queue.put_nowait(aiohttp.WSMessage(aiohttp.WSMsgType.TEXT, 'a' + json.dumps(events), None))
+
+
+def test_frames_counted_per_frame_not_per_poll():
+    async def main():
+        frames = RateCounter()
+        socket = FakeSocket()
+        websocket = WebSocket('wss://md', socket, loop=asyncio.get_running_loop(), frames=frames)
+        await websocket.connected.wait()
+        for i in range(3):
+            socket.inject([{'e': 'md', 'd': {'n': i}}, {'e': 'md', 'd': {'n': i}}])
+        await websocket.request('md/getChart', body={})
+        events = []
+        while len(events) < 6:
+            events += await websocket.poll_message()
+        await websocket.close()
+        return frames, websocket, len(events)
+
+    frames, websocket, events = asyncio.run(main())
+    # -Three event frames and one response frame, however the polls batch them
+    assert events == 6
+    assert frames.total == 4
+    assert websocket.frames is frames
+
+
+class RejectingSocket(FakeSocket):
+    """Socket whose authorization request is answered with 401"""
+
+    async def send_str(self, data: str) -> None:
+        self.sent.append(data)
+        if data != '[]':
+            _, id_, *_ = data.split('\n', 3)
+            self.inject([{'s': 401, 'i': int(id_), 'd': {}}])
+
+
+class FakeSession:
+    def __init__(self, loop) -> None:
+        self.loop = loop
+        self.token_expiration = None
+        self.access_token = 'stale'
+        self.md_access_token = 'stale-md'
+        self.renewals = 0
+
+    @property
+    def token_expired(self) -> bool:
+        return False
+
+    async def renew_access_token(self) -> None:
+        self.renewals += 1
+        self.access_token = 'fresh'
+        self.md_access_token = 'fresh-md'
+
+
+def test_reconnect_closes_failed_socket_and_renews(monkeypatch):
+    from tradovate.stream import client as client_module
+    from tradovate.stream.client import Client
+    from tradovate.stream.utils import urls
+    from tradovate.stream.utils.metrics import LatencyStats
+
+    sockets = [RejectingSocket(), FakeSocket()]
+
+    async def from_session(cls, url, session, *, loop=None, frames=None):
+        return cls(url, sockets.pop(0), loop=session.loop, frames=frames)
+
+    monkeypatch.setattr(client_module.WebSocket, 'from_session', classmethod(from_session))
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        client = Client.__new__(Client)
+        client._session = FakeSession(loop)
+        client._closing = False
+        client._frames = RateCounter()
+        client._order_entries = {}
+        client._market_subscriptions = {}
+        client.recorder = None
+        client.reconnect_delay = 0.001
+        client.reconnect_max_delay = 0.01
+        client.reconnect_time = LatencyStats()
+        client._live = client._demo = None
+        client._mdlive = dead = WebSocket(urls.wss_base_market, FakeSocket(), loop=loop)
+        rejected = sockets[0]
+        replacement = await client._reconnect(dead)
+        assert replacement.authenticated.is_set()
+        await replacement.close()
+        return client, rejected, replacement
+
+    client, rejected, replacement = asyncio.run(main())
+    assert rejected.closed
+    assert client._session.renewals == 1
+    assert client._mdlive is replacement
+    assert replacement._aiowebsocket.sent[0].endswith('fresh-md')
+
+
+def quote(contract_id: int, n: int) -> dict:
+    return {'e': 'md', 'd': {'quotes': [{'contractId': contract_id, 'n': n}]}}
+
+
+def test_block_subscription_waits_for_room():
+    async def main():
+        subscription = Subscription(2, OVERFLOW.BLOCK)
+        await subscription.put(quote(1, 0))
+        await subscription.put(quote(1, 1))
+        blocked = asyncio.ensure_future(subscription.put(quote(1, 2)))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+        first = await subscription.get_many()
+        await blocked
+        return first, await subscription.get_many(), subscription
+
+    first, second, subscription = asyncio.run(main())
+    assert [e['d']['quotes'][0]['n'] for e in first + second] == [0, 1, 2]
+    assert subscription.dropped == 0
+
+
+def test_drop_oldest_subscription_counts_and_logs(caplog):
+    async def main():
+        subscription = Subscription(2, OVERFLOW.DROP_OLDEST)
+        for n in range(5):
+            await subscription.put(quote(1, n))
+        return await subscription.get_many(), subscription
+
+    with caplog.at_level('WARNING', logger='tradovate.stream.subscription'):
+        events, subscription = asyncio.run(main())
+    assert [e['d']['quotes'][0]['n'] for e in events] == [3, 4]
+    assert subscription.dropped == 3
+    # -Logged at the 1st and 2nd drop, then again at the 4th
+    assert len(caplog.records) == 2
+
+
+def test_conflate_subscription_keeps_latest_per_key():
+    async def main():
+        subscription = Subscription(8, OVERFLOW.CONFLATE)
+        for n in range(3):
+            await subscription.put(quote(1, n))
+            await subscription.put(quote(2, n))
+        await subscription.put({'e': 'clock', 'd': 'a'})
+        await subscription.put({'e': 'clock', 'd': 'b'})
+        return await subscription.get_many(), subscription
+
+    events, subscription = asyncio.run(main())
+    assert [(e['d']['quotes'][0]['contractId'], e['d']['quotes'][0]['n']) for e in events[:2]] == [(1, 2), (2, 2)]
+    assert [e['d'] for e in events[2:]] == ['b']
+    assert subscription.conflated == 5 and subscription.dropped == 0
+
+
+def test_events_fan_out_to_every_subscriber():
+    async def main():
+        socket = FakeSocket()
+        websocket = WebSocket('wss://md', socket, loop=asyncio.get_running_loop())
+        await websocket.connected.wait()
+        blocking = websocket.subscribe(16)
+        latest = websocket.subscribe(16, OVERFLOW.CONFLATE)
+        for n in range(3):
+            socket.inject([quote(1, n)])
+        await websocket.request('md/getChart', body={})
+        polled = await websocket.poll_message()
+        result = polled, await blocking.get_many(), await latest.get_many()
+        await websocket.close()
+        assert await blocking.get_many() is None
+        return result
+
+    polled, blocking, latest = asyncio.run(main())
+    assert [e['d']['quotes'][0]['n'] for e in polled] == [0, 1, 2]
+    assert [e['d']['quotes'][0]['n'] for e in blocking] == [0, 1, 2]
+    assert [e['d']['quotes'][0]['n'] for e in latest] == [2]
+
+
+def test_poll_queue_loses_nothing_behind_a_slow_consumer():
+    async def main():
+        socket = FakeSocket()
+        websocket = WebSocket('wss://md', socket, loop=asyncio.get_running_loop())
+        await websocket.connected.wait()
+        for n in range(12_000):
+            socket.inject([quote(1, n)])
+        await asyncio.sleep(0.05)
+        assert len(websocket._messages) == websocket._messages.maxsize
+        events = []
+        while len(events) < 12_000:
+            events += await websocket.poll_message()
+        await websocket.close()
+        return events, websocket._messages.dropped
+
+    events, dropped = asyncio.run(main())
+    assert [e['d']['quotes'][0]['n'] for e in events] == list(range(12_000))
+    assert dropped == 0